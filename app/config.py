@@ -6,19 +6,164 @@ load_dotenv()
 
 class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./raffle.db")
+    # Run app.schema.migrate when the API or worker starts. Turn off when
+    # `python -m app.schema` runs once per deploy, so scaled-out API
+    # workers start without touching the schema.
+    DB_MIGRATE_ON_STARTUP: bool = os.getenv("DB_MIGRATE_ON_STARTUP", "true").lower() in ("1", "true", "yes")
 
     SOLANA_RPC_URL: str = os.getenv("SOLANA_RPC_URL", "https://api.mainnet-beta.solana.com")
+    # Comma-separated RPC endpoints to route between; defaults to SOLANA_RPC_URL.
+    SOLANA_RPC_URLS: list[str] = [
+        url.strip() for url in os.getenv("SOLANA_RPC_URLS", "").split(",") if url.strip()
+    ] or [SOLANA_RPC_URL]
+    # Reads are hedged to a second endpoint after the first one's p95 latency,
+    # but never sooner than this (and after the default until p95 is known).
+    SOLANA_RPC_HEDGE_MIN_MS: float = float(os.getenv("SOLANA_RPC_HEDGE_MIN_MS", "150"))
+    SOLANA_RPC_HEDGE_DEFAULT_MS: float = float(os.getenv("SOLANA_RPC_HEDGE_DEFAULT_MS", "800"))
+    # How many endpoints each transaction is sent to.
+    SOLANA_RPC_BROADCAST_COUNT: int = int(os.getenv("SOLANA_RPC_BROADCAST_COUNT", "3"))
+    SOLANA_RPC_COOLDOWN_SECONDS: float = float(os.getenv("SOLANA_RPC_COOLDOWN_SECONDS", "30"))
+    SOLANA_RPC_TIMEOUT_SECONDS: float = float(os.getenv("SOLANA_RPC_TIMEOUT_SECONDS", "30"))
+    SOLANA_RPC_MAX_CONNECTIONS: int = int(os.getenv("SOLANA_RPC_MAX_CONNECTIONS", "10"))
+    SOLANA_RPC_MAX_KEEPALIVE: int = int(os.getenv("SOLANA_RPC_MAX_KEEPALIVE", "5"))
+    SOLANA_RPC_KEEPALIVE_EXPIRY_SECONDS: float = float(
+        os.getenv("SOLANA_RPC_KEEPALIVE_EXPIRY_SECONDS", "90")
+    )
+    SOLANA_BLOCKHASH_REFRESH_SECONDS: float = float(
+        os.getenv("SOLANA_BLOCKHASH_REFRESH_SECONDS", "15")
+    )
+    # confirmed | finalized
+    SOLANA_CONFIRM_COMMITMENT: str = os.getenv("SOLANA_CONFIRM_COMMITMENT", "confirmed")
+    SOLANA_CONFIRM_TIMEOUT_SECONDS: float = float(
+        os.getenv("SOLANA_CONFIRM_TIMEOUT_SECONDS", "90")
+    )
+    # Priority fee (micro-lamports per compute unit) is this percentile of
+    # getRecentPrioritizationFees for the accounts a transaction writes,
+    # clamped to [min, max] and cached per account set.
+    PRIORITY_FEE_PERCENTILE: float = float(os.getenv("PRIORITY_FEE_PERCENTILE", "75"))
+    PRIORITY_FEE_MIN_MICRO_LAMPORTS: int = int(os.getenv("PRIORITY_FEE_MIN_MICRO_LAMPORTS", "1000"))
+    PRIORITY_FEE_MAX_MICRO_LAMPORTS: int = int(
+        os.getenv("PRIORITY_FEE_MAX_MICRO_LAMPORTS", "2000000")
+    )
+    PRIORITY_FEE_CACHE_SECONDS: float = float(os.getenv("PRIORITY_FEE_CACHE_SECONDS", "10"))
+    # Compute unit limit set on payout transfers.
+    TRANSFER_COMPUTE_UNITS: int = int(os.getenv("TRANSFER_COMPUTE_UNITS", "2000"))
     CREATOR_PRIVATE_KEY_BASE58: str = os.getenv("CREATOR_PRIVATE_KEY_BASE58", "")
     OWNER_WALLET: str = os.getenv("OWNER_WALLET", "")
 
+    # Concurrent getTransaction calls and page size for the fee ledger backfill.
+    FEE_LEDGER_CONCURRENCY: int = int(os.getenv("FEE_LEDGER_CONCURRENCY", "8"))
+    FEE_LEDGER_PAGE_SIZE: int = int(os.getenv("FEE_LEDGER_PAGE_SIZE", "1000"))
+
     PUMPPORTAL_API_KEY: str = os.getenv("PUMPPORTAL_API_KEY", "")
+    PUMPPORTAL_BASE_URL: str = os.getenv("PUMPPORTAL_BASE_URL", "https://pumpportal.fun").rstrip("/")
     PUMP_POOL: str = os.getenv("PUMP_POOL", "pump")
+    PUMPPORTAL_TIMEOUT_SECONDS: float = float(os.getenv("PUMPPORTAL_TIMEOUT_SECONDS", "15"))
+    PUMPPORTAL_MAX_RETRIES: int = int(os.getenv("PUMPPORTAL_MAX_RETRIES", "3"))
+    # Compute units assumed for collectCreatorFee when turning the priority
+    # fee estimate into PumpPortal's total priorityFee (in SOL).
+    PUMPPORTAL_COLLECT_COMPUTE_UNITS: int = int(
+        os.getenv("PUMPPORTAL_COLLECT_COMPUTE_UNITS", "100000")
+    )
+    PUMPPORTAL_MIN_PRIORITY_FEE_SOL: float = float(
+        os.getenv("PUMPPORTAL_MIN_PRIORITY_FEE_SOL", "0.000001")
+    )
+    PUMPPORTAL_MAX_PRIORITY_FEE_SOL: float = float(
+        os.getenv("PUMPPORTAL_MAX_PRIORITY_FEE_SOL", "0.001")
+    )
     TOKEN_MINT: str | None = os.getenv("TOKEN_MINT") or None
+    # Account watched for fee accrual; derived from the creator key if unset.
+    CREATOR_FEE_VAULT: str | None = os.getenv("CREATOR_FEE_VAULT") or None
 
     RECAPTCHA_SITE_KEY: str | None = os.getenv("RECAPTCHA_SITE_KEY") or None
     RECAPTCHA_SECRET: str | None = os.getenv("RECAPTCHA_SECRET") or None
+    RECAPTCHA_VERIFY_URL: str = os.getenv(
+        "RECAPTCHA_VERIFY_URL", "https://www.google.com/recaptcha/api/siteverify"
+    )
+    RECAPTCHA_TIMEOUT_SECONDS: float = float(os.getenv("RECAPTCHA_TIMEOUT_SECONDS", "2"))
+    RECAPTCHA_MIN_SCORE: float = float(os.getenv("RECAPTCHA_MIN_SCORE", "0.3"))
+    RECAPTCHA_ACTION: str = os.getenv("RECAPTCHA_ACTION", "join")
+    # Accept joins when Google cannot be reached (fail-open) or reject them.
+    RECAPTCHA_FAIL_OPEN: bool = os.getenv("RECAPTCHA_FAIL_OPEN", "false").lower() in ("1", "true", "yes")
+    RECAPTCHA_BREAKER_FAILURES: int = int(os.getenv("RECAPTCHA_BREAKER_FAILURES", "5"))
+    RECAPTCHA_BREAKER_RESET_SECONDS: float = float(
+        os.getenv("RECAPTCHA_BREAKER_RESET_SECONDS", "30")
+    )
 
     ACTIVE_RAFFLE_ID: int = int(os.getenv("ACTIVE_RAFFLE_ID", "1"))
+    # JSON file listing the raffles one worker runs (see app/services/raffle_config.py);
+    # when unset the worker runs ACTIVE_RAFFLE_ID with the settings above.
+    RAFFLES_FILE: str | None = os.getenv("RAFFLES_FILE") or None
+    # Share of each distribution that goes to the winner, in basis points.
+    RAFFLE_WINNER_SHARE_BPS: int = int(os.getenv("RAFFLE_WINNER_SHARE_BPS", "7000"))
+    # How winners are drawn: "uniform" over participants, or "holdings" to
+    # weight participants by their TOKEN_MINT balance.
+    RAFFLE_SELECTION: str = os.getenv("RAFFLE_SELECTION", "uniform")
+    # When a "holdings" draw cannot run (snapshot or RPC failure), the round
+    # waits for the next cycle; set this to draw uniformly instead.
+    RAFFLE_HOLDINGS_UNIFORM_FALLBACK: bool = os.getenv(
+        "RAFFLE_HOLDINGS_UNIFORM_FALLBACK", "false"
+    ).lower() in ("1", "true", "yes")
+    # Holder snapshots for "holdings" selection: how often to take one, and
+    # whether to split the getProgramAccounts scan into 256 calls by owner byte.
+    HOLDER_SNAPSHOT_REFRESH_SECONDS: float = float(
+        os.getenv("HOLDER_SNAPSHOT_REFRESH_SECONDS", "300")
+    )
+    HOLDER_SNAPSHOT_SHARDED: bool = os.getenv("HOLDER_SNAPSHOT_SHARDED", "true").lower() in ("1", "true", "yes")
+    HOLDER_SNAPSHOT_CONCURRENCY: int = int(os.getenv("HOLDER_SNAPSHOT_CONCURRENCY", "8"))
+    # Winner eligibility: how long an account lookup is trusted, how many
+    # ineligible draws to reject before giving up on a round, and how fast
+    # the background sweep walks the participants table.
+    ELIGIBILITY_CACHE_SECONDS: float = float(os.getenv("ELIGIBILITY_CACHE_SECONDS", "300"))
+    ELIGIBILITY_MAX_DRAWS: int = int(os.getenv("ELIGIBILITY_MAX_DRAWS", "20"))
+    ELIGIBILITY_SWEEP_BATCH: int = int(os.getenv("ELIGIBILITY_SWEEP_BATCH", "1000"))
+    # Seconds between sweep batches (0 disables the sweep).
+    ELIGIBILITY_SWEEP_INTERVAL_SECONDS: float = float(
+        os.getenv("ELIGIBILITY_SWEEP_INTERVAL_SECONDS", "30")
+    )
+    # Raffle cycles allowed to run at the same time across all raffles.
+    WORKER_MAX_CONCURRENT_CYCLES: int = int(os.getenv("WORKER_MAX_CONCURRENT_CYCLES", "4"))
+
+    # Run a cycle once this many lamports of fees have accrued...
+    RAFFLE_FEE_THRESHOLD_LAMPORTS: int = int(os.getenv("RAFFLE_FEE_THRESHOLD_LAMPORTS", "10000000"))
+    # ...or once this long has passed since the last cycle.
+    RAFFLE_MAX_INTERVAL_SECONDS: float = float(os.getenv("RAFFLE_MAX_INTERVAL_SECONDS", "3600"))
+    RAFFLE_MIN_SPACING_SECONDS: float = float(os.getenv("RAFFLE_MIN_SPACING_SECONDS", "120"))
+    RAFFLE_FEE_POLL_SECONDS: float = float(os.getenv("RAFFLE_FEE_POLL_SECONDS", "20"))
+    RAFFLE_SCHEDULE_JITTER_SECONDS: float = float(os.getenv("RAFFLE_SCHEDULE_JITTER_SECONDS", "5"))
+
+    # Port for the worker's /metrics endpoint (0 disables it).
+    WORKER_METRICS_PORT: int = int(os.getenv("WORKER_METRICS_PORT", "9108"))
+
+    # Batch concurrent joins into one transaction every N ms (0 disables).
+    JOIN_GROUP_COMMIT_MS: float = float(os.getenv("JOIN_GROUP_COMMIT_MS", "0"))
+    JOIN_GROUP_COMMIT_MAX_BATCH: int = int(os.getenv("JOIN_GROUP_COMMIT_MAX_BATCH", "500"))
+
+    WALLET_FILTER_ENABLED: bool = os.getenv("WALLET_FILTER_ENABLED", "true").lower() in ("1", "true", "yes")
+    WALLET_FILTER_CAPACITY: int = int(os.getenv("WALLET_FILTER_CAPACITY", "1000000"))
+    WALLET_FILTER_ERROR_RATE: float = float(os.getenv("WALLET_FILTER_ERROR_RATE", "0.001"))
+    WALLET_FILTER_REFRESH_SECONDS: float = float(os.getenv("WALLET_FILTER_REFRESH_SECONDS", "30"))
+    # Refreshes re-read ids assigned this long ago, for inserts that
+    # committed after rows with higher ids (concurrent transactions).
+    WALLET_FILTER_RESCAN_SECONDS: float = float(os.getenv("WALLET_FILTER_RESCAN_SECONDS", "300"))
+
+    # Enables /api/admin/* when set; sent as the X-Admin-Token header.
+    ADMIN_TOKEN: str | None = os.getenv("ADMIN_TOKEN") or None
+
+    # How often the API re-reads the winners version marker from the DB.
+    WINNERS_CACHE_CHECK_SECONDS: float = float(os.getenv("WINNERS_CACHE_CHECK_SECONDS", "2"))
+    WINNERS_FEED_POLL_SECONDS: float = float(os.getenv("WINNERS_FEED_POLL_SECONDS", "2"))
+    WINNERS_FEED_HEARTBEAT_SECONDS: float = float(os.getenv("WINNERS_FEED_HEARTBEAT_SECONDS", "15"))
+    # Events buffered per client before a slow client is disconnected.
+    WINNERS_FEED_QUEUE_SIZE: int = int(os.getenv("WINNERS_FEED_QUEUE_SIZE", "100"))
+
+    # memory | shm | sql
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    # Per-route overrides, e.g. "join=5/60,winners=120/60" (requests/seconds).
+    RATE_LIMITS: str = os.getenv("RATE_LIMITS", "")
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+    RATE_LIMIT_SHM_NAME: str = os.getenv("RATE_LIMIT_SHM_NAME", "gift_rate_limit")
+    RATE_LIMIT_SHM_SLOTS: int = int(os.getenv("RATE_LIMIT_SHM_SLOTS", "65536"))
 
 
 settings = Settings()
@@ -1,12 +1,28 @@
 
+import time
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 
 from .config import settings
+from .services import metrics
 
 DATABASE_URL = settings.DATABASE_URL
 
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.DB_POOL_WAIT.observe(time.perf_counter() - start)
+
+
 engine_kwargs = {
     "pool_pre_ping": True,   
     "pool_recycle": 300,     
@@ -22,9 +38,22 @@ if DATABASE_URL.startswith("sqlite"):
 else:
     engine = create_engine(
         DATABASE_URL,
+        poolclass=TimedQueuePool,
         **engine_kwargs,
     )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
+
+
+def dialect_insert(bind: Engine | Connection):
+    """The dialect's `insert`, which has the ON CONFLICT clauses, for `bind`."""
+    dialect_name = bind.dialect.name
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(f"Unsupported database dialect: {dialect_name}")
+    return insert
@@ -1,15 +1,15 @@
+import secrets
+
 from fastapi import Depends, Request, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from time import time
 
+from app.config import settings
 from app.database import SessionLocal
+from app.services import metrics, rate_limit
 
 
-
-
-_RATE_LIMIT_STORE: dict[str, list[float]] = {}
-MAX_REQUESTS_PER_MINUTE = 5
-WINDOW_SECONDS = 60
+_ROUTE_LIMITS = rate_limit.parse_limits(settings.RATE_LIMITS)
 
 
 def get_db():
@@ -20,20 +20,45 @@ def get_db():
         db.close()
 
 
-async def rate_limit_dep(request: Request):
-    client_ip = request.client.host if request.client else "unknown"
-    now = time()
+def require_admin(request: Request):
+    token = settings.ADMIN_TOKEN
+    if not token:
+        # Admin endpoints are disabled unless a token is configured.
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
-    timestamps = _RATE_LIMIT_STORE.get(client_ip, [])
-    
-    timestamps = [ts for ts in timestamps if now - ts < WINDOW_SECONDS]
-
-    if len(timestamps) >= MAX_REQUESTS_PER_MINUTE:
+    supplied = request.headers.get("x-admin-token", "")
+    if not secrets.compare_digest(supplied.encode(), token.encode()):
         raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Too many requests, please slow down",
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin token",
         )
 
-    timestamps.append(now)
-    _RATE_LIMIT_STORE[client_ip] = timestamps
-    return
+
+def rate_limit_for(name: str, default: str):
+    """
+    Build a dependency that limits each client IP to `default`
+    ("<requests>/<seconds>") on this route, unless RATE_LIMITS overrides
+    `name`.
+    """
+    limit, window = _ROUTE_LIMITS.get(name) or rate_limit.parse_limit(default)
+
+    async def dep(request: Request):
+        client_ip = request.client.host if request.client else "unknown"
+        key = f"{name}:{client_ip}"
+
+        if settings.RATE_LIMIT_BACKEND == "sql":
+            allowed = await run_in_threadpool(rate_limit.hit, key, limit, window)
+        else:
+            allowed = rate_limit.hit(key, limit, window)
+
+        if not allowed:
+            metrics.RATE_LIMIT_REJECTIONS.inc(route=name)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please slow down",
+            )
+
+    return dep
+
+
+rate_limit_dep = rate_limit_for("join", "5/60")
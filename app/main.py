@@ -1,17 +1,38 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from .database import Base, engine
+from . import schema
+from .routes import admin as admin_routes
+from .routes import metrics as metrics_routes
 from .routes import participants as participants_routes
 from .routes import winners as winners_routes
 from .config import settings
+from .services import recaptcha, static_assets
+from .services.join_batcher import join_batcher
+from .services.wallet_filter import wallet_registry
+from .services.winners_feed import feed as winners_feed
+
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.DB_MIGRATE_ON_STARTUP:
+        schema.migrate()
+    if settings.WALLET_FILTER_ENABLED:
+        wallet_registry.start(settings.WALLET_FILTER_REFRESH_SECONDS)
+    static_assets.load()
+    app.state.index_page = _render_index()
+    yield
+    await join_batcher.shutdown()
+    await wallet_registry.stop()
+    await winners_feed.stop()
+    await recaptcha.shutdown()
 
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Raffle Backend")
+app = FastAPI(title="Raffle Backend", lifespan=lifespan)
 
 
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
@@ -20,15 +41,31 @@ templates = Jinja2Templates(directory="app/templates")
 
 app.include_router(participants_routes.router)
 app.include_router(winners_routes.router)
+app.include_router(admin_routes.router)
+app.include_router(metrics_routes.router)
+
+
+def _render_index() -> static_assets.Precompressed:
+    """The landing page only depends on settings, so it is rendered once."""
+    html = templates.get_template("index.html").render(
+        token_mint=settings.TOKEN_MINT,
+        recaptcha_site_key=settings.RECAPTCHA_SITE_KEY,
+        asset_url=static_assets.asset_url,
+    )
+    return static_assets.Precompressed(
+        html.encode(), "text/html; charset=utf-8", cache_control="no-cache"
+    )
 
 
 @app.get("/", response_class=HTMLResponse)
 def index(request: Request):
-    return templates.TemplateResponse(
-        "index.html",
-        {
-            "request": request,
-            "token_mint": settings.TOKEN_MINT,
-            "recaptcha_site_key": settings.RECAPTCHA_SITE_KEY,
-        },
-    )
+    return app.state.index_page.response(request)
+
+
+@app.get("/assets/{path:path}", include_in_schema=False)
+def asset(path: str, request: Request):
+    """Fingerprinted build output; the name changes with the content, so it is cached forever."""
+    found = static_assets.get(path)
+    if found is None:
+        return Response(status_code=404)
+    return found.response(request)
@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from sqlalchemy import (
-    Column, Integer, String, Boolean, DateTime, BigInteger,
-    ForeignKey,
+    Column, Integer, String, Boolean, DateTime, BigInteger, Float,
+    ForeignKey, Index,
 )
 from sqlalchemy.orm import relationship
 
@@ -47,6 +47,167 @@ class RaffleWinner(Base):
     created_at = Column(
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
+        index=True,
     )
 
     raffle = relationship("Raffle", back_populates="winners")
+
+    # Per-wallet history, newest first, walked by id.
+    __table_args__ = (Index("ix_raffle_winners_wallet_id", "wallet", "id"),)
+
+
+class WinnerWallet(Base):
+    """Every wallet that has won; inserting into it tells whether a win is a wallet's first."""
+
+    __tablename__ = "winner_wallets"
+
+    wallet = Column(String, primary_key=True)
+
+
+class WinnerStats(Base):
+    """Running totals over raffle_winners, updated with every logged winner."""
+
+    __tablename__ = "winner_stats"
+
+    id = Column(Integer, primary_key=True)
+    rounds = Column(BigInteger, nullable=False, default=0)
+    total_lamports = Column(BigInteger, nullable=False, default=0)
+    unique_winners = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+
+class CacheVersion(Base):
+    """Counter bumped whenever the data behind a cached response changes."""
+
+    __tablename__ = "cache_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+class RateLimitCounter(Base):
+    __tablename__ = "rate_limit_counters"
+
+    key = Column(String, primary_key=True)
+    window_index = Column(BigInteger, nullable=False)
+    current = Column(Integer, nullable=False, default=0)
+    previous = Column(Integer, nullable=False, default=0)
+    expires_at = Column(Float, nullable=False, index=True)
+
+
+class RaffleRound(Base):
+    """
+    Journal of one raffle cycle, advanced through
+    collected -> split -> owner_paid -> winner_paid -> logged
+    (or abandoned). Payout signatures are stored before the transactions
+    are sent so a restarted worker can tell what already landed.
+    """
+
+    __tablename__ = "raffle_rounds"
+
+    id = Column(Integer, primary_key=True, index=True)
+    raffle_id = Column(Integer, ForeignKey("raffles.id"), nullable=False)
+    state = Column(String, nullable=False, index=True)
+
+    collect_sig = Column(String, nullable=True)
+    distributable_lamports = Column(BigInteger, nullable=True)
+    owner_lamports = Column(BigInteger, nullable=True)
+    winner_lamports = Column(BigInteger, nullable=True)
+    winner_wallet = Column(String, nullable=True)
+
+    owner_sig = Column(String, nullable=True)
+    owner_last_valid_block_height = Column(BigInteger, nullable=True)
+    owner_attempts = Column(Integer, nullable=False, default=0)
+    winner_sig = Column(String, nullable=True)
+    winner_last_valid_block_height = Column(BigInteger, nullable=True)
+    winner_attempts = Column(Integer, nullable=False, default=0)
+
+    raffle_winner_id = Column(Integer, ForeignKey("raffle_winners.id"), nullable=True)
+    note = Column(String, nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+
+class SentTransaction(Base):
+    """
+    One transaction the worker sent (fee collection or a payout attempt),
+    with the priority fee it carried and how long it took to land.
+    """
+
+    __tablename__ = "sent_transactions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    signature = Column(String, nullable=False, index=True)
+    kind = Column(String, nullable=False, index=True)  # collect | owner | winner
+    round_id = Column(Integer, ForeignKey("raffle_rounds.id"), nullable=True, index=True)
+
+    compute_unit_limit = Column(Integer, nullable=True)
+    compute_unit_price = Column(BigInteger, nullable=True)  # micro-lamports per CU
+    fee_lamports = Column(BigInteger, nullable=True)
+
+    sent_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
+    landed_at = Column(DateTime(timezone=True), nullable=True)
+    landing_seconds = Column(Float, nullable=True)
+
+
+class FeeLedgerEntry(Base):
+    """One creator-wallet transaction and what it moved, filled by the fee ledger backfill."""
+
+    __tablename__ = "fee_ledger"
+
+    id = Column(Integer, primary_key=True, index=True)
+    signature = Column(String, unique=True, index=True, nullable=False)
+    slot = Column(BigInteger, nullable=False, index=True)
+    block_time = Column(DateTime(timezone=True), nullable=True)
+    failed = Column(Boolean, nullable=False, default=False)
+
+    # Transaction fee if the creator paid it, else 0.
+    fee_lamports = Column(BigInteger, nullable=False)
+    # Balance changes within the transaction; creator_delta already has
+    # fee_lamports taken off.
+    creator_delta_lamports = Column(BigInteger, nullable=False)
+    owner_delta_lamports = Column(BigInteger, nullable=False, default=0)
+
+
+class LedgerCheckpoint(Base):
+    """Newest signature already ingested for an address."""
+
+    __tablename__ = "ledger_checkpoints"
+
+    address = Column(String, primary_key=True)
+    signature = Column(String, nullable=False)
+    slot = Column(BigInteger, nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+
+class IneligibleWallet(Base):
+    """Participant wallet that can never receive a payout, found by the eligibility sweep."""
+
+    __tablename__ = "ineligible_wallets"
+
+    wallet = Column(String, primary_key=True)
+    reason = Column(String, nullable=False)
+    checked_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.deps import require_admin
+from app.services import participants_bulk
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+)
+
+
+@router.post("/participants/import")
+async def import_participants(request: Request):
+    """
+    Import wallets from the request body (text, one wallet per line).
+    The body is streamed and written in batches as it arrives.
+    """
+    importer = participants_bulk.WalletImporter()
+    tail = ""
+    batch: list[str] = []
+    try:
+        async for chunk in request.stream():
+            lines = (tail + chunk.decode("utf-8", errors="replace")).split("\n")
+            tail = lines.pop()
+            batch.extend(lines)
+            if len(batch) >= importer.batch_size:
+                await run_in_threadpool(importer.add_lines, batch)
+                batch = []
+        batch.append(tail)
+        await run_in_threadpool(importer.add_lines, batch)
+    finally:
+        stats = await run_in_threadpool(importer.finish)
+
+    print(f"[admin] participants import: {stats.as_dict()}")
+    return stats.as_dict()
+
+
+@router.get("/participants/export")
+def export_participants():
+    stats = participants_bulk.BulkStats("export")
+
+    def body():
+        yield from participants_bulk.iter_wallets(stats)
+        print(f"[admin] participants export: {stats.as_dict()}")
+
+    return StreamingResponse(
+        body(),
+        media_type="text/plain",
+        headers={"Content-Disposition": 'attachment; filename="participants.txt"'},
+    )
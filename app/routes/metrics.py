@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.services import metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -1,15 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
 
-from solders.pubkey import Pubkey
-
-from app.deps import get_db, rate_limit_dep
-from app import models
+from app.deps import get_db, rate_limit_dep, rate_limit_for
 from app.config import settings
-
-import requests
+from app.services import metrics, raffle_logic, recaptcha
+from app.services.join_batcher import join_batcher
+from app.services.wallet_filter import wallet_registry
 
 router = APIRouter(prefix="/api/participants", tags=["participants"])
 
@@ -24,7 +22,27 @@ class ParticipantJoinResponse(BaseModel):
     message: str
 
 
+class ParticipantStatusResponse(BaseModel):
+    wallet: str
+    joined: bool
+
+
+_ALREADY_JOINED = ParticipantJoinResponse(
+    ok=True,
+    message="You are already in the participants list.",
+)
+
+
+async def _is_registered(db: Session, wallet: str) -> bool:
+    """Filter first; only probable positives cost a DB lookup."""
+    if settings.WALLET_FILTER_ENABLED and not wallet_registry.might_contain(wallet):
+        return False
+    return await run_in_threadpool(raffle_logic.is_participant, db, wallet)
+
+
 def _validate_solana_wallet(addr: str) -> str:
+    # Imported here: solders is the slowest import on the API's startup path.
+    from solders.pubkey import Pubkey
 
     cleaned = addr.strip()
     if not cleaned:
@@ -44,41 +62,12 @@ def _validate_solana_wallet(addr: str) -> str:
     return cleaned
 
 
-def _verify_recaptcha(token: str, remote_ip: str | None = None) -> bool:
-
-    secret = settings.RECAPTCHA_SECRET
-    if not secret:
-        return True
-
-    if not token:
-        return False
-
-    data = {
-        "secret": secret,
-        "response": token,
-    }
-    if remote_ip:
-        data["remoteip"] = remote_ip
-
-    try:
-        resp = requests.post(
-            "https://www.google.com/recaptcha/api/siteverify",
-            data=data,
-            timeout=5,
-        )
-        resp.raise_for_status()
-        out = resp.json()
-        return bool(out.get("success"))
-    except Exception:
-        return False
-
-
 @router.post(
     "/join",
     response_model=ParticipantJoinResponse,
     dependencies=[Depends(rate_limit_dep)],
 )
-def join_participants(
+async def join_participants(
     payload: ParticipantJoinRequest,
     request: Request,
     db: Session = Depends(get_db),
@@ -91,36 +80,46 @@ def join_participants(
             )
 
         client_ip = request.client.host if request.client else None
-        ok = _verify_recaptcha(payload.recaptcha_token, client_ip)
+        with metrics.JOIN_PHASE.time(phase="captcha"):
+            ok = await recaptcha.verify_recaptcha(payload.recaptcha_token, client_ip)
         if not ok:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Captcha verification failed.",
             )
 
-    wallet = _validate_solana_wallet(payload.wallet)
+    with metrics.JOIN_PHASE.time(phase="validation"):
+        wallet = _validate_solana_wallet(payload.wallet)
 
-    existing = db.query(models.Participant).filter_by(wallet=wallet).first()
-    if existing:
-        return ParticipantJoinResponse(
-            ok=True,
-            message="You are already in the participants list.",
-        )
+    with metrics.JOIN_PHASE.time(phase="db"):
+        # Without the filter every pre-check is a DB read; the insert below
+        # already reports repeats.
+        if settings.WALLET_FILTER_ENABLED and await _is_registered(db, wallet):
+            return _ALREADY_JOINED
 
-    participant = models.Participant(wallet=wallet)
-
-    try:
-        db.add(participant)
-        db.commit()
-        db.refresh(participant)
-    except IntegrityError:
-        db.rollback()
-        return ParticipantJoinResponse(
-            ok=True,
-            message="You are already in the participants list.",
-        )
+        if settings.JOIN_GROUP_COMMIT_MS > 0:
+            added = await join_batcher.join(wallet)
+        else:
+            added = await run_in_threadpool(raffle_logic.join_participant, db, wallet)
+    if settings.WALLET_FILTER_ENABLED:
+        wallet_registry.add(wallet)
+    if not added:
+        return _ALREADY_JOINED
 
     return ParticipantJoinResponse(
         ok=True,
         message="You have been successfully added to the participants list.",
     )
+
+
+@router.get(
+    "/{wallet}",
+    response_model=ParticipantStatusResponse,
+    dependencies=[Depends(rate_limit_for("status", "60/60"))],
+)
+async def participant_status(wallet: str, db: Session = Depends(get_db)):
+    wallet = _validate_solana_wallet(wallet)
+    return ParticipantStatusResponse(
+        wallet=wallet,
+        joined=await _is_registered(db, wallet),
+    )
@@ -1,24 +1,70 @@
-from fastapi import APIRouter, Depends
-from pydantic import BaseModel
+import asyncio
+import time
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
 from sqlalchemy.orm import Session
 
-from app.deps import get_db
+from app.deps import get_db, rate_limit_for
 from app import models
+from app.config import settings
+from app.database import SessionLocal
+from app.services import raffle_logic
+from app.services.winners_feed import feed, winners_after
 
 router = APIRouter(prefix="/api/winners", tags=["winners"])
 
+LATEST_MAX_LIMIT = 50
+HISTORY_MAX_LIMIT = 100
+
 
 class WinnerOut(BaseModel):
+    id: int
     wallet: str
     amount_sol: float
     tx_signature: str | None
 
 
-@router.get("/latest", response_model=list[WinnerOut])
-def get_latest_winners(limit: int = 5, db: Session = Depends(get_db)):
-    """
-    Return latest raffle winners for front-end to display as live feed.
-    """
+class WinnerHistoryOut(WinnerOut):
+    raffle_id: int
+    created_at: datetime | None
+
+
+class WinnersPage(BaseModel):
+    items: list[WinnerHistoryOut]
+    # Pass as before_id to get the next (older) page; None on the last one.
+    next_before_id: int | None
+
+
+class WinnerStatsOut(BaseModel):
+    rounds: int
+    total_lamports: int
+    total_sol: float
+    unique_winners: int
+
+
+_winners_adapter = TypeAdapter(list[WinnerOut])
+
+# limit -> (version, body, etag)
+_latest_cache: dict[int, tuple[int, bytes, str]] = {}
+_version = 0
+_version_checked_at = float("-inf")
+
+
+def _winners_version(db: Session) -> int:
+    """Winners version marker, re-read from the DB at most every few seconds."""
+    global _version, _version_checked_at
+    now = time.monotonic()
+    if now - _version_checked_at >= settings.WINNERS_CACHE_CHECK_SECONDS:
+        _version = raffle_logic.get_cache_version(db, raffle_logic.WINNERS_CACHE_KEY)
+        _version_checked_at = now
+    return _version
+
+
+def _render_latest(db: Session, limit: int) -> bytes:
     rows = (
         db.query(models.RaffleWinner)
         .order_by(models.RaffleWinner.created_at.desc())
@@ -30,10 +76,177 @@ def get_latest_winners(limit: int = 5, db: Session = Depends(get_db)):
     for w in rows:
         result.append(
             WinnerOut(
+                id=w.id,
                 wallet=w.wallet,
                 amount_sol=w.amount_lamports / 1_000_000_000,
                 tx_signature=w.tx_signature,
             )
         )
 
-    return result
+    return _winners_adapter.dump_json(result)
+
+
+@router.get("/latest", response_model=list[WinnerOut])
+def get_latest_winners(request: Request, limit: int = 5, db: Session = Depends(get_db)):
+    """
+    Return latest raffle winners for front-end to display as live feed.
+
+    Responses are cached per limit until log_winner bumps the winners
+    version, and carry an ETag so pollers get 304s in between.
+    """
+    limit = max(1, min(limit, LATEST_MAX_LIMIT))
+    version = _winners_version(db)
+
+    cached = _latest_cache.get(limit)
+    if cached is None or cached[0] != version:
+        body = _render_latest(db, limit)
+        cached = (version, body, f'W/"winners-{version}-{limit}"')
+        _latest_cache[limit] = cached
+
+    _, body, etag = cached
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _page(db: Session, limit: int, before_id: int | None, wallet: str | None = None) -> WinnersPage:
+    limit = max(1, min(limit, HISTORY_MAX_LIMIT))
+    # One extra row tells whether another page follows.
+    rows = raffle_logic.winners_page(db, limit + 1, before_id, wallet)
+    items = [
+        WinnerHistoryOut(
+            id=w.id,
+            raffle_id=w.raffle_id,
+            wallet=w.wallet,
+            amount_sol=w.amount_lamports / 1_000_000_000,
+            tx_signature=w.tx_signature,
+            created_at=w.created_at,
+        )
+        for w in rows[:limit]
+    ]
+    next_before_id = items[-1].id if len(rows) > limit else None
+    return WinnersPage(items=items, next_before_id=next_before_id)
+
+
+@router.get(
+    "/history",
+    response_model=WinnersPage,
+    dependencies=[Depends(rate_limit_for("history", "60/60"))],
+)
+def get_winners_history(
+    limit: int = 20,
+    before_id: int | None = None,
+    db: Session = Depends(get_db),
+):
+    """All winners, newest first, paged by id cursor."""
+    return _page(db, limit, before_id)
+
+
+@router.get(
+    "/wallet/{wallet}",
+    response_model=WinnersPage,
+    dependencies=[Depends(rate_limit_for("history", "60/60"))],
+)
+def get_wallet_winnings(
+    wallet: str,
+    limit: int = 20,
+    before_id: int | None = None,
+    db: Session = Depends(get_db),
+):
+    """What `wallet` has won, newest first, paged like /history."""
+    from solders.pubkey import Pubkey
+
+    wallet = wallet.strip()
+    try:
+        Pubkey.from_string(wallet)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid Solana wallet address.",
+        )
+    return _page(db, limit, before_id, wallet)
+
+
+@router.get("/stats", response_model=WinnerStatsOut)
+def get_winner_stats(db: Session = Depends(get_db)):
+    """Totals kept up to date by log_winner; a single-row read."""
+    stats = raffle_logic.get_winner_stats(db)
+    rounds = stats.rounds if stats else 0
+    total = stats.total_lamports if stats else 0
+    return WinnerStatsOut(
+        rounds=rounds,
+        total_lamports=total,
+        total_sol=total / 1_000_000_000,
+        unique_winners=stats.unique_winners if stats else 0,
+    )
+
+
+def _backfill(last_id: int) -> list[tuple[int, str]] | None:
+    """Events after `last_id`, or None if more were missed than the feed shows."""
+    db = SessionLocal()
+    try:
+        events = winners_after(db, last_id, LATEST_MAX_LIMIT + 1)
+    finally:
+        db.close()
+    if len(events) > LATEST_MAX_LIMIT:
+        return None
+    return events
+
+
+@router.get("/stream")
+async def stream_winners(request: Request, last_id: int | None = None):
+    """
+    Server-Sent Events feed of new winners.
+
+    Clients resuming after a disconnect get every winner after the
+    Last-Event-ID header their EventSource sends (or `last_id` on a first
+    connect) before live events. The header wins: an automatic reconnect
+    reuses the original URL, so its `last_id` is stale. A client that
+    missed more than /latest returns gets a "reset" event instead and
+    should refetch /latest and reconnect from its newest id. Clients that
+    fall behind by more than WINNERS_FEED_QUEUE_SIZE events are
+    disconnected and resume on reconnect.
+    """
+    header = request.headers.get("last-event-id")
+    if header and header.isdigit():
+        last_id = int(header)
+
+    sub = feed.subscribe()
+
+    async def events():
+        sent_id = last_id or 0
+        try:
+            yield "retry: 5000\n\n"
+            if last_id is not None:
+                backlog = await run_in_threadpool(_backfill, last_id)
+                if backlog is None:
+                    yield "event: reset\ndata: {}\n\n"
+                    return
+                for event_id, frame in backlog:
+                    sent_id = event_id
+                    yield frame
+
+            while not sub.overflowed.is_set():
+                try:
+                    event_id, frame = await asyncio.wait_for(
+                        sub.queue.get(),
+                        timeout=settings.WINNERS_FEED_HEARTBEAT_SECONDS,
+                    )
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if event_id > sent_id:
+                    sent_id = event_id
+                    yield frame
+        finally:
+            feed.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,47 @@
+"""
+Schema setup, kept out of the import path.
+
+    python -m app.schema
+
+creates missing tables, adds indexes that were declared after their
+table was first created (create_all only builds indexes together with a
+new table) and seeds the winner_stats summary from existing winners.
+The API and the worker run it at startup unless DB_MIGRATE_ON_STARTUP is
+off, for deployments that migrate once before scaling out.
+"""
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from app import models  # noqa: F401  (registers the tables on Base.metadata)
+from app.database import Base, SessionLocal, engine
+from app.services import raffle_logic
+
+
+def migrate(bind: Engine = engine) -> list[str]:
+    """Bring the schema up to date; returns the indexes it had to add."""
+    existing_tables = set(inspect(bind).get_table_names())
+    Base.metadata.create_all(bind=bind)
+
+    added = []
+    inspector = inspect(bind)
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in present:
+                index.create(bind=bind)
+                added.append(index.name)
+
+    db = SessionLocal(bind=bind)
+    try:
+        raffle_logic.init_winner_stats(db)
+        db.commit()
+    finally:
+        db.close()
+    return added
+
+
+if __name__ == "__main__":
+    added = migrate()
+    print(f"[schema] up to date; added indexes: {added or 'none'}")
@@ -0,0 +1,194 @@
+import asyncio
+import time
+
+from solders.pubkey import Pubkey
+from solders.system_program import ID as SYSTEM_PROGRAM_ID
+from sqlalchemy import delete, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal, dialect_insert
+from app.services import solana_client
+
+# What an account lookup says about paying a wallet.
+WALLET = "wallet"                # system-owned account: any amount lands
+UNFUNDED = "unfunded"            # no account yet: needs the rent-exempt minimum
+PROGRAM_OWNED = "program_owned"  # token account, PDA, program...: a transfer fails
+OFF_CURVE = "off_curve"          # no private key exists, so the SOL would be stuck
+INVALID = "invalid"              # not a public key at all
+
+# Verdicts that do not change with time or amount; the sweep records these.
+PERMANENT = frozenset({PROGRAM_OWNED, OFF_CURVE, INVALID})
+
+# Cached verdicts kept before expired ones are pruned.
+MAX_CACHED = 100_000
+
+
+def _verdict(pubkey: Pubkey, account) -> str:
+    if account is None:
+        return UNFUNDED if pubkey.is_on_curve() else OFF_CURVE
+    if account.owner != SYSTEM_PROGRAM_ID or account.executable:
+        return PROGRAM_OWNED
+    if not pubkey.is_on_curve():
+        return OFF_CURVE
+    return WALLET
+
+
+class EligibilityChecker:
+    """
+    Decides whether a wallet can receive a payout, from batched
+    getMultipleAccounts lookups cached for `ttl_seconds`.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._cache: dict[str, tuple[str, float]] = {}
+        self._rent_minimum: int | None = None
+
+    async def verdicts(self, wallets: list[str]) -> dict[str, str]:
+        now = time.monotonic()
+        result: dict[str, str] = {}
+        lookup: dict[str, Pubkey] = {}
+        for wallet in dict.fromkeys(wallets):
+            cached = self._cache.get(wallet)
+            if cached is not None and cached[1] > now:
+                result[wallet] = cached[0]
+                continue
+            try:
+                lookup[wallet] = Pubkey.from_string(wallet)
+            except ValueError:
+                result[wallet] = INVALID
+
+        if lookup:
+            accounts = await solana_client.get_multiple_accounts(list(lookup.values()))
+            if len(self._cache) >= MAX_CACHED:
+                self._cache = {w: v for w, v in self._cache.items() if v[1] > now}
+            expires = time.monotonic() + self.ttl_seconds
+            for (wallet, pubkey), account in zip(lookup.items(), accounts):
+                verdict = _verdict(pubkey, account)
+                result[wallet] = verdict
+                self._cache[wallet] = (verdict, expires)
+        return result
+
+    async def rent_minimum(self) -> int:
+        """Smallest transfer that can open a new (0-byte) system account."""
+        if self._rent_minimum is None:
+            self._rent_minimum = await solana_client.get_minimum_balance_for_rent_exemption(0)
+        return self._rent_minimum
+
+    async def can_receive(self, wallet: str, lamports: int) -> tuple[bool, str]:
+        """(eligible, verdict) for paying `lamports` to `wallet`."""
+        verdict = (await self.verdicts([wallet]))[wallet]
+        if verdict == WALLET:
+            return True, verdict
+        if verdict == UNFUNDED:
+            return lamports >= await self.rent_minimum(), verdict
+        return False, verdict
+
+
+checker = EligibilityChecker(settings.ELIGIBILITY_CACHE_SECONDS)
+
+
+def _insert_ignore(bind: Engine | Connection):
+    """INSERT INTO ineligible_wallets that skips wallets already present."""
+    return dialect_insert(bind)(models.IneligibleWallet).on_conflict_do_nothing(index_elements=["wallet"])
+
+
+def is_marked(db: Session, wallet: str) -> bool:
+    return db.get(models.IneligibleWallet, wallet) is not None
+
+
+def record(db: Session, verdicts: dict[str, str]) -> int:
+    """
+    Mark the wallets with a permanent verdict and unmark the rest; returns
+    how many were newly marked.
+    """
+    marked = [
+        {"wallet": wallet, "reason": verdict}
+        for wallet, verdict in verdicts.items()
+        if verdict in PERMANENT
+    ]
+    cleared = [wallet for wallet, verdict in verdicts.items() if verdict not in PERMANENT]
+    added = 0
+    if marked:
+        added = db.connection().execute(_insert_ignore(db.get_bind()), marked).rowcount
+    if cleared:
+        db.execute(
+            delete(models.IneligibleWallet).where(models.IneligibleWallet.wallet.in_(cleared))
+        )
+    db.commit()
+    return added
+
+
+class EligibilitySweeper:
+    """
+    Walks the participants table in id order, a batch every interval,
+    and records which wallets can never be paid, so selection skips them
+    without a lookup. Starts over from the lowest id after each pass.
+    """
+
+    def __init__(self, batch_size: int) -> None:
+        self.batch_size = batch_size
+        self._last_id = 0
+        self._pass_checked = 0
+        self._pass_marked = 0
+        self._task: asyncio.Task | None = None
+
+    def _next_batch(self) -> list[tuple[int, str]]:
+        db = SessionLocal()
+        try:
+            return db.connection().execute(
+                select(models.Participant.id, models.Participant.wallet)
+                .where(models.Participant.id > self._last_id)
+                .order_by(models.Participant.id)
+                .limit(self.batch_size)
+            ).all()
+        finally:
+            db.close()
+
+    def _record(self, verdicts: dict[str, str]) -> int:
+        db = SessionLocal()
+        try:
+            return record(db, verdicts)
+        finally:
+            db.close()
+
+    async def sweep_once(self) -> None:
+        rows = await asyncio.to_thread(self._next_batch)
+        if not rows:
+            print(
+                f"[eligibility] sweep pass done: checked={self._pass_checked} "
+                f"newly_marked={self._pass_marked}"
+            )
+            self._last_id = self._pass_checked = self._pass_marked = 0
+            return
+        verdicts = await checker.verdicts([wallet for _, wallet in rows])
+        self._pass_marked += await asyncio.to_thread(self._record, verdicts)
+        self._pass_checked += len(rows)
+        self._last_id = rows[-1].id
+
+    async def _run(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.sweep_once()
+            except Exception as e:
+                print("[eligibility] sweep failed:", repr(e))
+            await asyncio.sleep(interval_seconds)
+
+    def start(self, interval_seconds: float) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval_seconds))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+sweeper = EligibilitySweeper(settings.ELIGIBILITY_SWEEP_BATCH)
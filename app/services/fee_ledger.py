@@ -0,0 +1,199 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from solders.pubkey import Pubkey
+from solders.rpc.responses import RpcConfirmedTransactionStatusWithSignature
+from sqlalchemy import case, func
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import dialect_insert
+from app.services import payout_journal, solana_client
+
+# Only finalized history goes into the ledger, so entries never get rolled back.
+LEDGER_COMMITMENT = "finalized"
+
+
+class BackfillStats:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.pages = 0
+        self.signatures = 0
+        self.already_known = 0
+        self.inserted = 0
+        self.missing = 0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "pages": self.pages,
+            "signatures": self.signatures,
+            "already_known": self.already_known,
+            "inserted": self.inserted,
+            "missing": self.missing,
+            "seconds": round(time.perf_counter() - self.started, 2),
+        }
+
+
+def _ledger_insert_ignore(bind: Engine | Connection):
+    """INSERT INTO fee_ledger that skips signatures already present."""
+    return dialect_insert(bind)(models.FeeLedgerEntry).on_conflict_do_nothing(index_elements=["signature"])
+
+
+async def _fetch_entry(
+    sem: asyncio.Semaphore,
+    info: RpcConfirmedTransactionStatusWithSignature,
+    creator: Pubkey,
+    owner: Pubkey,
+) -> dict[str, object] | None:
+    signature = str(info.signature)
+    async with sem:
+        try:
+            tx = await solana_client.fetch_transaction(signature, LEDGER_COMMITMENT)
+        except Exception as e:
+            print(f"[fee_ledger] getTransaction {signature} failed:", repr(e))
+            return None
+    if tx is None or tx.transaction.meta is None:
+        return None
+
+    meta = tx.transaction.meta
+    fee_payer = tx.transaction.transaction.message.account_keys[0]
+    block_time = tx.block_time if tx.block_time is not None else info.block_time
+    return {
+        "signature": signature,
+        "slot": tx.slot,
+        "block_time": (
+            datetime.fromtimestamp(block_time, timezone.utc) if block_time is not None else None
+        ),
+        "failed": meta.err is not None,
+        "fee_lamports": meta.fee if fee_payer == creator else 0,
+        "creator_delta_lamports": solana_client.balance_delta(tx, creator) or 0,
+        "owner_delta_lamports": solana_client.balance_delta(tx, owner) or 0,
+    }
+
+
+async def backfill(db: Session, concurrency: int, page_size: int) -> BackfillStats:
+    """
+    Page getSignaturesForAddress for the creator wallet back to the last
+    checkpoint and store one fee_ledger row per transaction.
+
+    Each page's transactions are fetched concurrently (at most
+    `concurrency` in flight) and committed before the next page, and
+    signatures already in the ledger are not fetched again, so an
+    interrupted run picks up cheaply. The checkpoint only moves once a run
+    finishes with nothing missing.
+    """
+    stats = BackfillStats()
+    creator = solana_client.creator_pubkey()
+    owner = solana_client.owner_pubkey()
+    insert = _ledger_insert_ignore(db.get_bind())
+    sem = asyncio.Semaphore(concurrency)
+
+    checkpoint = db.get(models.LedgerCheckpoint, str(creator))
+    until = checkpoint.signature if checkpoint is not None else None
+    newest: RpcConfirmedTransactionStatusWithSignature | None = None
+    before: str | None = None
+
+    while True:
+        page = await solana_client.get_signatures_for_address(
+            creator, before=before, until=until, limit=page_size, commitment=LEDGER_COMMITMENT
+        )
+        if not page:
+            break
+        stats.pages += 1
+        stats.signatures += len(page)
+        if newest is None:
+            newest = page[0]
+
+        signatures = [str(info.signature) for info in page]
+        known = {
+            sig
+            for (sig,) in db.query(models.FeeLedgerEntry.signature).filter(
+                models.FeeLedgerEntry.signature.in_(signatures)
+            )
+        }
+        stats.already_known += len(known)
+
+        rows = await asyncio.gather(
+            *(
+                _fetch_entry(sem, info, creator, owner)
+                for info in page
+                if str(info.signature) not in known
+            )
+        )
+        entries = [row for row in rows if row is not None]
+        stats.missing += len(rows) - len(entries)
+        if entries:
+            stats.inserted += db.connection().execute(insert, entries).rowcount
+        db.commit()
+
+        print(f"[fee_ledger] page {stats.pages}: {stats.as_dict()}")
+        before = signatures[-1]
+        if len(page) < page_size:
+            break
+
+    if newest is not None and stats.missing == 0:
+        if checkpoint is None:
+            checkpoint = models.LedgerCheckpoint(address=str(creator))
+            db.add(checkpoint)
+        checkpoint.signature = str(newest.signature)
+        checkpoint.slot = newest.slot
+        db.commit()
+
+    return stats
+
+
+def report(db: Session) -> dict[str, int]:
+    """
+    Compare what the ledger says the creator wallet received and paid out
+    with what the DB recorded as winner and owner payouts.
+    """
+    entry = models.FeeLedgerEntry
+    gross = entry.creator_delta_lamports + entry.fee_lamports
+    # Owner payouts: transactions where the creator's balance went down and
+    # the owner's went up.
+    owner_received = case(
+        ((entry.creator_delta_lamports < 0) & (entry.owner_delta_lamports > 0),
+         entry.owner_delta_lamports),
+        else_=0,
+    )
+    chain = db.query(
+        func.count(entry.id),
+        func.coalesce(func.sum(case((entry.failed, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((gross > 0, gross), else_=0)), 0),
+        func.coalesce(func.sum(case((gross < 0, -gross), else_=0)), 0),
+        func.coalesce(func.sum(owner_received), 0),
+        func.coalesce(func.sum(entry.fee_lamports), 0),
+    ).one()
+    transactions, failed, collected, paid_out, owner_paid_chain, fees = (int(v) for v in chain)
+
+    winners_count, winners_total = db.query(
+        func.count(models.RaffleWinner.id),
+        func.coalesce(func.sum(models.RaffleWinner.amount_lamports), 0),
+    ).one()
+
+    rnd = models.RaffleRound
+    owner_paid_db = db.query(func.coalesce(func.sum(rnd.owner_lamports), 0)).filter(
+        rnd.owner_sig.isnot(None),
+        rnd.state.in_(
+            (payout_journal.OWNER_PAID, payout_journal.WINNER_PAID, payout_journal.LOGGED)
+        ),
+    ).scalar()
+
+    winners_paid_chain = paid_out - owner_paid_chain
+    return {
+        "ledger_transactions": transactions,
+        "ledger_failed_transactions": failed,
+        "collected_lamports": collected,
+        "paid_out_lamports": paid_out,
+        "fees_lamports": fees,
+        "retained_lamports": collected - paid_out - fees,
+        "owner_paid_onchain_lamports": owner_paid_chain,
+        "owner_paid_db_lamports": int(owner_paid_db),
+        "owner_paid_difference_lamports": owner_paid_chain - int(owner_paid_db),
+        "winners_paid_onchain_lamports": winners_paid_chain,
+        "winners_db_count": int(winners_count),
+        "winners_db_lamports": int(winners_total),
+        "winners_paid_difference_lamports": winners_paid_chain - int(winners_total),
+    }
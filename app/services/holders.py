@@ -0,0 +1,184 @@
+import asyncio
+import threading
+import time
+
+from solders.pubkey import Pubkey
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal
+from app.services import solana_client
+from app.services.weighted_sampler import WeightedSampler
+
+# Wallets per "wallet IN (...)" lookup.
+LOOKUP_CHUNK = 500
+# Participants read per batch when catching up on new joins.
+SYNC_BATCH = 50_000
+# Draws of wallets that left the participants table before giving up.
+PICK_ATTEMPTS = 16
+
+
+class HolderIndex:
+    """
+    Participants who hold a token, weighted by balance, for one mint.
+
+    A holder snapshot is applied as a diff against the previous one and new
+    participants are picked up by id, so between snapshots only the weights
+    that changed are touched. The sync methods open their own sessions and
+    are meant to run off the event loop (asyncio.to_thread).
+    """
+
+    def __init__(self, mint: Pubkey) -> None:
+        self.mint = mint
+        self.sampler = WeightedSampler()
+        self.holdings: dict[str, int] = {}
+        self.last_participant_id = 0
+        self.refreshed_at: float | None = None
+        self._lock = threading.Lock()
+        self._refreshing = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    async def refresh(self) -> dict[str, float]:
+        """Take a new holder snapshot and apply it."""
+        async with self._refreshing:
+            started = time.perf_counter()
+            holdings = await solana_client.get_token_holdings(
+                self.mint,
+                sharded=settings.HOLDER_SNAPSHOT_SHARDED,
+                concurrency=settings.HOLDER_SNAPSHOT_CONCURRENCY,
+            )
+            fetched = time.perf_counter()
+            stats = await asyncio.to_thread(self.apply_snapshot, holdings)
+            stats["fetch_seconds"] = round(fetched - started, 3)
+            stats["apply_seconds"] = round(time.perf_counter() - fetched, 3)
+            return stats
+
+    def apply_snapshot(self, holdings: dict[str, int]) -> dict[str, float]:
+        old = self.holdings
+        changed = [w for w, amount in holdings.items() if old.get(w) != amount]
+        changed.extend(w for w in old if w not in holdings)
+
+        # Wallets already in the sampler are known participants; the rest
+        # only matter if they hold now and joined before the last sync
+        # (later joins are read by _sync_participants below).
+        updates = {}
+        unknown = []
+        for wallet in changed:
+            if wallet in self.sampler:
+                updates[wallet] = holdings.get(wallet, 0)
+            elif holdings.get(wallet):
+                unknown.append(wallet)
+
+        db = SessionLocal()
+        try:
+            if self.last_participant_id:
+                for start in range(0, len(unknown), LOOKUP_CHUNK):
+                    rows = db.query(models.Participant.wallet).filter(
+                        models.Participant.wallet.in_(unknown[start:start + LOOKUP_CHUNK]),
+                        models.Participant.id <= self.last_participant_id,
+                    )
+                    for (wallet,) in rows:
+                        updates[wallet] = holdings[wallet]
+
+            with self._lock:
+                for wallet, amount in updates.items():
+                    self.sampler.set_weight(wallet, amount)
+                self.holdings = holdings
+                self.refreshed_at = time.monotonic()
+                joined = self._sync_participants(db)
+                if self.sampler.dead > len(self.sampler):
+                    self.sampler.compact()
+        finally:
+            db.close()
+
+        return {
+            "holders": len(holdings),
+            "changed": len(changed),
+            "new_participants": joined,
+            "weighted_participants": len(self.sampler),
+        }
+
+    def _sync_participants(self, db: Session) -> int:
+        """Weight participants who joined since the last sync; returns how many were read."""
+        read = 0
+        while True:
+            # Core select: at a million rows the ORM row handling dominates.
+            rows = db.connection().execute(
+                select(models.Participant.id, models.Participant.wallet)
+                .where(models.Participant.id > self.last_participant_id)
+                .order_by(models.Participant.id)
+                .limit(SYNC_BATCH)
+            ).all()
+            for _, wallet in rows:
+                amount = self.holdings.get(wallet)
+                if amount:
+                    self.sampler.set_weight(wallet, amount)
+            if rows:
+                self.last_participant_id = rows[-1].id
+                read += len(rows)
+            if len(rows) < SYNC_BATCH:
+                return read
+
+    def pick(self) -> str | None:
+        """A participant wallet drawn by holdings, or None if no participant holds the token."""
+        db = SessionLocal()
+        try:
+            with self._lock:
+                self._sync_participants(db)
+                for _ in range(PICK_ATTEMPTS):
+                    wallet = self.sampler.sample()
+                    if wallet is None:
+                        return None
+                    still_joined = (
+                        db.query(models.Participant.id)
+                        .filter(models.Participant.wallet == wallet)
+                        .first()
+                    )
+                    if still_joined is not None:
+                        return wallet
+                    # Removed since it was weighted. Forget it rather than
+                    # zero it, so a later balance change does not weight it
+                    # again; if it rejoins, _sync_participants picks it up.
+                    self.sampler.discard(wallet)
+                return None
+        finally:
+            db.close()
+
+    def exclude(self, wallet: str) -> None:
+        """Stop drawing `wallet` until a later snapshot changes its balance."""
+        with self._lock:
+            self.sampler.set_weight(wallet, 0)
+
+    async def _run(self, refresh_seconds: float) -> None:
+        while True:
+            try:
+                stats = await self.refresh()
+                print(f"[holders] {self.mint} snapshot: {stats}")
+            except Exception as e:
+                print(f"[holders] {self.mint} snapshot failed:", repr(e))
+            await asyncio.sleep(refresh_seconds)
+
+    def start(self, refresh_seconds: float) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(refresh_seconds))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+_indexes: dict[str, HolderIndex] = {}
+
+
+def get_index(mint: str) -> HolderIndex:
+    index = _indexes.get(mint)
+    if index is None:
+        index = _indexes[mint] = HolderIndex(Pubkey.from_string(mint))
+    return index
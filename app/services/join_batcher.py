@@ -0,0 +1,86 @@
+"""
+Group commit for participant joins.
+
+Joins arriving within JOIN_GROUP_COMMIT_MS of each other are written with
+one multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING and a single
+commit, instead of one transaction (and one fsync) per signup.
+"""
+import asyncio
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services import raffle_logic
+
+
+def _insert_batch(wallets: list[str]) -> set[str]:
+    db = SessionLocal()
+    try:
+        return raffle_logic.join_participants(db, wallets)
+    finally:
+        db.close()
+
+
+class JoinBatcher:
+    def __init__(self, window_ms: float, max_batch: int) -> None:
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        # wallet -> futures of every request waiting on it in this batch
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        # Running flushes; the loop only keeps weak references to tasks.
+        self._tasks: set[asyncio.Task] = set()
+
+    async def join(self, wallet: str) -> bool:
+        """Queue `wallet` for the next group commit; True if it was added."""
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(wallet, []).append(fut)
+
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.window, self._start_flush
+            )
+        return await fut
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.create_task(self._flush(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def shutdown(self) -> None:
+        """Write whatever is queued and wait for the flushes in flight."""
+        self._start_flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _flush(self, batch: dict[str, list[asyncio.Future]]) -> None:
+        try:
+            added = await run_in_threadpool(_insert_batch, list(batch))
+        except Exception as e:
+            for futures in batch.values():
+                for fut in futures:
+                    if not fut.done():
+                        fut.set_exception(e)
+            return
+
+        for wallet, futures in batch.items():
+            # Only the first request for a wallet in the batch reports "added".
+            first_result = wallet in added
+            for fut in futures:
+                if not fut.done():
+                    fut.set_result(first_result)
+                first_result = False
+
+
+join_batcher = JoinBatcher(
+    settings.JOIN_GROUP_COMMIT_MS,
+    settings.JOIN_GROUP_COMMIT_MAX_BATCH,
+)
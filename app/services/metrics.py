@@ -0,0 +1,247 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Prometheus text exposition format, rendered in-process so neither the API
+# nor the worker needs a client library or an external collector.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+_registry: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.doc = doc
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    @abstractmethod
+    def _samples(self) -> list[str]:
+        """Exposition lines for every series of this metric."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, doc, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        doc: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last is +Inf), sum, count]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, seconds: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = [(key, list(s[0]), s[1], s[2]) for key, s in self._series.items()]
+
+        lines = []
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def render() -> str:
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve /metrics from a daemon thread (used by the worker)."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ---- metrics shared by the API and the worker ----
+
+RPC_LATENCY = Histogram(
+    "solana_rpc_request_seconds",
+    "Latency of Solana JSON-RPC calls by method.",
+    ("method",),
+)
+RPC_ERRORS = Counter(
+    "solana_rpc_errors_total",
+    "Solana JSON-RPC calls that raised, by method.",
+    ("method",),
+)
+RPC_ENDPOINT_LATENCY = Histogram(
+    "solana_rpc_endpoint_seconds",
+    "Latency of successful Solana JSON-RPC calls by endpoint host.",
+    ("endpoint",),
+)
+RPC_ENDPOINT_ERRORS = Counter(
+    "solana_rpc_endpoint_errors_total",
+    "Failed Solana JSON-RPC calls by endpoint host.",
+    ("endpoint",),
+)
+RPC_HEDGES = Counter(
+    "solana_rpc_hedged_reads_total",
+    "Reads that were also sent to a second endpoint after the p95 threshold.",
+)
+TX_LANDING = Histogram(
+    "solana_tx_landing_seconds",
+    "Time from sending a worker transaction until it was seen confirmed, by kind.",
+    ("kind",),
+)
+TX_FEES = Counter(
+    "solana_tx_fees_lamports_total",
+    "Base plus priority fees paid by confirmed worker transactions, by kind.",
+    ("kind",),
+)
+PUMPPORTAL_LATENCY = Histogram(
+    "pumpportal_request_seconds",
+    "Latency of PumpPortal HTTP requests by endpoint.",
+    ("endpoint",),
+)
+RAFFLE_PHASE = Histogram(
+    "raffle_cycle_phase_seconds",
+    "Duration of each raffle cycle phase, by raffle.",
+    ("raffle", "phase"),
+)
+RAFFLE_ROUNDS = Counter(
+    "raffle_rounds_total",
+    "Raffle rounds by raffle and how they ended.",
+    ("raffle", "outcome"),
+)
+JOIN_PHASE = Histogram(
+    "join_phase_seconds",
+    "Latency of the join endpoint split by phase.",
+    ("phase",),
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected by the rate limiter, by route.",
+    ("route",),
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the database pool. "
+    "Only recorded for pooled databases (PostgreSQL); SQLite engines have no series.",
+)
+
+
+@contextmanager
+def rpc_timer(method: str):
+    """Time one RPC call and count it as an error if it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        RPC_ERRORS.inc(method=method)
+        raise
+    finally:
+        RPC_LATENCY.observe(time.perf_counter() - start, method=method)
@@ -0,0 +1,186 @@
+"""
+Streaming bulk import and export of the participants list.
+
+Wallets are read one per line, validated in batches and inserted with a
+single statement per batch that skips wallets already present: COPY into a
+temporary table followed by INSERT ... SELECT ... ON CONFLICT DO NOTHING on
+Postgres, and an executemany of INSERT ... ON CONFLICT DO NOTHING on SQLite.
+"""
+import io
+import time
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app import models
+from app.database import engine
+from app.services import raffle_logic
+
+BATCH_SIZE = 5_000
+EXPORT_BATCH_SIZE = 10_000
+
+
+class BulkStats:
+    def __init__(self, kind: str = "import") -> None:
+        self.kind = kind
+        self.read = 0
+        self.invalid = 0
+        self.inserted = 0
+        self.started_at = time.perf_counter()
+        self.finished_at: float | None = None
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished_at or time.perf_counter()
+        return end - self.started_at
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict[str, object]:
+        out: dict[str, object] = {"rows": self.read}
+        if self.kind == "import":
+            out["invalid"] = self.invalid
+            out["inserted"] = self.inserted
+            out["skipped_existing"] = self.read - self.invalid - self.inserted
+        out["seconds"] = round(self.elapsed, 3)
+        out["rows_per_second"] = round(self.rows_per_second, 1)
+        return out
+
+
+def validate_wallets(lines: Iterable[str]) -> tuple[list[str], int]:
+    """Return (unique valid wallets in input order, number of invalid lines)."""
+    # Not at module level: the API imports this module for its admin routes.
+    from solders.pubkey import Pubkey
+
+    valid: dict[str, None] = {}
+    invalid = 0
+    for line in lines:
+        wallet = line.strip()
+        if not wallet:
+            continue
+        try:
+            Pubkey.from_string(wallet)
+        except Exception:
+            invalid += 1
+            continue
+        valid[wallet] = None
+    return list(valid), invalid
+
+
+def _copy_insert(conn: Connection, wallets: list[str], created_at: datetime) -> int:
+    conn.execute(
+        text(
+            "CREATE TEMP TABLE IF NOT EXISTS participants_import "
+            "(wallet text, created_at timestamptz) ON COMMIT DELETE ROWS"
+        )
+    )
+    buf = io.StringIO()
+    stamp = created_at.isoformat()
+    for wallet in wallets:
+        buf.write(f"{wallet}\t{stamp}\n")
+    buf.seek(0)
+
+    cursor = conn.connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(
+            "COPY participants_import (wallet, created_at) FROM STDIN", buf
+        )
+    finally:
+        cursor.close()
+
+    result = conn.execute(
+        text(
+            "INSERT INTO participants (wallet, created_at) "
+            "SELECT wallet, created_at FROM participants_import "
+            "ON CONFLICT (wallet) DO NOTHING"
+        )
+    )
+    return result.rowcount
+
+
+def insert_wallets(conn: Connection, wallets: list[str]) -> int:
+    """Insert validated wallets in one transaction; return how many were new."""
+    if not wallets:
+        return 0
+    created_at = datetime.now(timezone.utc)
+    with conn.begin():
+        if conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2":
+            return _copy_insert(conn, wallets, created_at)
+        result = conn.execute(
+            raffle_logic.participant_insert_ignore(conn),
+            [{"wallet": wallet, "created_at": created_at} for wallet in wallets],
+        )
+        return result.rowcount
+
+
+class WalletImporter:
+    """Accumulates lines and flushes them to the DB every `batch_size` lines."""
+
+    def __init__(self, batch_size: int = BATCH_SIZE) -> None:
+        self.batch_size = batch_size
+        self.stats = BulkStats()
+        self._pending: list[str] = []
+        self._conn = engine.connect()
+
+    def add_lines(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            if not line.strip():
+                continue
+            self._pending.append(line)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        wallets, invalid = validate_wallets(batch)
+        self.stats.read += len(batch)
+        self.stats.invalid += invalid
+        self.stats.inserted += insert_wallets(self._conn, wallets)
+
+    def finish(self) -> BulkStats:
+        try:
+            self.flush()
+        finally:
+            self._conn.close()
+        self.stats.finished_at = time.perf_counter()
+        return self.stats
+
+
+def import_wallets(lines: Iterable[str], batch_size: int = BATCH_SIZE) -> BulkStats:
+    importer = WalletImporter(batch_size)
+    try:
+        importer.add_lines(lines)
+    finally:
+        stats = importer.finish()
+    return stats
+
+
+def iter_wallets(
+    stats: BulkStats | None = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[str]:
+    """Yield "wallet\\n" lines in id order, paging by primary key."""
+    last_id = 0
+    with engine.connect() as conn:
+        while True:
+            rows = conn.execute(
+                models.Participant.__table__.select()
+                .with_only_columns(models.Participant.id, models.Participant.wallet)
+                .where(models.Participant.id > last_id)
+                .order_by(models.Participant.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            if stats is not None:
+                stats.read += len(rows)
+            yield "".join(f"{row.wallet}\n" for row in rows)
+    if stats is not None:
+        stats.finished_at = time.perf_counter()
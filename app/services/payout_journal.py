@@ -0,0 +1,190 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services import metrics, raffle_logic
+
+COLLECTED = "collected"
+SPLIT = "split"
+OWNER_PAID = "owner_paid"
+WINNER_PAID = "winner_paid"
+LOGGED = "logged"
+ABANDONED = "abandoned"
+
+UNFINISHED_STATES = (COLLECTED, SPLIT, OWNER_PAID, WINNER_PAID)
+
+# Which payout is settled while a round sits in each state.
+PAYOUT_FOR_STATE = {SPLIT: "owner", OWNER_PAID: "winner"}
+STATE_AFTER_PAYOUT = {"owner": OWNER_PAID, "winner": WINNER_PAID}
+
+
+def start_round(
+    db: Session,
+    raffle_id: int,
+    collect_sig: str | None,
+    collect_sent_at: datetime | None = None,
+    collect_fee_lamports: int | None = None,
+) -> models.RaffleRound:
+    rnd = models.RaffleRound(
+        raffle_id=raffle_id,
+        state=COLLECTED,
+        collect_sig=collect_sig,
+    )
+    db.add(rnd)
+    if collect_sig is not None:
+        db.flush()
+        record_sent(
+            db, collect_sig, "collect",
+            round_id=rnd.id,
+            fee_lamports=collect_fee_lamports,
+            sent_at=collect_sent_at,
+        )
+    db.commit()
+    db.refresh(rnd)
+    return rnd
+
+
+def mark_collect_landed(db: Session, rnd: models.RaffleRound) -> None:
+    mark_landed(db, rnd.collect_sig)
+    db.commit()
+
+
+def abandon_round(db: Session, rnd: models.RaffleRound, note: str) -> None:
+    rnd.state = ABANDONED
+    rnd.note = note
+    db.commit()
+    metrics.RAFFLE_ROUNDS.inc(raffle=str(rnd.raffle_id), outcome=ABANDONED)
+
+
+def mark_split(
+    db: Session,
+    rnd: models.RaffleRound,
+    distributable: int,
+    owner_lamports: int,
+    winner_lamports: int,
+    winner_wallet: str,
+) -> None:
+    rnd.distributable_lamports = distributable
+    rnd.owner_lamports = owner_lamports
+    rnd.winner_lamports = winner_lamports
+    rnd.winner_wallet = winner_wallet
+    rnd.state = SPLIT
+    db.commit()
+
+
+def record_sent(
+    db: Session,
+    signature: str,
+    kind: str,
+    round_id: int | None = None,
+    compute_unit_limit: int | None = None,
+    compute_unit_price: int | None = None,
+    fee_lamports: int | None = None,
+    sent_at: datetime | None = None,
+) -> None:
+    """Add a sent_transactions row; committed by the caller."""
+    db.add(
+        models.SentTransaction(
+            signature=signature,
+            kind=kind,
+            round_id=round_id,
+            compute_unit_limit=compute_unit_limit,
+            compute_unit_price=compute_unit_price,
+            fee_lamports=fee_lamports,
+            sent_at=sent_at or datetime.now(timezone.utc),
+        )
+    )
+
+
+def mark_landed(db: Session, signature: str) -> None:
+    """Stamp the latest send of `signature` as confirmed; committed by the caller."""
+    sent = (
+        db.query(models.SentTransaction)
+        .filter(models.SentTransaction.signature == signature)
+        .order_by(models.SentTransaction.id.desc())
+        .first()
+    )
+    if sent is None or sent.landed_at is not None:
+        return
+
+    sent.landed_at = datetime.now(timezone.utc)
+    sent_at = sent.sent_at
+    if sent_at.tzinfo is None:
+        # SQLite hands back naive datetimes.
+        sent_at = sent_at.replace(tzinfo=timezone.utc)
+    sent.landing_seconds = (sent.landed_at - sent_at).total_seconds()
+
+    metrics.TX_LANDING.observe(sent.landing_seconds, kind=sent.kind)
+    if sent.fee_lamports:
+        metrics.TX_FEES.inc(sent.fee_lamports, kind=sent.kind)
+
+
+def record_payout_attempt(
+    db: Session,
+    rnd: models.RaffleRound,
+    payout: str,
+    signature: str,
+    last_valid_block_height: int,
+    compute_unit_limit: int | None = None,
+    compute_unit_price: int | None = None,
+    fee_lamports: int | None = None,
+) -> None:
+    """Persist a signed payout's signature before it is submitted."""
+    setattr(rnd, f"{payout}_sig", signature)
+    setattr(rnd, f"{payout}_last_valid_block_height", last_valid_block_height)
+    setattr(rnd, f"{payout}_attempts", getattr(rnd, f"{payout}_attempts") + 1)
+    record_sent(
+        db, signature, payout,
+        round_id=rnd.id,
+        compute_unit_limit=compute_unit_limit,
+        compute_unit_price=compute_unit_price,
+        fee_lamports=fee_lamports,
+    )
+    db.commit()
+
+
+def mark_paid(
+    db: Session,
+    rnd: models.RaffleRound,
+    payout: str,
+    signature: str | None,
+    note: str | None = None,
+) -> None:
+    """Move past `payout`; `signature` is None if it was given up on."""
+    setattr(rnd, f"{payout}_sig", signature)
+    if signature is not None:
+        mark_landed(db, signature)
+    rnd.state = STATE_AFTER_PAYOUT[payout]
+    if note:
+        rnd.note = note
+    db.commit()
+
+
+def mark_logged(db: Session, rnd: models.RaffleRound) -> models.RaffleWinner:
+    """Log the winner and close the round in one transaction."""
+    winner = raffle_logic.add_winner(
+        db,
+        raffle_id=rnd.raffle_id,
+        wallet=rnd.winner_wallet,
+        amount_lamports=rnd.winner_lamports,
+        tx_signature=rnd.winner_sig,
+    )
+    db.flush()
+    rnd.raffle_winner_id = winner.id
+    rnd.state = LOGGED
+    db.commit()
+    metrics.RAFFLE_ROUNDS.inc(raffle=str(rnd.raffle_id), outcome=LOGGED)
+    return winner
+
+
+def unfinished_rounds(db: Session, raffle_id: int) -> list[models.RaffleRound]:
+    return (
+        db.query(models.RaffleRound)
+        .filter(
+            models.RaffleRound.raffle_id == raffle_id,
+            models.RaffleRound.state.in_(UNFINISHED_STATES),
+        )
+        .order_by(models.RaffleRound.id)
+        .all()
+    )
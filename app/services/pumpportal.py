@@ -4,43 +4,153 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
 from typing import Optional
 
-import requests
+import httpx
 from solders.keypair import Keypair
+from solders.pubkey import Pubkey
 from solders.transaction import VersionedTransaction
-from solders.rpc.requests import SendVersionedTransaction
-from solders.rpc.config import RpcSendTransactionConfig
-from solders.commitment_config import CommitmentLevel
+from spl.token.constants import WRAPPED_SOL_MINT
+from spl.token.instructions import get_associated_token_address
 
 from ..config import settings
+from . import metrics, solana_client
 
 logger = logging.getLogger(__name__)
 
-PUMP_LIGHTNING_URL = "https://pumpportal.fun/api/trade"
-PUMP_LOCAL_URL = "https://pumpportal.fun/api/trade-local"
+PUMP_LIGHTNING_URL = f"{settings.PUMPPORTAL_BASE_URL}/api/trade"
+PUMP_LOCAL_URL = f"{settings.PUMPPORTAL_BASE_URL}/api/trade-local"
 
+PUMP_PROGRAM_ID = Pubkey.from_string("6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P")
+PUMP_AMM_PROGRAM_ID = Pubkey.from_string("pAMMBay6oceH9fJKBRHGP5D4bD4sWpmSwMn52FMfXEA")
 
-def _collect_via_lightning() -> Optional[str]:
-    api_key = settings.PUMPPORTAL_API_KEY
-    if not api_key:
-        logger.warning("collect_via_lightning called but PUMPPORTAL_API_KEY is empty")
-        return None
+RETRY_BASE_DELAY_SECONDS = 0.5
+RETRY_MAX_DELAY_SECONDS = 8.0
+
+
+_http: httpx.AsyncClient | None = None
+
+
+def get_http() -> httpx.AsyncClient:
+    global _http
+    if _http is None:
+        _http = httpx.AsyncClient(
+            timeout=settings.PUMPPORTAL_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+        )
+    return _http
+
+
+async def startup() -> None:
+    get_http()
+
+
+async def shutdown() -> None:
+    global _http
+    if _http is not None:
+        await _http.aclose()
+        _http = None
+
+
+def creator_fee_vault(creator: Pubkey, pool: str | None = None) -> Pubkey:
+    """
+    Account where unclaimed creator fees accrue: the bonding-curve creator
+    vault PDA, or the WSOL token account of the PumpSwap creator vault
+    authority once the token trades on "pump-amm". `pool` defaults to
+    PUMP_POOL.
+    """
+    if (pool or settings.PUMP_POOL) == "pump-amm":
+        authority, _ = Pubkey.find_program_address(
+            [b"creator_vault", bytes(creator)], PUMP_AMM_PROGRAM_ID
+        )
+        return get_associated_token_address(authority, WRAPPED_SOL_MINT)
 
+    vault, _ = Pubkey.find_program_address(
+        [b"creator-vault", bytes(creator)], PUMP_PROGRAM_ID
+    )
+    return vault
+
+
+# Failures where the request never reached PumpPortal.
+_NOT_SENT = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+async def _post_with_retries(url: str, submits: bool = False, **kwargs) -> httpx.Response:
+    """
+    POST to PumpPortal, retrying timeouts, connection errors and 5xx replies
+    with full-jitter exponential backoff. 4xx replies are raised immediately.
+
+    A `submits` request (Lightning sends the transaction itself) is only
+    retried when it never got through: after a read timeout or a 5xx the
+    transaction may already be on its way, and a retry would send a second
+    one whose signature is the only one recorded.
+    """
+    endpoint = url.rsplit("/", 1)[-1]
+    attempt = 0
+    while True:
+        try:
+            with metrics.PUMPPORTAL_LATENCY.time(endpoint=endpoint):
+                resp = await get_http().post(url, **kwargs)
+            if resp.status_code < 500:
+                resp.raise_for_status()
+                return resp
+            error: Exception = httpx.HTTPStatusError(
+                f"PumpPortal returned {resp.status_code}",
+                request=resp.request,
+                response=resp,
+            )
+        except (httpx.TimeoutException, httpx.TransportError) as e:
+            error = e
+        if submits and not isinstance(error, _NOT_SENT):
+            raise error
+
+        attempt += 1
+        if attempt > settings.PUMPPORTAL_MAX_RETRIES:
+            raise error
+
+        delay = random.uniform(
+            0, min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2 ** attempt)
+        )
+        logger.warning(
+            "PumpPortal request failed (%s), retry %d/%d in %.2fs",
+            error, attempt, settings.PUMPPORTAL_MAX_RETRIES, delay,
+        )
+        await asyncio.sleep(delay)
+
+
+async def estimate_priority_fee_sol(creator: Pubkey, fee_vault: Pubkey) -> float:
+    """
+    Total priorityFee (SOL) for collectCreatorFee: the compute-unit price
+    estimate for the creator and its fee vault times
+    PUMPPORTAL_COLLECT_COMPUTE_UNITS, clamped to the configured bounds.
+    """
+    price = await solana_client.priority_fees.estimate([creator, fee_vault])
+    lamports = price * settings.PUMPPORTAL_COLLECT_COMPUTE_UNITS / 1_000_000
+    fee_sol = lamports / solana_client.LAMPORTS_PER_SOL
+    return min(
+        settings.PUMPPORTAL_MAX_PRIORITY_FEE_SOL,
+        max(settings.PUMPPORTAL_MIN_PRIORITY_FEE_SOL, fee_sol),
+    )
+
+
+async def _collect_via_lightning(
+    api_key: str, mint: str | None, pool: str, priority_fee_sol: float
+) -> Optional[str]:
     data: dict[str, object] = {
         "action": "collectCreatorFee",
-        "priorityFee": 0.000001,
-        "pool": settings.PUMP_POOL or "pump",
+        "priorityFee": priority_fee_sol,
+        "pool": pool,
     }
-    if settings.TOKEN_MINT:
-        data["mint"] = settings.TOKEN_MINT
+    if mint:
+        data["mint"] = mint
 
-    resp = requests.post(
-        f"{PUMP_LIGHTNING_URL}?api-key={api_key}",
+    resp = await _post_with_retries(
+        PUMP_LIGHTNING_URL,
+        submits=True,
+        params={"api-key": api_key},
         data=data,
-        timeout=15,
     )
-    resp.raise_for_status()
     j = resp.json()
     logger.info("PumpPortal lightning collectCreatorFee response: %s", j)
 
@@ -48,25 +158,19 @@ def _collect_via_lightning() -> Optional[str]:
     return sig
 
 
-def _collect_via_local() -> Optional[str]:
-    priv_b58 = settings.CREATOR_PRIVATE_KEY_BASE58
-    if not priv_b58:
-        logger.warning("collect_via_local called but CREATOR_PRIVATE_KEY_BASE58 is empty")
-        return None
-
-    kp = Keypair.from_base58_string(priv_b58)
-    public_key = str(kp.pubkey())
-
+async def _collect_via_local(
+    kp: Keypair, mint: str | None, pool: str, priority_fee_sol: float
+) -> Optional[str]:
     data: dict[str, object] = {
-        "publicKey": public_key,
+        "publicKey": str(kp.pubkey()),
         "action": "collectCreatorFee",
-        "pool": settings.PUMP_POOL or "pump",
+        "priorityFee": priority_fee_sol,
+        "pool": pool,
     }
-    if settings.TOKEN_MINT:
-        data["mint"] = settings.TOKEN_MINT
+    if mint:
+        data["mint"] = mint
 
-    resp = requests.post(PUMP_LOCAL_URL, data=data, timeout=15)
-    resp.raise_for_status()
+    resp = await _post_with_retries(PUMP_LOCAL_URL, data=data)
     raw_tx_bytes = resp.content
 
     vtx = VersionedTransaction(
@@ -74,37 +178,35 @@ def _collect_via_local() -> Optional[str]:
         [kp],
     )
 
-    commitment = CommitmentLevel.Confirmed
-    config = RpcSendTransactionConfig(preflight_commitment=commitment)
-    payload = SendVersionedTransaction(vtx, config).to_json()
-    headers = {"Content-Type": "application/json"}
-
-    r = requests.post(
-        settings.SOLANA_RPC_URL,
-        headers=headers,
-        data=payload,
-        timeout=30,
-    )
-    r.raise_for_status()
-    out = r.json()
-    sig = out.get("result")
-    logger.info("Sent collectCreatorFee via local RPC: %s", out)
+    sig = await solana_client.send_raw_transaction(bytes(vtx))
+    logger.info("Sent collectCreatorFee via local RPC: %s", sig)
     return sig
 
 
-def _collect_creator_fee_blocking() -> Optional[str]:
+async def collect_creator_fee(
+    priority_fee_sol: float,
+    creator: Keypair | None = None,
+    mint: str | None = None,
+    pool: str | None = None,
+    api_key: str | None = None,
+) -> Optional[str]:
+    """
+    Claim `creator`'s fees for `mint`, through Lightning when there is an
+    API key (its wallet must be the creator) or by signing a trade-local
+    transaction otherwise. Unset arguments fall back to the single-raffle
+    settings.
+    """
+    creator = creator or solana_client.creator_keypair()
+    mint = mint if mint is not None else settings.TOKEN_MINT
+    pool = pool or settings.PUMP_POOL or "pump"
+    api_key = api_key if api_key is not None else settings.PUMPPORTAL_API_KEY
     try:
-        if settings.PUMPPORTAL_API_KEY:
+        if api_key:
             logger.info("Using PumpPortal LIGHTNING collectCreatorFee")
-            return _collect_via_lightning()
+            return await _collect_via_lightning(api_key, mint, pool, priority_fee_sol)
         else:
             logger.info("Using PumpPortal LOCAL trade-local collectCreatorFee")
-            return _collect_via_local()
+            return await _collect_via_local(creator, mint, pool, priority_fee_sol)
     except Exception as e:
         logger.error("Error while collecting creator fee: %s", e, exc_info=True)
         return None
-
-
-async def collect_creator_fee() -> Optional[str]:
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _collect_creator_fee_blocking)
@@ -0,0 +1,161 @@
+import json
+import os
+
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+
+from app.config import settings
+from app.services import pumpportal
+
+BPS = 10_000
+SELECTIONS = ("uniform", "holdings")
+
+
+class RaffleConfig:
+    """
+    One raffle the worker runs: the raffles row it draws for, the token and
+    creator wallet whose fees fund it, how each distribution is split and
+    how often it draws.
+    """
+
+    def __init__(
+        self,
+        raffle_id: int,
+        creator: Keypair,
+        owner_wallet: str,
+        *,
+        token_mint: str | None,
+        pump_pool: str,
+        fee_vault: str | None,
+        pumpportal_api_key: str,
+        winner_share_bps: int,
+        selection: str,
+        threshold_lamports: int,
+        min_spacing: float,
+        max_interval: float,
+    ) -> None:
+        if not 0 <= winner_share_bps <= BPS:
+            raise ValueError(f"raffle {raffle_id}: winner_share_bps must be within 0..{BPS}")
+        if selection not in SELECTIONS:
+            raise ValueError(f"raffle {raffle_id}: selection must be one of {SELECTIONS}")
+        if selection == "holdings" and not token_mint:
+            raise ValueError(f"raffle {raffle_id}: holdings selection needs a token mint")
+        Pubkey.from_string(owner_wallet)
+
+        self.raffle_id = raffle_id
+        self.creator = creator
+        self.creator_pubkey = creator.pubkey()
+        self.owner_wallet = owner_wallet
+        self.token_mint = token_mint
+        self.pump_pool = pump_pool
+        self.fee_vault = (
+            Pubkey.from_string(fee_vault)
+            if fee_vault
+            else pumpportal.creator_fee_vault(self.creator_pubkey, pump_pool)
+        )
+        self.pumpportal_api_key = pumpportal_api_key
+        self.winner_share_bps = winner_share_bps
+        self.selection = selection
+        self.threshold_lamports = threshold_lamports
+        self.min_spacing = min_spacing
+        self.max_interval = max_interval
+
+    def split(self, distributable: int) -> tuple[int, int]:
+        """(owner_part, winner_part) of `distributable` lamports."""
+        winner_part = distributable * self.winner_share_bps // BPS
+        return distributable - winner_part, winner_part
+
+
+def _env(name: str | None, default: str) -> str:
+    if not name:
+        return default
+    value = os.getenv(name)
+    if value is None:
+        raise RuntimeError(f"{name} is not set")
+    return value
+
+
+def _api_key(entry: dict) -> str:
+    # An explicit null/"" opts out of Lightning: collects are signed locally
+    # with the raffle's own creator key.
+    if "pumpportal_api_key_env" in entry and not entry["pumpportal_api_key_env"]:
+        return ""
+    return _env(entry.get("pumpportal_api_key_env"), settings.PUMPPORTAL_API_KEY)
+
+
+def _from_entry(entry: dict) -> RaffleConfig:
+    raffle_id = int(entry["raffle_id"])
+    # Secrets stay in the environment; the file only names the variables.
+    key = _env(entry.get("creator_key_env"), settings.CREATOR_PRIVATE_KEY_BASE58)
+    if not key:
+        raise RuntimeError(f"raffle {raffle_id}: no creator key configured")
+    return RaffleConfig(
+        raffle_id,
+        Keypair.from_base58_string(key),
+        entry.get("owner_wallet") or settings.OWNER_WALLET,
+        token_mint=entry.get("token_mint"),
+        pump_pool=entry.get("pump_pool") or settings.PUMP_POOL or "pump",
+        fee_vault=entry.get("creator_fee_vault"),
+        pumpportal_api_key=_api_key(entry),
+        winner_share_bps=int(entry.get("winner_share_bps", settings.RAFFLE_WINNER_SHARE_BPS)),
+        selection=entry.get("selection") or settings.RAFFLE_SELECTION,
+        threshold_lamports=int(
+            entry.get("fee_threshold_lamports", settings.RAFFLE_FEE_THRESHOLD_LAMPORTS)
+        ),
+        min_spacing=float(entry.get("min_spacing_seconds", settings.RAFFLE_MIN_SPACING_SECONDS)),
+        max_interval=float(
+            entry.get("max_interval_seconds", settings.RAFFLE_MAX_INTERVAL_SECONDS)
+        ),
+    )
+
+
+def default_raffle() -> RaffleConfig:
+    """ACTIVE_RAFFLE_ID configured entirely from the environment."""
+    return _from_entry({
+        "raffle_id": settings.ACTIVE_RAFFLE_ID,
+        "token_mint": settings.TOKEN_MINT,
+        "creator_fee_vault": settings.CREATOR_FEE_VAULT,
+    })
+
+
+def load_raffles() -> list[RaffleConfig]:
+    """
+    Raffles listed in RAFFLES_FILE, a JSON array such as
+
+        [{"raffle_id": 1, "token_mint": "...", "creator_key_env": "CREATOR_KEY_1"},
+         {"raffle_id": 2, "token_mint": "...", "creator_key_env": "CREATOR_KEY_2",
+          "owner_wallet": "...", "winner_share_bps": 8000, "selection": "holdings",
+          "fee_threshold_lamports": 50000000, "max_interval_seconds": 7200}]
+
+    Also accepted per entry: pump_pool, creator_fee_vault,
+    pumpportal_api_key_env (null for local signing) and min_spacing_seconds.
+    Anything left out falls back to the single-raffle settings. Without
+    RAFFLES_FILE this is just the default raffle.
+
+    All raffles draw from the one participants table: a wallet that joined
+    is in every raffle's pool.
+    """
+    if not settings.RAFFLES_FILE:
+        return [default_raffle()]
+
+    with open(settings.RAFFLES_FILE) as f:
+        raffles = [_from_entry(entry) for entry in json.load(f)]
+    if not raffles:
+        raise RuntimeError(f"{settings.RAFFLES_FILE} lists no raffles")
+
+    # Fee deltas and devnet balances are read off the creator wallet, so two
+    # raffles sharing one would each count the other's fees.
+    for attr in ("raffle_id", "creator_pubkey"):
+        values = [getattr(r, attr) for r in raffles]
+        if len(set(values)) != len(values):
+            raise RuntimeError(f"{settings.RAFFLES_FILE}: duplicate {attr}")
+    # A Lightning key collects for the one wallet it belongs to; a second
+    # raffle on the same key (e.g. both falling back to PUMPPORTAL_API_KEY)
+    # would claim the other creator's fees.
+    keys = [r.pumpportal_api_key for r in raffles if r.pumpportal_api_key]
+    if len(set(keys)) != len(keys):
+        raise RuntimeError(
+            f"{settings.RAFFLES_FILE}: raffles share a PumpPortal API key; give each "
+            "pumpportal_api_key_env its own key, or null to sign collects locally"
+        )
+    return raffles
@@ -1,6 +1,20 @@
+import secrets
+
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, literal, select, true, update
+from sqlalchemy.engine import Connection, Engine
 from app import models
+from app.database import dialect_insert
+
+
+WINNERS_CACHE_KEY = "winners"
+WINNER_STATS_ID = 1
+
+
+# Number of random id probes before falling back to an OFFSET lookup. With a
+# table that is at least half dense the fallback runs with probability
+# below 2**-24.
+RANDOM_PROBE_ATTEMPTS = 24
 
 
 def get_active_raffle(db: Session, raffle_id: int) -> models.Raffle | None:
@@ -22,17 +36,189 @@ def add_participant(db: Session, wallet: str) -> models.Participant:
     return participant
 
 
+def participant_insert_ignore(bind: Engine | Connection):
+    """INSERT INTO participants that skips wallets already present."""
+    return dialect_insert(bind)(models.Participant).on_conflict_do_nothing(index_elements=["wallet"])
+
+
+def is_participant(db: Session, wallet: str) -> bool:
+    return (
+        db.query(models.Participant.id).filter_by(wallet=wallet).first()
+        is not None
+    )
+
+
+def join_participant(db: Session, wallet: str) -> bool:
+    """
+    Add `wallet` with a single INSERT ... ON CONFLICT DO NOTHING RETURNING.
+    Returns True if it was added, False if it was already a participant.
+    """
+    stmt = participant_insert_ignore(db.get_bind()).returning(
+        models.Participant.id
+    )
+    added = db.execute(stmt, {"wallet": wallet}).first() is not None
+    db.commit()
+    return added
+
+
+def join_participants(db: Session, wallets: list[str]) -> set[str]:
+    """Add several wallets in one statement and one commit; return the new ones."""
+    if not wallets:
+        return set()
+    stmt = (
+        participant_insert_ignore(db.get_bind())
+        .values([{"wallet": wallet} for wallet in wallets])
+        .returning(models.Participant.wallet)
+    )
+    added = set(db.scalars(stmt))
+    db.commit()
+    return added
+
+
+def _participant_id_bounds(db: Session) -> tuple[int | None, int | None]:
+    # Two scalar subqueries instead of "SELECT min(id), max(id)": SQLite only
+    # answers min/max from the index when the aggregate is alone in its query.
+    stmt = select(
+        select(func.min(models.Participant.id)).scalar_subquery(),
+        select(func.max(models.Participant.id)).scalar_subquery(),
+    )
+    low, high = db.execute(stmt).one()
+    return low, high
+
+
 def get_random_participant(db: Session) -> models.Participant | None:
-    return db.query(models.Participant).order_by(func.random()).first()
+    """
+    Pick a participant uniformly at random without scanning the table.
 
+    Draws an id between min(id) and max(id) and looks it up through the
+    primary key. Ids left behind by deleted rows are redrawn rather than
+    rounded to a neighbour, so every existing row keeps the same chance.
+    """
+    low, high = _participant_id_bounds(db)
+    if low is None:
+        return None
 
-def log_winner(
+    span = high - low + 1
+    for _ in range(RANDOM_PROBE_ATTEMPTS):
+        participant = db.get(models.Participant, low + secrets.randbelow(span))
+        if participant is not None:
+            return participant
+
+    # Very sparse id space: fall back to a uniform offset over the live rows.
+    total = db.query(func.count(models.Participant.id)).scalar() or 0
+    if total == 0:
+        return None
+    return (
+        db.query(models.Participant)
+        .order_by(models.Participant.id)
+        .offset(secrets.randbelow(total))
+        .first()
+    )
+
+
+def get_cache_version(db: Session, name: str) -> int:
+    row = db.get(models.CacheVersion, name)
+    return row.version if row else 0
+
+
+def bump_cache_version(db: Session, name: str) -> None:
+    """Increment the version marker `name` as part of the caller's transaction."""
+    insert = dialect_insert(db.get_bind())
+    # One upsert, so two first bumps cannot both try to create the row.
+    db.execute(
+        insert(models.CacheVersion)
+        .values(name=name, version=1)
+        .on_conflict_do_update(
+            index_elements=["name"],
+            set_={"version": models.CacheVersion.version + 1},
+        )
+    )
+
+
+def init_winner_stats(db: Session) -> None:
+    """
+    Create the winner_stats row, and the winner_wallets it counts, from the
+    winners logged so far. Does nothing if the row exists; safe to race.
+    Runs from app.schema.migrate; the caller commits.
+    """
+    insert = dialect_insert(db.get_bind())
+    winners = models.RaffleWinner
+    created = db.execute(
+        insert(models.WinnerStats)
+        .from_select(
+            ["id", "rounds", "total_lamports", "unique_winners"],
+            select(
+                literal(WINNER_STATS_ID),
+                func.count(winners.id),
+                func.coalesce(func.sum(winners.amount_lamports), 0),
+                func.count(func.distinct(winners.wallet)),
+            # WHERE keeps SQLite from reading ON CONFLICT as a join clause.
+            ).where(true()),
+        )
+        .on_conflict_do_nothing(index_elements=["id"])
+    ).rowcount
+    if created:
+        db.execute(
+            insert(models.WinnerWallet)
+            .from_select(["wallet"], select(winners.wallet).distinct().where(true()))
+            .on_conflict_do_nothing(index_elements=["wallet"])
+        )
+
+
+def _count_winner(db: Session, wallet: str, amount_lamports: int) -> None:
+    """Add one winner to the winner_stats totals in the caller's transaction."""
+    if db.get(models.WinnerStats, WINNER_STATS_ID) is None:
+        init_winner_stats(db)
+    insert = dialect_insert(db.get_bind())
+    # The primary key decides, so concurrent wins by one wallet count once.
+    first_win = db.execute(
+        insert(models.WinnerWallet)
+        .values(wallet=wallet)
+        .on_conflict_do_nothing(index_elements=["wallet"])
+    ).rowcount == 1
+    db.execute(
+        update(models.WinnerStats)
+        .where(models.WinnerStats.id == WINNER_STATS_ID)
+        .values(
+            rounds=models.WinnerStats.rounds + 1,
+            total_lamports=models.WinnerStats.total_lamports + amount_lamports,
+            unique_winners=models.WinnerStats.unique_winners + int(first_win),
+        )
+    )
+
+
+def get_winner_stats(db: Session) -> models.WinnerStats | None:
+    return db.get(models.WinnerStats, WINNER_STATS_ID)
+
+
+def winners_page(
+    db: Session,
+    limit: int,
+    before_id: int | None = None,
+    wallet: str | None = None,
+) -> list[models.RaffleWinner]:
+    """
+    Winners newest first, `limit` at a time. Pass the smallest id of a page
+    as `before_id` to get the next one; each page is an index range scan
+    however deep it is.
+    """
+    query = db.query(models.RaffleWinner)
+    if wallet is not None:
+        query = query.filter(models.RaffleWinner.wallet == wallet)
+    if before_id is not None:
+        query = query.filter(models.RaffleWinner.id < before_id)
+    return query.order_by(models.RaffleWinner.id.desc()).limit(limit).all()
+
+
+def add_winner(
     db: Session,
     raffle_id: int,
     wallet: str,
     amount_lamports: int,
     tx_signature: str | None,
 ) -> models.RaffleWinner:
+    """Stage a winner row in the caller's transaction without committing."""
+    _count_winner(db, wallet, amount_lamports)
     winner = models.RaffleWinner(
         raffle_id=raffle_id,
         wallet=wallet,
@@ -40,6 +226,18 @@ def log_winner(
         tx_signature=tx_signature,
     )
     db.add(winner)
+    bump_cache_version(db, WINNERS_CACHE_KEY)
+    return winner
+
+
+def log_winner(
+    db: Session,
+    raffle_id: int,
+    wallet: str,
+    amount_lamports: int,
+    tx_signature: str | None,
+) -> models.RaffleWinner:
+    winner = add_winner(db, raffle_id, wallet, amount_lamports, tx_signature)
     db.commit()
     db.refresh(winner)
     return winner
@@ -0,0 +1,240 @@
+"""
+Sliding-window-counter rate limiting.
+
+Each key keeps only the request counts of the current and the previous
+fixed window; the effective count is the current count plus the previous
+one weighted by how much of the previous window still overlaps the sliding
+window. That is O(1) state per key regardless of the limit.
+
+Backends:
+    memory  per-process LRU dict (default)
+    shm     fixed-size slot table in shared memory, shared by every worker
+            process on the host
+    sql     rows in rate_limit_counters through the app's engine, shared by
+            every process that uses the database
+"""
+import fcntl
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from multiprocessing import resource_tracker, shared_memory
+
+from sqlalchemy import case, delete
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal, dialect_insert
+
+
+def parse_limit(spec: str) -> tuple[int, float]:
+    """Parse "<requests>/<seconds>", e.g. "5/60"."""
+    count, _, window = spec.partition("/")
+    return int(count), float(window or 60)
+
+
+def parse_limits(spec: str) -> dict[str, tuple[int, float]]:
+    """Parse "join=5/60,winners=120/60" into {name: (limit, window)}."""
+    out: dict[str, tuple[int, float]] = {}
+    for item in spec.split(","):
+        name, _, limit = item.strip().partition("=")
+        if name and limit:
+            out[name] = parse_limit(limit)
+    return out
+
+
+def _roll(
+    stored_window: int, current: int, previous: int, window_index: int
+) -> tuple[int, int]:
+    """Shift stored counts forward to `window_index`."""
+    if stored_window == window_index:
+        return current, previous
+    if stored_window == window_index - 1:
+        return 0, current
+    return 0, 0
+
+
+def _estimate(current: int, previous: int, now: float, window: float) -> float:
+    elapsed_fraction = (now % window) / window
+    return current + previous * (1.0 - elapsed_fraction)
+
+
+class MemoryBackend:
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        # key -> [window_index, current, previous]
+        self._entries: OrderedDict[str, list[int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window: float, now: float) -> bool:
+        window_index = int(now // window)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                current, previous = 0, 0
+            else:
+                self._entries.move_to_end(key)
+                current, previous = _roll(entry[0], entry[1], entry[2], window_index)
+
+            if _estimate(current, previous, now, window) >= limit:
+                allowed = False
+            else:
+                current += 1
+                allowed = True
+
+            if entry is None:
+                self._entries[key] = [window_index, current, previous]
+                while len(self._entries) > self.max_keys:
+                    self._entries.popitem(last=False)
+            else:
+                entry[0], entry[1], entry[2] = window_index, current, previous
+            return allowed
+
+
+class SharedMemoryBackend:
+    """
+    Open-addressed table of fixed-size slots in a named shared memory block.
+
+    A key maps to exactly one slot; a colliding key takes the slot over, so
+    memory stays bounded at `slots` entries and the worst case of a
+    collision is a reset counter, never a false rejection.
+    """
+
+    # key hash, window index, current count, previous count
+    _SLOT = struct.Struct("<QqII")
+
+    def __init__(self, name: str, slots: int) -> None:
+        self.slots = slots
+        size = self._SLOT.size * slots
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name)
+        # Every worker attaches to the same block; none of them should
+        # unlink it when it exits.
+        resource_tracker.unregister(self._shm._name, "shared_memory")
+
+        lock_path = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        self._lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._thread_lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window: float, now: float) -> bool:
+        key_hash = int.from_bytes(
+            hashlib.blake2b(key.encode(), digest_size=8).digest(), "little"
+        )
+        offset = (key_hash % self.slots) * self._SLOT.size
+        window_index = int(now // window)
+        buf = self._shm.buf
+
+        with self._thread_lock:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                stored_hash, stored_window, current, previous = self._SLOT.unpack_from(buf, offset)
+                if stored_hash != key_hash:
+                    current, previous = 0, 0
+                else:
+                    current, previous = _roll(stored_window, current, previous, window_index)
+
+                if _estimate(current, previous, now, window) >= limit:
+                    allowed = False
+                else:
+                    current += 1
+                    allowed = True
+
+                self._SLOT.pack_into(buf, offset, key_hash, window_index, current, previous)
+                return allowed
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+
+class SqlBackend:
+    # Expired rows are swept once every this many hits.
+    SWEEP_EVERY = 1000
+
+    def __init__(self) -> None:
+        self._hits = 0
+
+    def hit(self, key: str, limit: int, window: float, now: float) -> bool:
+        if limit <= 0:
+            return False
+        window_index = int(now // window)
+        expires_at = (window_index + 2) * window
+        weight = 1.0 - (now % window) / window
+        c = models.RateLimitCounter
+        # _roll in SQL, on the stored row.
+        same = c.window_index == window_index
+        current = case((same, c.current), else_=0)
+        previous = case(
+            (same, c.previous),
+            (c.window_index == window_index - 1, c.current),
+            else_=0,
+        )
+
+        db = SessionLocal()
+        try:
+            # One statement, so the check and the increment cannot interleave
+            # with another process. A rejected hit fails the WHERE, leaves the
+            # row alone and returns nothing; leaving the window unrolled is
+            # harmless because the next hit rolls it the same way.
+            insert = dialect_insert(db.get_bind())
+            stmt = (
+                insert(c)
+                .values(
+                    key=key,
+                    window_index=window_index,
+                    current=1,
+                    previous=0,
+                    expires_at=expires_at,
+                )
+                .on_conflict_do_update(
+                    index_elements=["key"],
+                    set_={
+                        "window_index": window_index,
+                        "current": current + 1,
+                        "previous": previous,
+                        "expires_at": expires_at,
+                    },
+                    where=current + previous * weight < limit,
+                )
+                .returning(c.current)
+            )
+            allowed = db.execute(stmt).first() is not None
+            db.commit()
+
+            self._hits += 1
+            if self._hits % self.SWEEP_EVERY == 0:
+                db.execute(delete(c).where(c.expires_at < now))
+                db.commit()
+
+            return allowed
+        finally:
+            db.close()
+
+
+def make_backend(kind: str):
+    if kind == "memory":
+        return MemoryBackend(settings.RATE_LIMIT_MAX_KEYS)
+    if kind == "shm":
+        return SharedMemoryBackend(
+            settings.RATE_LIMIT_SHM_NAME, settings.RATE_LIMIT_SHM_SLOTS
+        )
+    if kind == "sql":
+        return SqlBackend()
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {kind!r}")
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = make_backend(settings.RATE_LIMIT_BACKEND)
+    return _backend
+
+
+def hit(key: str, limit: int, window: float) -> bool:
+    return get_backend().hit(key, limit, window, time.time())
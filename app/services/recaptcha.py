@@ -1,10 +1,89 @@
-from typing import Optional
-import httpx
+import time
+from typing import TYPE_CHECKING, Optional
 
 from ..config import settings
 
+if TYPE_CHECKING:
+    import httpx
 
-def verify_recaptcha(token: str, remote_ip: Optional[str] = None) -> bool:
+
+_http: "httpx.AsyncClient | None" = None
+
+
+def get_http() -> "httpx.AsyncClient":
+    global _http
+    if _http is None:
+        # Deferred: without RECAPTCHA_SECRET the API never needs httpx.
+        import httpx
+
+        _http = httpx.AsyncClient(
+            timeout=settings.RECAPTCHA_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+    return _http
+
+
+async def shutdown() -> None:
+    global _http
+    if _http is not None:
+        await _http.aclose()
+        _http = None
+
+
+class CircuitBreaker:
+    """
+    Stops calling Google after `failure_threshold` consecutive errors and
+    lets a single trial request through once `reset_seconds` have passed.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._open_until = 0.0
+
+    def allow(self) -> bool:
+        if self._failures < self.failure_threshold:
+            return True
+        now = time.monotonic()
+        if now < self._open_until:
+            return False
+        # Half-open: hold the breaker open while this trial is in flight.
+        self._open_until = now + self.reset_seconds
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._open_until = time.monotonic() + self.reset_seconds
+
+
+_breaker = CircuitBreaker(
+    settings.RECAPTCHA_BREAKER_FAILURES,
+    settings.RECAPTCHA_BREAKER_RESET_SECONDS,
+)
+
+
+def _passes_checks(j: dict) -> bool:
+    if not j.get("success", False):
+        return False
+
+    # score and action are only present for reCAPTCHA v3 tokens.
+    score = j.get("score")
+    if score is not None and score < settings.RECAPTCHA_MIN_SCORE:
+        return False
+
+    action = j.get("action")
+    if action and action != settings.RECAPTCHA_ACTION:
+        return False
+
+    return True
+
+
+async def verify_recaptcha(token: str, remote_ip: Optional[str] = None) -> bool:
     secret = settings.RECAPTCHA_SECRET
     if not secret:
         return True
@@ -12,6 +91,9 @@ def verify_recaptcha(token: str, remote_ip: Optional[str] = None) -> bool:
     if not token:
         return False
 
+    if not _breaker.allow():
+        return settings.RECAPTCHA_FAIL_OPEN
+
     data = {
         "secret": secret,
         "response": token,
@@ -20,28 +102,13 @@ def verify_recaptcha(token: str, remote_ip: Optional[str] = None) -> bool:
         data["remoteip"] = remote_ip
 
     try:
-        resp = httpx.post(
-            "https://www.google.com/recaptcha/api/siteverify",
-            data=data,
-            timeout=5.0,
-        )
+        resp = await get_http().post(settings.RECAPTCHA_VERIFY_URL, data=data)
         resp.raise_for_status()
         j = resp.json()
     except Exception as e:
         print("[recaptcha] error:", e)
-        return False
-
-    success = j.get("success", False)
-    score = j.get("score", 0.0)
-    action = j.get("action", "")
+        _breaker.record_failure()
+        return settings.RECAPTCHA_FAIL_OPEN
 
-    if not success:
-        return False
-
-    if score < 0.3:
-        return False
-
-    if action and action != "join":
-        return False
-
-    return True
+    _breaker.record_success()
+    return _passes_checks(j)
@@ -0,0 +1,213 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+from urllib.parse import urlsplit
+
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Confirmed
+
+from . import metrics
+
+T = TypeVar("T")
+
+# Rolling window of recent calls kept per endpoint.
+WINDOW = 64
+# Latency samples needed before an endpoint's own p95 is trusted.
+MIN_SAMPLES = 8
+# An endpoint whose recent error rate is at or above this is skipped while
+# a healthier one is available.
+MAX_ERROR_RATE = 0.5
+# Consecutive failures that put an endpoint into cooldown.
+COOLDOWN_AFTER_FAILURES = 3
+
+
+def endpoint_label(url: str) -> str:
+    """Host[:port] only, so API keys in paths or query strings never reach metrics or logs."""
+    return urlsplit(url).netloc.rsplit("@", 1)[-1] or url
+
+
+class Endpoint:
+    def __init__(self, url: str, client: AsyncClient) -> None:
+        self.url = url
+        self.label = endpoint_label(url)
+        self.client = client
+        self._latencies: deque[float] = deque(maxlen=WINDOW)
+        self._outcomes: deque[bool] = deque(maxlen=WINDOW)
+        self._consecutive_failures = 0
+        self._cooldown_until = 0.0
+
+    def record_success(self, seconds: float) -> None:
+        self._latencies.append(seconds)
+        self._outcomes.append(True)
+        self._consecutive_failures = 0
+
+    def record_failure(self, cooldown_seconds: float) -> None:
+        self._outcomes.append(False)
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= COOLDOWN_AFTER_FAILURES:
+            self._cooldown_until = time.monotonic() + cooldown_seconds
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def healthy(self) -> bool:
+        return time.monotonic() >= self._cooldown_until and self.error_rate < MAX_ERROR_RATE
+
+    def percentile(self, p: float) -> float | None:
+        if len(self._latencies) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    def score(self) -> float:
+        # Untried endpoints sort first so every provider gets measured.
+        p50 = self.percentile(0.5)
+        return 0.0 if p50 is None else p50
+
+
+class RpcRouter:
+    """
+    Spreads RPC traffic over several endpoints.
+
+    Reads go to the fastest healthy endpoint (rolling p50). If it has not
+    answered after its own p95 (never less than `hedge_min_seconds`), the
+    same read is also sent to the next endpoint and the first answer wins.
+    A failed read fails over to the next endpoint straight away. Sends are
+    broadcast to the best `broadcast_count` endpoints.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        *,
+        timeout: float,
+        max_connections: int,
+        max_keepalive: int,
+        keepalive_expiry: float,
+        hedge_min_seconds: float,
+        hedge_default_seconds: float,
+        broadcast_count: int,
+        cooldown_seconds: float,
+    ) -> None:
+        if not urls:
+            raise ValueError("RpcRouter needs at least one endpoint")
+        self.endpoints = [
+            Endpoint(
+                url,
+                AsyncClient(
+                    url,
+                    commitment=Confirmed,
+                    timeout=timeout,
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+            )
+            for url in urls
+        ]
+        self.hedge_min_seconds = hedge_min_seconds
+        self.hedge_default_seconds = hedge_default_seconds
+        self.broadcast_count = max(1, broadcast_count)
+        self.cooldown_seconds = cooldown_seconds
+        self._background: set[asyncio.Task] = set()
+
+    def ranked(self) -> list[Endpoint]:
+        return sorted(self.endpoints, key=lambda e: (not e.healthy(), e.score()))
+
+    def _hedge_delay(self, endpoint: Endpoint) -> float:
+        p95 = endpoint.percentile(0.95)
+        if p95 is None:
+            p95 = self.hedge_default_seconds
+        return max(self.hedge_min_seconds, p95)
+
+    async def _attempt(self, endpoint: Endpoint, call: Callable[[AsyncClient], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        try:
+            result = await call(endpoint.client)
+        except Exception:
+            endpoint.record_failure(self.cooldown_seconds)
+            metrics.RPC_ENDPOINT_ERRORS.inc(endpoint=endpoint.label)
+            raise
+        elapsed = time.perf_counter() - started
+        endpoint.record_success(elapsed)
+        metrics.RPC_ENDPOINT_LATENCY.observe(elapsed, endpoint=endpoint.label)
+        return result
+
+    async def read(
+        self,
+        call: Callable[[AsyncClient], Awaitable[T]],
+        hedge: bool = True,
+    ) -> T:
+        """Run an idempotent read, hedging and failing over across endpoints."""
+        ranked = self.ranked()
+        backups = iter(ranked[1:])
+        pending = {asyncio.create_task(self._attempt(ranked[0], call))}
+        delay = self._hedge_delay(ranked[0]) if hedge and len(ranked) > 1 else None
+        last_error: BaseException | None = None
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # Only one hedge per read; after that wait for whichever answers.
+                    delay = None
+                    backup = next(backups, None)
+                    if backup is not None:
+                        metrics.RPC_HEDGES.inc()
+                        pending.add(asyncio.create_task(self._attempt(backup, call)))
+                    continue
+
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+
+                if not pending:
+                    backup = next(backups, None)
+                    if backup is not None:
+                        pending.add(asyncio.create_task(self._attempt(backup, call)))
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def broadcast(self, call: Callable[[AsyncClient], Awaitable[T]]) -> T:
+        """
+        Send to the best `broadcast_count` endpoints at once and return the
+        first success; the rest finish in the background.
+        """
+        targets = self.ranked()[: self.broadcast_count]
+        tasks = [asyncio.create_task(self._attempt(e, call)) for e in targets]
+        errors: list[BaseException] = []
+
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                result = await next_done
+            except Exception as e:
+                errors.append(e)
+                continue
+            for task in tasks:
+                if not task.done():
+                    self._background.add(task)
+                    task.add_done_callback(self._discard)
+            return result
+
+        raise errors[0]
+
+    def _discard(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled():
+            # Losing broadcasts may fail (e.g. "already processed"); that is expected.
+            task.exception()
+
+    async def close(self) -> None:
+        for task in list(self._background):
+            task.cancel()
+        for endpoint in self.endpoints:
+            await endpoint.client.close()
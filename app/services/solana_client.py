@@ -1,124 +1,739 @@
-import json
+import asyncio
+import time
 
 from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Commitment
+from solana.rpc.models import DataSliceOpts, MemcmpOpts
+from solders.account import Account
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
+from solders.hash import Hash
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from solders.system_program import transfer, TransferParams
 from solders.transaction import VersionedTransaction
 from solders.message import MessageV0
 from solders.signature import Signature
+from solders.rpc.responses import RpcConfirmedTransactionStatusWithSignature
+from solders.transaction_status import (
+    EncodedConfirmedTransactionWithStatusMeta,
+    TransactionConfirmationStatus,
+)
+from spl.token.constants import TOKEN_PROGRAM_ID
 
 from ..config import settings
+from . import metrics
+from .rpc_router import RpcRouter
 
 LAMPORTS_PER_SOL = 1_000_000_000
 
+# A blockhash is accepted for 150 blocks after the one it was taken from.
+BLOCKHASH_VALID_BLOCKS = 150
+SLOT_SECONDS = 0.4
+# Blocks of headroom kept before lastValidBlockHeight so a transaction signed
+# with a cached blockhash still has time to land.
+BLOCKHASH_SAFETY_BLOCKS = 60
+
+BASE_FEE_LAMPORTS_PER_SIGNATURE = 5000
+
+CONFIRM_INITIAL_DELAY_SECONDS = 0.25
+CONFIRM_MAX_DELAY_SECONDS = 2.0
+
+_COMMITMENT_RANK = {
+    "processed": 0,
+    "confirmed": 1,
+    "finalized": 2,
+}
+
+
+def _status_rank(status: TransactionConfirmationStatus) -> int:
+    if status == TransactionConfirmationStatus.Finalized:
+        return _COMMITMENT_RANK["finalized"]
+    if status == TransactionConfirmationStatus.Confirmed:
+        return _COMMITMENT_RANK["confirmed"]
+    return _COMMITMENT_RANK["processed"]
+
 
 if not settings.SOLANA_RPC_URL:
     raise RuntimeError("SOLANA_RPC_URL is not set in .env")
+# getTransaction, read right after confirming, only serves confirmed or
+# finalized, so "processed" is no use as a confirmation target.
+if settings.SOLANA_CONFIRM_COMMITMENT not in ("confirmed", "finalized"):
+    raise RuntimeError(
+        f"SOLANA_CONFIRM_COMMITMENT must be confirmed or finalized, "
+        f"not {settings.SOLANA_CONFIRM_COMMITMENT!r}"
+    )
+
+_creator_keypair: Keypair | None = None
+
+
+def creator_keypair() -> Keypair:
+    """
+    The CREATOR_PRIVATE_KEY_BASE58 wallet, parsed on first use so that
+    processes which never sign (or only sign with per-raffle keys) start
+    without it.
+    """
+    global _creator_keypair
+    if _creator_keypair is None:
+        if not settings.CREATOR_PRIVATE_KEY_BASE58:
+            raise RuntimeError("CREATOR_PRIVATE_KEY_BASE58 is not set in .env")
+        _creator_keypair = Keypair.from_base58_string(settings.CREATOR_PRIVATE_KEY_BASE58)
+    return _creator_keypair
+
+
+def creator_pubkey() -> Pubkey:
+    return creator_keypair().pubkey()
+
+
+def owner_pubkey() -> Pubkey:
+    if not settings.OWNER_WALLET:
+        raise RuntimeError("OWNER_WALLET is not set in .env")
+    return Pubkey.from_string(settings.OWNER_WALLET)
+
+
+_router: RpcRouter | None = None
+
+
+def get_router() -> RpcRouter:
+    """
+    Return the process-wide RPC router, creating it on first use.
+
+    Each endpoint in SOLANA_RPC_URLS gets one client that keeps its
+    connections alive between calls, so a raffle cycle pays for the TCP and
+    TLS handshake once instead of once per request. Reads, blockhashes and
+    send preflight default to "confirmed".
+    """
+    global _router
+    if _router is None:
+        _router = RpcRouter(
+            settings.SOLANA_RPC_URLS,
+            timeout=settings.SOLANA_RPC_TIMEOUT_SECONDS,
+            max_connections=settings.SOLANA_RPC_MAX_CONNECTIONS,
+            max_keepalive=settings.SOLANA_RPC_MAX_KEEPALIVE,
+            keepalive_expiry=settings.SOLANA_RPC_KEEPALIVE_EXPIRY_SECONDS,
+            hedge_min_seconds=settings.SOLANA_RPC_HEDGE_MIN_MS / 1000,
+            hedge_default_seconds=settings.SOLANA_RPC_HEDGE_DEFAULT_MS / 1000,
+            broadcast_count=settings.SOLANA_RPC_BROADCAST_COUNT,
+            cooldown_seconds=settings.SOLANA_RPC_COOLDOWN_SECONDS,
+        )
+    return _router
+
+
+class BlockhashCache:
+    """
+    Latest blockhash kept warm by a background task.
+
+    Each fetch also reads the node's block height, so the headroom left
+    before lastValidBlockHeight is measured rather than assumed (a lagging
+    node can hand out an already old blockhash). A cached value is handed
+    out only while that headroom, less the slots estimated to have passed
+    since, stays at least BLOCKHASH_SAFETY_BLOCKS; after that the next
+    caller refreshes it inline.
+    """
+
+    def __init__(self, refresh_seconds: float) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._blockhash: Hash | None = None
+        self._last_valid_block_height = 0
+        self._usable_until = 0.0
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def _is_fresh(self) -> bool:
+        return self._blockhash is not None and time.monotonic() < self._usable_until
+
+    async def refresh(self) -> tuple[Hash, int]:
+        fetched_at = time.monotonic()
+
+        async def read_both(client: AsyncClient):
+            # Same node, height first: the blockhash is at least that recent.
+            with metrics.rpc_timer("getBlockHeight"):
+                height = await client.get_block_height()
+            with metrics.rpc_timer("getLatestBlockhash"):
+                latest = await client.get_latest_blockhash()
+            return height.value, latest.value
+
+        height, latest = await get_router().read(read_both)
+        self._blockhash = latest.blockhash
+        self._last_valid_block_height = latest.last_valid_block_height
+        # Nothing left to cache when the node is already within the safety
+        # margin; this caller still gets the blockhash.
+        headroom = self._last_valid_block_height - height - BLOCKHASH_SAFETY_BLOCKS
+        self._usable_until = fetched_at + max(0, headroom) * SLOT_SECONDS
+        return self._blockhash, self._last_valid_block_height
+
+    async def get(self) -> tuple[Hash, int]:
+        """Return (blockhash, lastValidBlockHeight)."""
+        if self._is_fresh():
+            return self._blockhash, self._last_valid_block_height
+        async with self._lock:
+            if self._is_fresh():
+                return self._blockhash, self._last_valid_block_height
+            return await self.refresh()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with self._lock:
+                    await self.refresh()
+            except Exception as e:
+                print("[solana_client] Blockhash refresh failed:", repr(e))
+            await asyncio.sleep(self.refresh_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
 
-if not settings.CREATOR_PRIVATE_KEY_BASE58:
-    raise RuntimeError("CREATOR_PRIVATE_KEY_BASE58 is not set in .env")
 
-if not settings.OWNER_WALLET:
-    raise RuntimeError("OWNER_WALLET is not set in .env")
+blockhash_cache = BlockhashCache(settings.SOLANA_BLOCKHASH_REFRESH_SECONDS)
 
-CREATOR_KEYPAIR: Keypair = Keypair.from_base58_string(
-    settings.CREATOR_PRIVATE_KEY_BASE58
+
+class PriorityFeeEstimator:
+    """
+    Compute-unit price (micro-lamports) from getRecentPrioritizationFees.
+
+    Takes `percentile` of the fees recent slots paid to write the given
+    accounts, clamped to [min_price, max_price]. Results are cached per
+    account set for `cache_seconds`; if the RPC call fails the last
+    estimate (or min_price) is used.
+    """
+
+    def __init__(
+        self,
+        percentile: float,
+        min_price: int,
+        max_price: int,
+        cache_seconds: float,
+    ) -> None:
+        self.percentile = percentile
+        self.min_price = min_price
+        self.max_price = max_price
+        self.cache_seconds = cache_seconds
+        self._cache: dict[tuple[str, ...], tuple[float, int]] = {}
+
+    def _pick(self, fees: list[int]) -> int:
+        if not fees:
+            return self.min_price
+        ordered = sorted(fees)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(self.min_price, min(self.max_price, ordered[index]))
+
+    async def estimate(self, accounts: list[Pubkey]) -> int:
+        key = tuple(sorted(str(a) for a in accounts))
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+
+        try:
+            with metrics.rpc_timer("getRecentPrioritizationFees"):
+                resp = await get_router().read(
+                    lambda c: c.get_recent_prioritization_fees(accounts)
+                )
+        except Exception as e:
+            print("[solana_client] Priority fee lookup failed:", repr(e))
+            return cached[1] if cached is not None else self.min_price
+
+        price = self._pick([f.prioritization_fee for f in resp.value])
+        self._cache[key] = (time.monotonic() + self.cache_seconds, price)
+        return price
+
+
+priority_fees = PriorityFeeEstimator(
+    settings.PRIORITY_FEE_PERCENTILE,
+    settings.PRIORITY_FEE_MIN_MICRO_LAMPORTS,
+    settings.PRIORITY_FEE_MAX_MICRO_LAMPORTS,
+    settings.PRIORITY_FEE_CACHE_SECONDS,
 )
-CREATOR_PUBKEY: Pubkey = CREATOR_KEYPAIR.pubkey()
-OWNER_PUBKEY: Pubkey = Pubkey.from_string(settings.OWNER_WALLET)
 
 
+def transaction_fee_lamports(compute_unit_limit: int, compute_unit_price: int, signatures: int = 1) -> int:
+    """Base fee plus the priority fee a transaction pays for its requested compute units."""
+    priority = -(-compute_unit_limit * compute_unit_price // 1_000_000)
+    return BASE_FEE_LAMPORTS_PER_SIGNATURE * signatures + priority
 
-async def get_creator_balance_lamports() -> int:
-    async with AsyncClient(settings.SOLANA_RPC_URL) as client:
-        resp = await client.get_balance(CREATOR_PUBKEY)
-        return resp.value
 
+async def startup() -> None:
+    get_router()
+    blockhash_cache.start()
 
-async def send_sol_from_creator(to_address: str, lamports: int) -> str:
-    to_pubkey = Pubkey.from_string(to_address)
 
-    async with AsyncClient(settings.SOLANA_RPC_URL) as client:
-        latest_blockhash = await client.get_latest_blockhash()
-        blockhash = latest_blockhash.value.blockhash
+async def shutdown() -> None:
+    global _router
+    await blockhash_cache.stop()
+    if _router is not None:
+        await _router.close()
+        _router = None
+
+
+async def get_balance_lamports(pubkey: Pubkey) -> int:
+    with metrics.rpc_timer("getBalance"):
+        resp = await get_router().read(lambda c: c.get_balance(pubkey))
+    return resp.value
+
+
+async def get_creator_balance_lamports(creator: Pubkey | None = None) -> int:
+    return await get_balance_lamports(creator or creator_pubkey())
+
+
+async def get_rent_exempt_minimum(pubkey: Pubkey) -> int:
+    """Rent-exempt minimum for the account's current size (0 bytes if missing)."""
+    with metrics.rpc_timer("getAccountInfo"):
+        info = await get_router().read(lambda c: c.get_account_info(pubkey))
+    data_len = len(info.value.data) if info.value is not None else 0
+    return await get_minimum_balance_for_rent_exemption(data_len)
+
 
-        ix = transfer(
-            TransferParams(
-                from_pubkey=CREATOR_PUBKEY,
-                to_pubkey=to_pubkey,
-                lamports=lamports,
+async def get_minimum_balance_for_rent_exemption(data_len: int) -> int:
+    with metrics.rpc_timer("getMinimumBalanceForRentExemption"):
+        resp = await get_router().read(
+            lambda c: c.get_minimum_balance_for_rent_exemption(data_len)
+        )
+    return resp.value
+
+
+# getMultipleAccounts accepts at most this many keys per call.
+MAX_MULTIPLE_ACCOUNTS = 100
+
+
+async def get_multiple_accounts(pubkeys: list[Pubkey]) -> list[Account | None]:
+    """
+    Account (without data) or None for each pubkey, in order, fetched in
+    concurrent getMultipleAccounts calls of up to MAX_MULTIPLE_ACCOUNTS.
+    """
+    router = get_router()
+    no_data = DataSliceOpts(offset=0, length=0)
+
+    async def fetch(batch: list[Pubkey]) -> list[Account | None]:
+        with metrics.rpc_timer("getMultipleAccounts"):
+            resp = await router.read(
+                lambda c: c.get_multiple_accounts(batch, data_slice=no_data)
             )
+        return list(resp.value)
+
+    batches = await asyncio.gather(
+        *(
+            fetch(pubkeys[start:start + MAX_MULTIPLE_ACCOUNTS])
+            for start in range(0, len(pubkeys), MAX_MULTIPLE_ACCOUNTS)
+        )
+    )
+    return [account for batch in batches for account in batch]
+
+
+# SPL token accounts start with mint (32 bytes), owner (32) and amount (u64 LE).
+TOKEN_ACCOUNT_OWNER_OFFSET = 32
+TOKEN_ACCOUNT_SIZE = 165
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def _b58_byte(value: int) -> str:
+    if value == 0:
+        return "1"
+    return (_B58_ALPHABET[value // 58] if value >= 58 else "") + _B58_ALPHABET[value % 58]
+
+
+async def get_token_holdings(mint: Pubkey, sharded: bool, concurrency: int) -> dict[str, int]:
+    """
+    Balance per owner wallet over every token account of `mint`. Only the
+    owner and amount bytes of each account are transferred. With `sharded`
+    the scan is split into 256 getProgramAccounts calls on the first byte
+    of the owner (at most `concurrency` at once), so no single response has
+    to carry every holder.
+    """
+    router = get_router()
+    with metrics.rpc_timer("getAccountInfo"):
+        info = await router.read(lambda c: c.get_account_info(mint))
+    if info.value is None:
+        raise RuntimeError(f"get_token_holdings: mint {mint} not found")
+
+    # Token-2022 accounts carry extensions after the base layout, so only
+    # classic token accounts can be matched on size.
+    program = info.value.owner
+    base_filters: list = [MemcmpOpts(offset=0, bytes=str(mint))]
+    if program == TOKEN_PROGRAM_ID:
+        base_filters.insert(0, TOKEN_ACCOUNT_SIZE)
+    data_slice = DataSliceOpts(offset=TOKEN_ACCOUNT_OWNER_OFFSET, length=40)
+    shards = (
+        [[MemcmpOpts(offset=TOKEN_ACCOUNT_OWNER_OFFSET, bytes=_b58_byte(b))] for b in range(256)]
+        if sharded
+        else [[]]
+    )
+
+    holdings: dict[str, int] = {}
+    sem = asyncio.Semaphore(concurrency)
+
+    async def scan(shard_filters: list) -> None:
+        async with sem:
+            with metrics.rpc_timer("getProgramAccounts"):
+                resp = await router.read(
+                    lambda c: c.get_program_accounts(
+                        program,
+                        encoding="base64",
+                        data_slice=data_slice,
+                        filters=base_filters + shard_filters,
+                    ),
+                    hedge=False,
+                )
+        for keyed in resp.value:
+            data = keyed.account.data
+            amount = int.from_bytes(data[32:40], "little")
+            if amount:
+                owner = str(Pubkey.from_bytes(data[:32]))
+                holdings[owner] = holdings.get(owner, 0) + amount
+
+    await asyncio.gather(*(scan(f) for f in shards))
+    return holdings
+
+
+def build_transfer(
+    to_address: str,
+    lamports: int,
+    blockhash: Hash,
+    compute_unit_price: int = 0,
+    payer: Keypair | None = None,
+) -> VersionedTransaction:
+    payer = payer or creator_keypair()
+    ix = transfer(
+        TransferParams(
+            from_pubkey=payer.pubkey(),
+            to_pubkey=Pubkey.from_string(to_address),
+            lamports=lamports,
         )
+    )
+
+    msg = MessageV0.try_compile(
+        payer=payer.pubkey(),
+        instructions=[
+            set_compute_unit_limit(settings.TRANSFER_COMPUTE_UNITS),
+            set_compute_unit_price(compute_unit_price),
+            ix,
+        ],
+        address_lookup_table_accounts=[],
+        recent_blockhash=blockhash,
+    )
+
+    return VersionedTransaction(msg, [payer])
+
+
+async def submit_transfer(tx: VersionedTransaction, to_address: str, lamports: int) -> str:
+    with metrics.rpc_timer("sendTransaction"):
+        resp = await get_router().broadcast(lambda c: c.send_transaction(tx))
+    sig = resp.value
+
+    print(
+        f"[solana_client] Sent {lamports} lamports "
+        f"from {tx.message.account_keys[0]} to {to_address}, tx={sig}"
+    )
+    return str(sig)
+
+
+async def send_raw_transaction(raw: bytes) -> str:
+    """Broadcast an already signed, serialized transaction."""
+    with metrics.rpc_timer("sendTransaction"):
+        resp = await get_router().broadcast(lambda c: c.send_raw_transaction(raw))
+    return str(resp.value)
 
-        msg = MessageV0.try_compile(
-            payer=CREATOR_PUBKEY,
-            instructions=[ix],
-            address_lookup_table_accounts=[],
-            recent_blockhash=blockhash,
+
+async def send_sol_from_creator(to_address: str, lamports: int) -> str:
+    txs, _, _ = await sign_payouts([(to_address, lamports)])
+    return await submit_transfer(txs[0], to_address, lamports)
+
+
+# Signatures handed out by sign_payouts, oldest first.
+_recent_signatures: dict[Signature, None] = {}
+RECENT_SIGNATURES_KEPT = 4096
+
+
+def _build_unique_transfer(
+    to_address: str,
+    lamports: int,
+    blockhash: Hash,
+    compute_unit_price: int,
+    payer: Keypair,
+) -> tuple[VersionedTransaction, int]:
+    """
+    Build a transfer whose signature was not handed out before, and return
+    it with the compute-unit price it carries.
+
+    A payout retried under the same cached blockhash would otherwise be
+    byte-for-byte the previous attempt: same signature, so the cluster drops
+    it as a duplicate and the retry never lands. One micro-lamport more per
+    CU makes it a distinct transaction.
+    """
+    tx = build_transfer(to_address, lamports, blockhash, compute_unit_price, payer)
+    while tx.signatures[0] in _recent_signatures:
+        compute_unit_price += 1
+        tx = build_transfer(to_address, lamports, blockhash, compute_unit_price, payer)
+    _recent_signatures[tx.signatures[0]] = None
+    if len(_recent_signatures) > RECENT_SIGNATURES_KEPT:
+        _recent_signatures.pop(next(iter(_recent_signatures)))
+    return tx, compute_unit_price
+
+
+async def _signing_context(
+    payouts: list[tuple[str, int]], payer: Keypair
+) -> tuple[Hash, int, int]:
+    """Cached blockhash, its lastValidBlockHeight and the CU price for `payouts`."""
+    accounts = [payer.pubkey()]
+    for to_address, _ in payouts:
+        try:
+            accounts.append(Pubkey.from_string(to_address))
+        except ValueError:
+            # Reported by build_transfer for that payout alone.
+            continue
+    blockhash, last_valid_block_height = await blockhash_cache.get()
+    compute_unit_price = await priority_fees.estimate(accounts)
+    return blockhash, last_valid_block_height, compute_unit_price
+
+
+async def sign_payouts(
+    payouts: list[tuple[str, int]],
+    payer: Keypair | None = None,
+) -> tuple[list[VersionedTransaction], int, list[int]]:
+    """
+    Build and sign every (address, lamports) transfer against one cached
+    blockhash and one priority fee estimate for the accounts they write.
+    Returns the transactions, the blockhash's lastValidBlockHeight and the
+    compute-unit price each transaction carries. Each tx signature is known
+    before it is sent. Transfers come from `payer`, the default creator
+    wallet if not given.
+    """
+    payer = payer or creator_keypair()
+    blockhash, last_valid_block_height, compute_unit_price = await _signing_context(
+        payouts, payer
+    )
+    txs = []
+    prices = []
+    for to_address, lamports in payouts:
+        tx, price = _build_unique_transfer(
+            to_address, lamports, blockhash, compute_unit_price, payer
         )
+        txs.append(tx)
+        prices.append(price)
+    return txs, last_valid_block_height, prices
 
-        tx = VersionedTransaction(msg, [CREATOR_KEYPAIR])
 
-        resp = await client.send_transaction(tx)
-        sig = resp.value
+async def send_payouts(payouts: list[tuple[str, int]]) -> list[str | Exception]:
+    """
+    Sign every (address, lamports) transfer against one cached blockhash and
+    submit them concurrently.
 
-        print(
-            f"[solana_client] Sent {lamports} lamports "
-            f"from {CREATOR_PUBKEY} to {to_pubkey}, tx={sig}"
+    Returns one entry per payout, in order: the tx signature, or the
+    exception raised while building or sending that transfer (e.g. a bad
+    address). Only a failed blockhash fetch fails the whole batch.
+    """
+    payer = creator_keypair()
+    blockhash, _, compute_unit_price = await _signing_context(payouts, payer)
+
+    async def send_one(to_address: str, lamports: int) -> str:
+        tx, _ = _build_unique_transfer(
+            to_address, lamports, blockhash, compute_unit_price, payer
         )
-        return str(sig)
+        return await submit_transfer(tx, to_address, lamports)
+
+    return await asyncio.gather(
+        *(send_one(to_address, lamports) for to_address, lamports in payouts),
+        return_exceptions=True,
+    )
 
 
-async def get_creator_fee_delta_from_tx(signature_str: str) -> int:
+async def get_transaction_outcome(signature_str: str, last_valid_block_height: int) -> str:
+    """
+    Classify a sent transaction as "confirmed", "failed" (landed with an
+    error), "expired" (can no longer land) or "pending".
+    """
     sig = Signature.from_string(signature_str)
 
-    async with AsyncClient(settings.SOLANA_RPC_URL) as client:
-        resp = await client.get_transaction(
-            sig,
-            encoding="json", 
-            max_supported_transaction_version=0,
+    async def read_both(client: AsyncClient):
+        # Same node, height first: if its finalized height is already past
+        # lastValidBlockHeight and it still has no status afterwards, the
+        # transaction cannot land anywhere.
+        with metrics.rpc_timer("getBlockHeight"):
+            height = await client.get_block_height(Commitment("finalized"))
+        with metrics.rpc_timer("getSignatureStatuses"):
+            statuses = await client.get_signature_statuses(
+                [sig], search_transaction_history=True
+            )
+        return height.value, statuses.value[0]
+
+    height, status = await get_router().read(read_both, hedge=False)
+
+    if status is not None:
+        if status.err is not None:
+            return "failed"
+        reached = (
+            _status_rank(status.confirmation_status)
+            if status.confirmation_status is not None
+            else _COMMITMENT_RANK["finalized"]
         )
+        if reached >= _COMMITMENT_RANK[settings.SOLANA_CONFIRM_COMMITMENT]:
+            return "confirmed"
+        return "pending"
 
-    raw = resp.to_json()
-    data = json.loads(raw)
+    if height > last_valid_block_height:
+        return "expired"
+    return "pending"
 
-    result = data.get("result")
-    if not result:
-        raise RuntimeError(
-            f"get_creator_fee_delta_from_tx: no result for signature {signature_str}"
+
+class TransactionFailed(RuntimeError):
+    """The transaction landed on chain with an error."""
+
+
+async def wait_for_confirmation(
+    signature_str: str,
+    commitment: str | None = None,
+    timeout: float | None = None,
+    search_transaction_history: bool = False,
+) -> None:
+    """
+    Poll getSignatureStatuses until the transaction reaches `commitment`.
+
+    Polling starts at CONFIRM_INITIAL_DELAY_SECONDS and backs off up to
+    CONFIRM_MAX_DELAY_SECONDS. Raises TransactionFailed if the transaction
+    failed on chain and RuntimeError if it was not confirmed within
+    `timeout` seconds. Pass
+    `search_transaction_history` for signatures older than the RPC node's
+    recent status cache.
+    """
+    commitment = commitment or settings.SOLANA_CONFIRM_COMMITMENT
+    if timeout is None:
+        timeout = settings.SOLANA_CONFIRM_TIMEOUT_SECONDS
+    target = _COMMITMENT_RANK[commitment]
+
+    sig = Signature.from_string(signature_str)
+    deadline = time.monotonic() + timeout
+    delay = CONFIRM_INITIAL_DELAY_SECONDS
+
+    while True:
+        with metrics.rpc_timer("getSignatureStatuses"):
+            resp = await get_router().read(
+                lambda c: c.get_signature_statuses(
+                    [sig],
+                    search_transaction_history=search_transaction_history,
+                )
+            )
+        status = resp.value[0]
+
+        if status is not None:
+            if status.err is not None:
+                raise TransactionFailed(
+                    f"wait_for_confirmation: tx {signature_str} failed: {status.err}"
+                )
+            # A missing confirmationStatus means the slot is already rooted.
+            reached = (
+                _status_rank(status.confirmation_status)
+                if status.confirmation_status is not None
+                else _COMMITMENT_RANK["finalized"]
+            )
+            if reached >= target:
+                return
+
+        if time.monotonic() + delay > deadline:
+            raise RuntimeError(
+                f"wait_for_confirmation: tx {signature_str} not {commitment} "
+                f"after {timeout:.0f}s"
+            )
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, CONFIRM_MAX_DELAY_SECONDS)
+
+
+async def get_signatures_for_address(
+    address: Pubkey,
+    before: str | None = None,
+    until: str | None = None,
+    limit: int = 1000,
+    commitment: str = "confirmed",
+) -> list[RpcConfirmedTransactionStatusWithSignature]:
+    """One page of signatures touching `address`, newest first."""
+    before_sig = Signature.from_string(before) if before else None
+    until_sig = Signature.from_string(until) if until else None
+    with metrics.rpc_timer("getSignaturesForAddress"):
+        resp = await get_router().read(
+            lambda c: c.get_signatures_for_address(
+                address,
+                before=before_sig,
+                until=until_sig,
+                limit=limit,
+                commitment=Commitment(commitment),
+            )
         )
+    return resp.value
 
-    meta = result.get("meta") or {}
-    pre_balances = meta.get("preBalances")
-    post_balances = meta.get("postBalances")
 
-    if not isinstance(pre_balances, list) or not isinstance(post_balances, list):
-        raise RuntimeError(
-            f"get_creator_fee_delta_from_tx: meta missing balances for {signature_str}"
+async def fetch_transaction(
+    signature_str: str,
+    commitment: str | None = None,
+) -> EncodedConfirmedTransactionWithStatusMeta | None:
+    """
+    getTransaction with base64 encoding, so solders decodes the message into
+    typed objects instead of a JSON tree. None if the node does not have it.
+    """
+    sig = Signature.from_string(signature_str)
+
+    # getTransaction does not serve "processed"; read at least "confirmed" so
+    # a transaction just seen by wait_for_confirmation is visible.
+    commitment = commitment or settings.SOLANA_CONFIRM_COMMITMENT
+    if commitment != "finalized":
+        commitment = "confirmed"
+
+    with metrics.rpc_timer("getTransaction"):
+        resp = await get_router().read(
+            lambda c: c.get_transaction(
+                sig,
+                encoding="base64",
+                commitment=Commitment(commitment),
+                max_supported_transaction_version=0,
+            )
         )
+    return resp.value
+
 
-    tx = result.get("transaction") or {}
-    message = tx.get("message") or {}
-    account_keys = message.get("accountKeys") or []
+def balance_delta(tx: EncodedConfirmedTransactionWithStatusMeta, account: Pubkey) -> int | None:
+    """
+    Lamport balance change of `account` in `tx`, or None if the transaction
+    does not touch it. Balances follow the static account keys and then the
+    addresses loaded from lookup tables.
+    """
+    meta = tx.transaction.meta
+    if meta is None:
+        return None
+
+    keys = list(tx.transaction.transaction.message.account_keys)
+    if meta.loaded_addresses is not None:
+        keys += list(meta.loaded_addresses.writable) + list(meta.loaded_addresses.readonly)
 
-    creator_str = str(CREATOR_PUBKEY)
     try:
-        idx = account_keys.index(creator_str)
+        idx = keys.index(account)
     except ValueError:
+        return None
+    return meta.post_balances[idx] - meta.pre_balances[idx]
+
+
+async def get_creator_fee_delta_from_tx(signature_str: str, creator: Pubkey | None = None) -> int:
+    creator = creator or creator_pubkey()
+    tx = await fetch_transaction(signature_str)
+    if tx is None:
         raise RuntimeError(
-            f"get_creator_fee_delta_from_tx: creator pubkey {creator_str} "
-            f"not found in accountKeys for {signature_str}"
+            f"get_creator_fee_delta_from_tx: no result for signature {signature_str}"
         )
 
-    pre = int(pre_balances[idx])
-    post = int(post_balances[idx])
-    delta = post - pre
+    delta = balance_delta(tx, creator)
+    if delta is None:
+        raise RuntimeError(
+            f"get_creator_fee_delta_from_tx: creator pubkey {creator} "
+            f"not found in accountKeys for {signature_str}"
+        )
 
     print(
         f"[solana_client] tx={signature_str}, "
-        f"creator balance delta={delta} lamports "
-        f"(pre={pre}, post={post})"
+        f"creator balance delta={delta} lamports"
     )
 
     return delta
@@ -0,0 +1,210 @@
+"""
+Fingerprinted, precompressed static assets.
+
+The build step (python -m app.services.static_assets, run by the Docker
+image) copies every file under app/static to app/static_dist with a
+content hash in its name, writes .gz and .br siblings for text formats,
+and records the mapping in manifest.json. The API loads the build into
+memory at startup and serves it from /assets with immutable cache
+headers, picking the encoding from Accept-Encoding. Without a build,
+asset_url() falls back to the plain /static files.
+"""
+import gzip
+import hashlib
+import json
+import re
+import shutil
+from pathlib import Path
+
+from fastapi import Request, Response
+
+SOURCE_DIR = Path("app/static")
+BUILD_DIR = Path("app/static_dist")
+MANIFEST = "manifest.json"
+URL_PREFIX = "/assets/"
+
+# Text formats worth compressing; images are already compressed.
+COMPRESSIBLE = {".css", ".js", ".svg", ".html", ".json", ".txt", ".map"}
+MEDIA_TYPES = {
+    ".css": "text/css; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+    ".svg": "image/svg+xml",
+    ".html": "text/html; charset=utf-8",
+    ".json": "application/json",
+    ".txt": "text/plain; charset=utf-8",
+    ".map": "application/json",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+    ".ico": "image/x-icon",
+}
+# Preferred first.
+ENCODINGS = ("br", "gzip")
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+_CSS_URL = re.compile(r"""url\((["']?)/static/([^"')]+)\1\)""")
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def compress(body: bytes) -> dict[str, bytes]:
+    """Encoded variants of `body` that come out smaller than it."""
+    variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    brotli = _brotli()
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+    return {enc: data for enc, data in variants.items() if len(data) < len(body)}
+
+
+def build(source: Path = SOURCE_DIR, out: Path = BUILD_DIR) -> dict[str, str]:
+    """Write the fingerprinted build of `source` to `out`; returns the manifest."""
+    if out.exists():
+        shutil.rmtree(out)
+    out.mkdir(parents=True)
+
+    files = sorted(p.relative_to(source).as_posix() for p in source.rglob("*") if p.is_file())
+    # Stylesheets last, so the URLs they reference are already hashed.
+    files.sort(key=lambda name: name.endswith(".css"))
+
+    manifest: dict[str, str] = {}
+    for name in files:
+        body = (source / name).read_bytes()
+        if name.endswith(".css"):
+            body = _CSS_URL.sub(
+                lambda m: f"url({m[1]}{asset_url(m[2], manifest)}{m[1]})",
+                body.decode(),
+            ).encode()
+        path = Path(name)
+        digest = hashlib.sha256(body).hexdigest()[:12]
+        hashed = path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+        manifest[name] = hashed
+
+        target = out / hashed
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(body)
+        if path.suffix in COMPRESSIBLE:
+            for encoding, data in compress(body).items():
+                suffix = ".br" if encoding == "br" else ".gz"
+                target.with_name(target.name + suffix).write_bytes(data)
+
+    (out / MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Codings the client accepts: listed with q > 0, or covered by "*" and not refused."""
+    accepted = set()
+    refused = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if not coding:
+            continue
+        (accepted if q > 0 else refused).add(coding)
+    if "*" in accepted:
+        accepted.update(ENCODINGS)
+    # Explicit q=0 wins over "*".
+    return accepted - refused
+
+
+class Precompressed:
+    """A response body kept in memory with its encoded variants."""
+
+    def __init__(
+        self,
+        body: bytes,
+        media_type: str,
+        variants: dict[str, bytes] | None = None,
+        cache_control: str = IMMUTABLE,
+    ) -> None:
+        self.body = body
+        self.media_type = media_type
+        self.variants = compress(body) if variants is None else variants
+        self.digest = hashlib.sha256(body).hexdigest()[:16]
+        self.cache_control = cache_control
+
+    def response(self, request: Request) -> Response:
+        accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+        encoding = next(
+            (enc for enc in ENCODINGS if enc in self.variants and enc in accepted), None
+        )
+        # Each encoded body is a different representation, so it gets its own
+        # strong ETag.
+        etag = f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+        headers = {
+            "Cache-Control": self.cache_control,
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+        }
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+
+        if encoding is None:
+            return Response(content=self.body, media_type=self.media_type, headers=headers)
+        headers["Content-Encoding"] = encoding
+        return Response(
+            content=self.variants[encoding], media_type=self.media_type, headers=headers
+        )
+
+
+_manifest: dict[str, str] = {}
+_assets: dict[str, Precompressed] = {}
+
+
+def load(out: Path = BUILD_DIR) -> int:
+    """Read a build into memory; returns how many assets it holds (0 if none was built)."""
+    global _manifest
+    manifest_path = out / MANIFEST
+    if not manifest_path.exists():
+        print(f"[static] no build in {out}, serving unhashed /static files")
+        return 0
+
+    manifest = json.loads(manifest_path.read_text())
+    assets = {}
+    for hashed in manifest.values():
+        target = out / hashed
+        variants = {}
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            encoded = target.with_name(target.name + suffix)
+            if encoded.exists():
+                variants[encoding] = encoded.read_bytes()
+        media_type = MEDIA_TYPES.get(target.suffix, "application/octet-stream")
+        assets[hashed] = Precompressed(target.read_bytes(), media_type, variants)
+    _assets.clear()
+    _assets.update(assets)
+    _manifest = manifest
+    return len(assets)
+
+
+def asset_url(name: str, manifest: dict[str, str] | None = None) -> str:
+    """URL for the static file `name` (e.g. "css/main.css")."""
+    hashed = (_manifest if manifest is None else manifest).get(name)
+    if hashed is None:
+        return f"/static/{name}"
+    return URL_PREFIX + hashed
+
+
+def get(hashed: str) -> Precompressed | None:
+    return _assets.get(hashed)
+
+
+if __name__ == "__main__":
+    built = build()
+    if _brotli() is None:
+        print("[static] brotli is not installed; wrote gzip variants only")
+    print(f"[static] built {len(built)} assets into {BUILD_DIR}")
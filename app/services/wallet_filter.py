@@ -0,0 +1,194 @@
+"""
+In-memory Bloom filter of registered wallets.
+
+A negative answer is definite, so "not joined" lookups and first-time joins
+skip the existence query entirely; a positive answer is confirmed with one
+indexed SELECT. The filter is loaded from `participants` in the background
+at startup, updated on every join served by this process, and topped up
+from rows with a higher id every WALLET_FILTER_REFRESH_SECONDS so inserts
+made by other processes (bulk import, other API workers) show up too.
+
+Ids are handed out before commit, so with concurrent inserts a row can
+become visible after rows with higher ids were already read. Each refresh
+therefore re-reads from the id watermark of WALLET_FILTER_RESCAN_SECONDS
+ago, which catches any insert whose transaction was shorter than that.
+
+Size is m = -n * ln(p) / ln(2)^2 bits for n wallets at false-positive
+rate p:
+
+    p = 1%     9.6 bits/wallet   1.2 MB per million wallets
+    p = 0.1%  14.4 bits/wallet   1.8 MB per million wallets   (default)
+    p = 0.01% 19.2 bits/wallet   2.4 MB per million wallets
+
+See bench/wallet_filter.py for measured build time, lookup cost and
+false-positive rate.
+"""
+import asyncio
+import hashlib
+import math
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal
+
+LOAD_BATCH_SIZE = 50_000
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.num_bits = math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        # Kirsch-Mitzenmacher: k positions from two 64-bit halves of one hash.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.bits)
+
+
+class WalletRegistry:
+    def __init__(self, capacity: int, error_rate: float, rescan_seconds: float) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rescan_seconds = rescan_seconds
+        self._filter = BloomFilter(capacity, error_rate)
+        # (monotonic time, highest id read by then), oldest first
+        self._watermarks: deque[tuple[float, int]] = deque()
+        self._ready = False
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def might_contain(self, wallet: str) -> bool:
+        """False means definitely not registered. True until loaded."""
+        if not self._ready:
+            return True
+        return wallet in self._filter
+
+    def add(self, wallet: str) -> None:
+        with self._lock:
+            self._filter.add(wallet)
+
+    def _load_since(self, bloom: BloomFilter, last_id: int) -> int:
+        db = SessionLocal()
+        try:
+            while True:
+                rows = (
+                    db.query(models.Participant.id, models.Participant.wallet)
+                    .filter(models.Participant.id > last_id)
+                    .order_by(models.Participant.id)
+                    .limit(LOAD_BATCH_SIZE)
+                    .all()
+                )
+                if not rows:
+                    return last_id
+                with self._lock:
+                    for _, wallet in rows:
+                        # Rescans see rows again; keep count honest.
+                        if wallet not in bloom:
+                            bloom.add(wallet)
+                last_id = rows[-1].id
+        finally:
+            db.close()
+
+    def _id_created_before(self, cutoff: datetime) -> int:
+        """Highest id created before `cutoff`; walks back from the newest row by primary key."""
+        db = SessionLocal()
+        try:
+            row_id = (
+                db.query(models.Participant.id)
+                .filter(models.Participant.created_at < cutoff)
+                .order_by(models.Participant.id.desc())
+                .limit(1)
+                .scalar()
+            )
+            return row_id or 0
+        finally:
+            db.close()
+
+    def load(self) -> None:
+        """(Re)build the filter from the whole table."""
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        started = time.monotonic()
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.rescan_seconds)
+        last_id = self._load_since(bloom, 0)
+        # Rows that were mid-transaction during the load come after this one.
+        rescan_from = self._id_created_before(cutoff)
+        with self._lock:
+            self._filter = bloom
+            self._watermarks = deque([
+                (started - self.rescan_seconds, rescan_from),
+                (started, last_id),
+            ])
+        self._ready = True
+
+    def refresh(self) -> None:
+        """Add rows committed since the last load; rebuild larger when full."""
+        if self._filter.count > self._filter.capacity:
+            self.capacity = self._filter.count * 2
+            self.load()
+            return
+        started = time.monotonic()
+        # Start from the newest watermark that is at least rescan_seconds old.
+        marks = self._watermarks
+        while len(marks) > 1 and marks[1][0] <= started - self.rescan_seconds:
+            marks.popleft()
+        last_id = self._load_since(self._filter, marks[0][1])
+        marks.append((started, max(last_id, marks[-1][1])))
+
+    async def _run(self, refresh_seconds: float) -> None:
+        while True:
+            try:
+                if self._ready:
+                    await asyncio.to_thread(self.refresh)
+                else:
+                    await asyncio.to_thread(self.load)
+            except Exception as e:
+                print("[wallet_filter] load failed:", repr(e))
+            await asyncio.sleep(refresh_seconds)
+
+    def start(self, refresh_seconds: float) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(refresh_seconds))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+wallet_registry = WalletRegistry(
+    settings.WALLET_FILTER_CAPACITY,
+    settings.WALLET_FILTER_ERROR_RATE,
+    settings.WALLET_FILTER_RESCAN_SECONDS,
+)
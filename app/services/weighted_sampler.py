@@ -0,0 +1,130 @@
+import secrets
+from typing import Callable, Iterable
+
+
+class WeightedSampler:
+    """
+    Draws keys with probability proportional to their integer weight.
+
+    Weights live in a Fenwick (binary indexed) tree, so adding a key,
+    changing a weight and drawing are each O(log n) and nothing is rebuilt
+    when weights change. A key set to weight 0 (or discarded) keeps its
+    slot, and can never be drawn, until `compact` drops it.
+    """
+
+    def __init__(self, items: Iterable[tuple[str, int]] = ()) -> None:
+        self._keys: list[str] = []
+        self._weights: list[int] = []
+        self._index: dict[str, int] = {}
+        # 1-based; _tree[i] holds the weight sum of slots (i - lowbit(i), i].
+        self._tree: list[int] = [0]
+        self.total = 0
+        self.live = 0
+        self._build(items)
+
+    def _build(self, items: Iterable[tuple[str, int]]) -> None:
+        for key, weight in items:
+            if weight < 0:
+                raise ValueError(f"negative weight for {key}")
+            if weight == 0 or key in self._index:
+                continue
+            self._index[key] = len(self._keys)
+            self._keys.append(key)
+            self._weights.append(weight)
+        tree = [0] + self._weights
+        n = len(self._weights)
+        # Linear-time construction: push each node's sum up to its parent.
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self.total = sum(self._weights)
+        self.live = n
+
+    def __len__(self) -> int:
+        return self.live
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def weight(self, key: str) -> int:
+        i = self._index.get(key)
+        return 0 if i is None else self._weights[i]
+
+    def set_weight(self, key: str, weight: int) -> None:
+        if weight < 0:
+            raise ValueError(f"negative weight for {key}")
+        i = self._index.get(key)
+        if i is None:
+            if weight:
+                self._append(key, weight)
+            return
+
+        delta = weight - self._weights[i]
+        if not delta:
+            return
+        if self._weights[i] == 0:
+            self.live += 1
+        elif weight == 0:
+            self.live -= 1
+        self._weights[i] = weight
+        self.total += delta
+        pos = i + 1
+        tree = self._tree
+        while pos < len(tree):
+            tree[pos] += delta
+            pos += pos & -pos
+
+    def discard(self, key: str) -> None:
+        """Forget `key`: it can no longer be drawn and is not `in` the sampler."""
+        if key in self._index:
+            self.set_weight(key, 0)
+            # The slot stays behind at weight 0 until `compact`.
+            del self._index[key]
+
+    def _append(self, key: str, weight: int) -> None:
+        self._index[key] = len(self._keys)
+        self._keys.append(key)
+        self._weights.append(weight)
+        n = len(self._keys)
+        # The new node covers (n - lowbit(n), n]: its own weight plus the
+        # nodes already summing (n - lowbit(n), n - 1].
+        node = weight
+        j, stop = n - 1, n - (n & -n)
+        while j > stop:
+            node += self._tree[j]
+            j -= j & -j
+        self._tree.append(node)
+        self.total += weight
+        self.live += 1
+
+    def sample(self, randbelow: Callable[[int], int] = secrets.randbelow) -> str | None:
+        """One key drawn by weight, or None if every weight is 0."""
+        if self.total <= 0:
+            return None
+        target = randbelow(self.total)
+        tree = self._tree
+        n = len(tree) - 1
+        # Walk down from the largest power of two: find the last slot whose
+        # prefix sum is still <= target; the next slot is the draw.
+        pos = 0
+        step = 1 << (n.bit_length() - 1)
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= target:
+                pos = nxt
+                target -= tree[nxt]
+            step >>= 1
+        return self._keys[pos]
+
+    @property
+    def dead(self) -> int:
+        """Slots holding a key at weight 0."""
+        return len(self._keys) - self.live
+
+    def compact(self) -> None:
+        """Rebuild without the weight-0 slots."""
+        items = list(zip(self._keys, self._weights))
+        self._keys, self._weights, self._index = [], [], {}
+        self._build(items)
@@ -0,0 +1,151 @@
+"""
+Fan-out of newly logged raffle winners to streaming clients.
+
+One watcher task per process polls the winners version marker and, when it
+changes, reads the new rows once and hands the same pre-serialised event to
+every subscriber. The task starts with the first subscriber and stops with
+the last one.
+"""
+import asyncio
+import json
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal
+from app.services import raffle_logic
+
+# Rows fetched per watcher poll and per resume backfill.
+FETCH_LIMIT = 100
+
+
+def winner_event(winner: models.RaffleWinner) -> tuple[int, str]:
+    """(id, SSE frame) for a winner row."""
+    data = json.dumps(
+        {
+            "id": winner.id,
+            "wallet": winner.wallet,
+            "amount_sol": winner.amount_lamports / 1_000_000_000,
+            "tx_signature": winner.tx_signature,
+        }
+    )
+    return winner.id, f"id: {winner.id}\nevent: winner\ndata: {data}\n\n"
+
+
+def winners_after(db: Session, last_id: int, limit: int = FETCH_LIMIT) -> list[tuple[int, str]]:
+    rows = (
+        db.query(models.RaffleWinner)
+        .filter(models.RaffleWinner.id > last_id)
+        .order_by(models.RaffleWinner.id)
+        .limit(limit)
+        .all()
+    )
+    return [winner_event(w) for w in rows]
+
+
+def _read_version() -> int:
+    db = SessionLocal()
+    try:
+        return raffle_logic.get_cache_version(db, raffle_logic.WINNERS_CACHE_KEY)
+    finally:
+        db.close()
+
+
+def _read_last_id() -> int:
+    db = SessionLocal()
+    try:
+        last_id = (
+            db.query(models.RaffleWinner.id)
+            .order_by(models.RaffleWinner.id.desc())
+            .limit(1)
+            .scalar()
+        )
+        return last_id or 0
+    finally:
+        db.close()
+
+
+def _read_new(last_id: int) -> list[tuple[int, str]]:
+    db = SessionLocal()
+    try:
+        return winners_after(db, last_id)
+    finally:
+        db.close()
+
+
+class Subscriber:
+    def __init__(self, queue_size: int) -> None:
+        self.queue: asyncio.Queue[tuple[int, str]] = asyncio.Queue(maxsize=queue_size)
+        # Set when the client fell too far behind and was cut off.
+        self.overflowed = asyncio.Event()
+
+
+class WinnersFeed:
+    def __init__(self, poll_seconds: float, queue_size: int) -> None:
+        self.poll_seconds = poll_seconds
+        self.queue_size = queue_size
+        self._subscribers: set[Subscriber] = set()
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self) -> Subscriber:
+        sub = Subscriber(self.queue_size)
+        self._subscribers.add(sub)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        self._subscribers.discard(sub)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _publish(self, event: tuple[int, str]) -> None:
+        for sub in list(self._subscribers):
+            try:
+                sub.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._subscribers.discard(sub)
+                sub.overflowed.set()
+
+    async def _run(self) -> None:
+        version = 0
+        last_id: int | None = None
+        while True:
+            try:
+                if last_id is None:
+                    # Retried until it works: a failed start must not end the
+                    # task, or nobody gets events until the next subscriber.
+                    version = await asyncio.to_thread(_read_version)
+                    last_id = await asyncio.to_thread(_read_last_id)
+                else:
+                    new_version = await asyncio.to_thread(_read_version)
+                    if new_version != version:
+                        # Page until caught up; a burst can exceed one fetch.
+                        while True:
+                            events = await asyncio.to_thread(_read_new, last_id)
+                            for event in events:
+                                last_id = event[0]
+                                self._publish(event)
+                            if len(events) < FETCH_LIMIT:
+                                break
+                        version = new_version
+            except Exception as e:
+                print("[winners_feed] poll failed:", repr(e))
+            await asyncio.sleep(self.poll_seconds)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+feed = WinnersFeed(
+    settings.WINNERS_FEED_POLL_SECONDS,
+    settings.WINNERS_FEED_QUEUE_SIZE,
+)
@@ -72,6 +72,18 @@ function setJoinMessage(text, isOk) {
 
 const winnersListEl = document.getElementById("winners-list");
 let lastSeenKeys = new Set();
+// Newest winner id shown, so the stream resumes right after it.
+let lastWinnerId = null;
+
+function showWinner(winner) {
+  if (typeof winner.id === "number" && (lastWinnerId === null || winner.id > lastWinnerId)) {
+    lastWinnerId = winner.id;
+  }
+  const key = winner.tx_signature || `${winner.wallet}-${winner.amount_sol}`;
+  if (lastSeenKeys.has(key)) return;
+  lastSeenKeys.add(key);
+  addWinnerRow(winner);
+}
 
 async function fetchLatestWinners() {
   if (!winnersListEl) return;
@@ -82,12 +94,8 @@ async function fetchLatestWinners() {
 
     const data = await resp.json();
 
-    data.forEach((winner) => {
-      const key = winner.tx_signature || `${winner.wallet}-${winner.amount_sol}`;
-      if (lastSeenKeys.has(key)) return;
-      lastSeenKeys.add(key);
-      addWinnerRow(winner);
-    });
+    // Newest first; rows are prepended, so add the oldest first.
+    data.slice().reverse().forEach(showWinner);
 
     if (lastSeenKeys.size > 200) {
       lastSeenKeys = new Set(Array.from(lastSeenKeys).slice(-100));
@@ -132,7 +140,33 @@ function addWinnerRow(winner) {
   }
 }
 
+function subscribeWinners() {
+  const url = lastWinnerId === null
+    ? "/api/winners/stream"
+    : `/api/winners/stream?last_id=${lastWinnerId}`;
+  const source = new EventSource(url);
+
+  source.addEventListener("winner", (e) => {
+    try {
+      showWinner(JSON.parse(e.data));
+    } catch (err) {
+      console.warn("Bad winner event:", err);
+    }
+  });
+
+  // Missed more winners than the stream replays: reload the list and resume.
+  source.addEventListener("reset", async () => {
+    source.close();
+    await fetchLatestWinners();
+    subscribeWinners();
+  });
+}
+
 if (winnersListEl) {
-  fetchLatestWinners();
-  setInterval(fetchLatestWinners, 10000);
-}
\ No newline at end of file
+  if (window.EventSource) {
+    fetchLatestWinners().then(subscribeWinners);
+  } else {
+    fetchLatestWinners();
+    setInterval(fetchLatestWinners, 10000);
+  }
+}
@@ -0,0 +1,283 @@
+"""
+End-to-end benchmark: raffle cycle latency, join throughput and
+/api/winners/latest throughput at several participant counts, against
+local Solana RPC and PumpPortal stubs. Results are written as JSON so runs
+can be diffed.
+
+    python -m bench.end_to_end --participants 0,10000,100000 --out bench.json
+    python -m bench.end_to_end --rpc-latency-ms 150 --rpc-failure-rate 0.02
+    python -m bench.end_to_end --raffles 8
+
+With --raffles N every cycle runs N raffles (each with its own creator
+wallet) concurrently in the one worker process.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from solders.keypair import Keypair
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--participants", default="0,1000,10000",
+                        help="comma-separated participant counts to measure at")
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--raffles", type=int, default=1,
+                        help="raffles run concurrently per cycle")
+    parser.add_argument("--joins", type=int, default=2_000)
+    parser.add_argument("--latest-requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rpc-latency-ms", type=float, default=20)
+    parser.add_argument("--rpc-failure-rate", type=float, default=0)
+    parser.add_argument("--rpc-confirm-ms", type=float, default=400)
+    parser.add_argument("--pump-latency-ms", type=float, default=100)
+    parser.add_argument("--pump-failure-rate", type=float, default=0)
+    parser.add_argument("--lightning", action="store_true",
+                        help="collect through /api/trade instead of /api/trade-local")
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    return parser.parse_args()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _configure(args: argparse.Namespace, ports: dict[str, int], db_path: str) -> Keypair:
+    """Point the app, the worker and the stubs at each other; must run before they are imported."""
+    creator = Keypair()
+    if args.raffles > 1:
+        raffles = [{"raffle_id": 1}]
+        for raffle_id in range(2, args.raffles + 1):
+            os.environ[f"BENCH_CREATOR_KEY_{raffle_id}"] = str(Keypair())
+            raffles.append({
+                "raffle_id": raffle_id,
+                "creator_key_env": f"BENCH_CREATOR_KEY_{raffle_id}",
+            })
+        with open(f"{db_path}.raffles.json", "w") as f:
+            json.dump(raffles, f)
+        os.environ["RAFFLES_FILE"] = f"{db_path}.raffles.json"
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "SOLANA_RPC_URL": f"http://127.0.0.1:{ports['rpc']}",
+        "PUMPPORTAL_BASE_URL": f"http://127.0.0.1:{ports['pump']}",
+        "PUMPPORTAL_API_KEY": "bench" if args.lightning else "",
+        "CREATOR_PRIVATE_KEY_BASE58": str(creator),
+        "OWNER_WALLET": str(Keypair().pubkey()),
+        "RECAPTCHA_SECRET": "",
+        "RATE_LIMITS": "join=1000000000/1,status=1000000000/1",
+        "WORKER_METRICS_PORT": "0",
+        "SOLANA_STUB_LATENCY_MS": str(args.rpc_latency_ms),
+        "SOLANA_STUB_FAILURE_RATE": str(args.rpc_failure_rate),
+        "SOLANA_STUB_CONFIRM_MS": str(args.rpc_confirm_ms),
+        "SOLANA_STUB_FEE_PAYER": str(creator.pubkey()),
+        "PUMPPORTAL_STUB_LATENCY_MS": str(args.pump_latency_ms),
+        "PUMPPORTAL_STUB_FAILURE_RATE": str(args.pump_failure_rate),
+    })
+    return creator
+
+
+def _serve(app, port: int):
+    import uvicorn
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, thread
+
+
+def _summary(latencies: list[float], errors: int, elapsed: float) -> dict[str, float]:
+    ordered = sorted(latencies) or [0.0]
+
+    def pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 2)
+
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+def _seed_participants(target: int) -> None:
+    from sqlalchemy import func
+
+    from app import models
+    from app.database import SessionLocal, engine
+    from app.services.participants_bulk import insert_wallets
+
+    db = SessionLocal()
+    try:
+        have = db.query(func.count(models.Participant.id)).scalar()
+    finally:
+        db.close()
+
+    while have < target:
+        batch = [str(Keypair().pubkey()) for _ in range(min(10_000, target - have))]
+        with engine.connect() as conn:
+            have += insert_wallets(conn, batch)
+
+
+async def _bench_cycles(cycles: int, raffles: list) -> dict[str, float]:
+    from worker import run_raffle_cycle
+
+    latencies, errors = [], 0
+    started = time.perf_counter()
+    for _ in range(cycles):
+        t0 = time.perf_counter()
+        try:
+            await asyncio.gather(*(run_raffle_cycle.run_raffle_once(cfg) for cfg in raffles))
+            await run_raffle_cycle.wait_for_finishers()
+        except Exception as e:
+            print("[bench] cycle failed:", repr(e), file=sys.stderr)
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - t0)
+    return _summary(latencies, errors, time.perf_counter() - started)
+
+
+async def _bench_http(client, requests: list[tuple[str, str, dict | None]], concurrency: int) -> dict[str, float]:
+    latencies, errors = [], 0
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(method: str, url: str, body: dict | None) -> None:
+        nonlocal errors
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                resp = await client.request(method, url, json=body)
+                ok = resp.status_code < 400
+            except Exception:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - t0)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(*r) for r in requests))
+    return _summary(latencies, errors, time.perf_counter() - started)
+
+
+async def _run(args: argparse.Namespace, api_url: str) -> list[dict]:
+    import httpx
+
+    from app.database import SessionLocal
+    from app.models import Raffle
+    from app.services import pumpportal, solana_client
+    from app.services.raffle_config import load_raffles
+
+    raffles = load_raffles()
+    db = SessionLocal()
+    try:
+        for cfg in raffles:
+            if db.get(Raffle, cfg.raffle_id) is None:
+                db.add(Raffle(id=cfg.raffle_id, name=f"bench {cfg.raffle_id}"))
+        db.commit()
+    finally:
+        db.close()
+
+    await solana_client.startup()
+    await pumpportal.startup()
+    results = []
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=api_url, limits=limits, timeout=30) as client:
+            for target in sorted(int(n) for n in args.participants.split(",") if n.strip()):
+                _seed_participants(target)
+                print(f"[bench] participants={target}", file=sys.stderr)
+
+                cycle = await _bench_cycles(args.cycles, raffles)
+                joins = await _bench_http(
+                    client,
+                    [
+                        ("POST", "/api/participants/join", {"wallet": str(Keypair().pubkey())})
+                        for _ in range(args.joins)
+                    ],
+                    args.concurrency,
+                )
+                latest = await _bench_http(
+                    client,
+                    [("GET", "/api/winners/latest", None)] * args.latest_requests,
+                    args.concurrency,
+                )
+                results.append({
+                    "participants": target,
+                    "raffle_cycle": cycle,
+                    "join": joins,
+                    "winners_latest": latest,
+                })
+    finally:
+        await pumpportal.shutdown()
+        await solana_client.shutdown()
+    return results
+
+
+def main() -> None:
+    args = _parse_args()
+    ports = {"rpc": _free_port(), "pump": _free_port(), "api": _free_port()}
+    fd, db_path = tempfile.mkstemp(suffix=".db", prefix="bench_e2e_")
+    os.close(fd)
+    _configure(args, ports, db_path)
+
+    from bench import pumpportal_stub, solana_rpc_stub
+    from app.database import Base, engine
+    from app.main import app
+
+    Base.metadata.create_all(bind=engine)
+    servers = [
+        _serve(solana_rpc_stub.app, ports["rpc"]),
+        _serve(pumpportal_stub.app, ports["pump"]),
+        _serve(app, ports["api"]),
+    ]
+    try:
+        # Keep the worker's progress prints out of the JSON on stdout.
+        with contextlib.redirect_stdout(sys.stderr):
+            results = asyncio.run(_run(args, f"http://127.0.0.1:{ports['api']}"))
+    finally:
+        for server, thread in servers:
+            server.should_exit = True
+            thread.join(timeout=5)
+        engine.dispose()
+        os.remove(db_path)
+        if os.path.exists(f"{db_path}.raffles.json"):
+            os.remove(f"{db_path}.raffles.json")
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "config": {
+            key: value for key, value in vars(args).items() if key != "out"
+        },
+        "results": results,
+    }
+    out = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
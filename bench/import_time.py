@@ -0,0 +1,97 @@
+"""
+Cold-start benchmark for API and worker processes.
+
+    python -m bench.import_time                 # 10 fresh interpreters per variant
+    python -m bench.import_time --runs 30
+
+Each variant runs in a new interpreter with its own empty SQLite database
+and without CREATOR_PRIVATE_KEY_BASE58 / OWNER_WALLET, the way an
+autoscaled API replica starts. Reported times cover the variant's code
+only, not interpreter startup. "eager layout" imports what app.main used to
+pull in at import time (solders, httpx) and creates the schema, for
+comparison with the plain "api import". The startup variants also run the
+FastAPI lifespan, with and without the schema migration.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CHILD = """
+import time
+started = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - started
+import sys
+print(elapsed, int("solders" in sys.modules))
+"""
+
+LIFESPAN = """
+import asyncio
+import app.main as main
+
+async def _startup():
+    async with main.app.router.lifespan_context(main.app):
+        pass
+
+asyncio.run(_startup())
+"""
+
+# name -> (code, extra environment)
+VARIANTS = {
+    "api import": ("import app.main", {}),
+    "api import, eager layout": (
+        "import app.main, solders.pubkey, httpx\n"
+        "from app.schema import migrate\nmigrate()",
+        {},
+    ),
+    "api startup, no migrate": (LIFESPAN, {"DB_MIGRATE_ON_STARTUP": "false"}),
+    "api startup, migrate": (LIFESPAN, {"DB_MIGRATE_ON_STARTUP": "true"}),
+    "worker import": ("import worker.run_raffle_cycle", {}),
+}
+
+
+def _run(body: str, extra_env: dict[str, str]) -> tuple[float, bool, bool]:
+    """(seconds, solders imported, database file created) for one fresh interpreter."""
+    with tempfile.TemporaryDirectory(prefix="bench_import_") as tmp:
+        db_path = os.path.join(tmp, "cold.db")
+        env = {
+            k: v for k, v in os.environ.items()
+            if k not in ("CREATOR_PRIVATE_KEY_BASE58", "OWNER_WALLET")
+        }
+        env.update({"DATABASE_URL": f"sqlite:///{db_path}", "WALLET_FILTER_ENABLED": "false"})
+        env.update(extra_env)
+        out = subprocess.run(
+            [sys.executable, "-c", CHILD.format(body=body)],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        seconds, solders = out.strip().splitlines()[-1].split()
+        return float(seconds), solders == "1", os.path.exists(db_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    # One untimed run so every variant sees compiled bytecode.
+    _run("import app.main, worker.run_raffle_cycle", {})
+
+    for name, (body, extra_env) in VARIANTS.items():
+        results = [_run(body, extra_env) for _ in range(args.runs)]
+        times = sorted(seconds for seconds, _, _ in results)
+        _, solders, touched_db = results[-1]
+        print(
+            f"{name:<26} median={statistics.median(times) * 1e3:7.1f} ms  "
+            f"min={times[0] * 1e3:7.1f} ms  solders={'yes' if solders else 'no':<3}  "
+            f"db touched={'yes' if touched_db else 'no'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
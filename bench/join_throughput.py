@@ -0,0 +1,95 @@
+"""
+Join path throughput: legacy SELECT+INSERT+commit+refresh vs. the single
+upsert statement vs. group commit, with concurrent joiners.
+
+    python -m bench.join_throughput                        # temporary SQLite file
+    DATABASE_URL=postgresql://... python -m bench.join_throughput
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+
+_tmp_db = None
+if "DATABASE_URL" not in os.environ:
+    fd, _tmp_db = tempfile.mkstemp(suffix=".db", prefix="bench_join_")
+    os.close(fd)
+    os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_db}"
+
+from fastapi.concurrency import run_in_threadpool  # noqa: E402
+from sqlalchemy.exc import IntegrityError  # noqa: E402
+
+from app import models  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.services import raffle_logic  # noqa: E402
+from app.services.join_batcher import JoinBatcher  # noqa: E402
+
+
+def _legacy_join(wallet: str) -> bool:
+    db = SessionLocal()
+    try:
+        if db.query(models.Participant).filter_by(wallet=wallet).first():
+            return False
+        participant = models.Participant(wallet=wallet)
+        try:
+            db.add(participant)
+            db.commit()
+            db.refresh(participant)
+        except IntegrityError:
+            db.rollback()
+            return False
+        return True
+    finally:
+        db.close()
+
+
+def _upsert_join(wallet: str) -> bool:
+    db = SessionLocal()
+    try:
+        return raffle_logic.join_participant(db, wallet)
+    finally:
+        db.close()
+
+
+async def _run(mode: str, joins: int, concurrency: int, window_ms: float) -> float:
+    wallets = [uuid.uuid4().hex for _ in range(joins)]
+    batcher = JoinBatcher(window_ms, max_batch=concurrency)
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(wallet: str) -> None:
+        async with sem:
+            if mode == "legacy":
+                await run_in_threadpool(_legacy_join, wallet)
+            elif mode == "upsert":
+                await run_in_threadpool(_upsert_join, wallet)
+            else:
+                await batcher.join(wallet)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(w) for w in wallets))
+    return joins / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--joins", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--window-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    try:
+        print(f"db={engine.dialect.name} joins={args.joins} concurrency={args.concurrency}")
+        for mode in ("legacy", "upsert", "group"):
+            rate = asyncio.run(_run(mode, args.joins, args.concurrency, args.window_ms))
+            print(f"{mode:>7}: {rate:10,.0f} joins/s")
+    finally:
+        engine.dispose()
+        if _tmp_db:
+            os.remove(_tmp_db)
+
+
+if __name__ == "__main__":
+    main()
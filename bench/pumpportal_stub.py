@@ -0,0 +1,76 @@
+"""
+Local stand-in for PumpPortal's /api/trade (Lightning) and
+/api/trade-local endpoints, for benchmarking fee collection.
+
+    PUMPPORTAL_STUB_LATENCY_MS=300 PUMPPORTAL_STUB_FAILURE_RATE=0.05 \\
+        uvicorn bench.pumpportal_stub:app --port 9002
+
+and point the app at it with PUMPPORTAL_BASE_URL=http://127.0.0.1:9002.
+
+/api/trade-local returns an unsigned v0 transaction paid by `publicKey`;
+the caller signs it and sends it through its own RPC (the Solana RPC stub).
+/api/trade returns a made-up signature, as Lightning sends it itself.
+"""
+import asyncio
+import os
+import random
+from urllib.parse import parse_qs
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+from solders.hash import Hash
+from solders.message import MessageV0
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solders.transaction import VersionedTransaction
+
+LATENCY_MS = float(os.getenv("PUMPPORTAL_STUB_LATENCY_MS", "100"))
+FAILURE_RATE = float(os.getenv("PUMPPORTAL_STUB_FAILURE_RATE", "0"))
+
+app = FastAPI(title="PumpPortal stub")
+
+
+def _maybe_fail() -> JSONResponse | None:
+    if random.random() < FAILURE_RATE:
+        return JSONResponse({"error": "injected failure"}, status_code=503)
+    return None
+
+
+async def _form(request: Request) -> dict[str, str]:
+    form = parse_qs((await request.body()).decode())
+    return {key: values[0] for key, values in form.items()}
+
+
+@app.post("/api/trade")
+async def trade(request: Request):
+    form = await _form(request)
+    await asyncio.sleep(LATENCY_MS / 1000)
+
+    failure = _maybe_fail()
+    if failure is not None:
+        return failure
+    if not request.query_params.get("api-key"):
+        return JSONResponse({"errors": ["api-key is required"]}, status_code=400)
+    if form.get("action") != "collectCreatorFee":
+        return JSONResponse({"errors": ["unsupported action"]}, status_code=400)
+
+    signature = Signature.from_bytes(os.urandom(64))
+    return {"signature": str(signature), "errors": []}
+
+
+@app.post("/api/trade-local")
+async def trade_local(request: Request):
+    form = await _form(request)
+    await asyncio.sleep(LATENCY_MS / 1000)
+
+    failure = _maybe_fail()
+    if failure is not None:
+        return failure
+    try:
+        payer = Pubkey.from_string(form.get("publicKey", ""))
+    except ValueError:
+        return JSONResponse({"errors": ["invalid publicKey"]}, status_code=400)
+
+    message = MessageV0.try_compile(payer, [], [], Hash.new_unique())
+    tx = VersionedTransaction.populate(message, [Signature.default()])
+    return Response(content=bytes(tx), media_type="application/octet-stream")
@@ -0,0 +1,41 @@
+"""
+Local stand-in for Google's siteverify endpoint, for load-testing the join
+route without calling Google.
+
+    RECAPTCHA_STUB_LATENCY_MS=150 RECAPTCHA_STUB_FAILURE_RATE=0.05 \\
+        uvicorn bench.recaptcha_stub:app --port 9001
+
+and point the API at it with
+RECAPTCHA_VERIFY_URL=http://127.0.0.1:9001/recaptcha/api/siteverify.
+Tokens starting with "bad" are rejected; everything else passes.
+"""
+import asyncio
+import os
+import random
+from urllib.parse import parse_qs
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+LATENCY_MS = float(os.getenv("RECAPTCHA_STUB_LATENCY_MS", "50"))
+FAILURE_RATE = float(os.getenv("RECAPTCHA_STUB_FAILURE_RATE", "0"))
+SCORE = os.getenv("RECAPTCHA_STUB_SCORE")
+
+app = FastAPI(title="reCAPTCHA stub")
+
+
+@app.post("/recaptcha/api/siteverify")
+async def siteverify(request: Request):
+    form = parse_qs((await request.body()).decode())
+    response = (form.get("response") or [""])[0]
+
+    await asyncio.sleep(LATENCY_MS / 1000)
+
+    if random.random() < FAILURE_RATE:
+        return JSONResponse({"error": "injected failure"}, status_code=503)
+
+    out: dict[str, object] = {"success": not response.startswith("bad")}
+    if SCORE is not None:
+        out["score"] = float(SCORE)
+        out["action"] = "join"
+    return out
@@ -0,0 +1,148 @@
+"""
+Benchmark and uniformity check for raffle_logic.get_random_participant.
+
+    python -m bench.sampler                       # 1M and 10M rows on SQLite
+    python -m bench.sampler --rows 1000000 --url postgresql://...
+
+Each table gets --gap-ratio of its rows deleted so the sampler has to cope
+with holes in the id space. The uniformity check draws from a small table
+with the same gap pattern and runs a chi-square test over the live rows.
+"""
+import argparse
+import math
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, delete, func, insert, text
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import Base
+from app.services import raffle_logic
+
+
+def _make_engine(url: str | None):
+    if url:
+        return create_engine(url), None
+    fd, path = tempfile.mkstemp(suffix=".db", prefix="bench_sampler_")
+    os.close(fd)
+    return create_engine(f"sqlite:///{path}"), path
+
+
+def _populate(engine, rows: int, gap_ratio: float, seed: int = 1) -> int:
+    Base.metadata.drop_all(bind=engine, tables=[models.Participant.__table__])
+    Base.metadata.create_all(bind=engine, tables=[models.Participant.__table__])
+
+    batch = 50_000
+    with engine.begin() as conn:
+        for start in range(0, rows, batch):
+            stop = min(start + batch, rows)
+            conn.execute(
+                insert(models.Participant),
+                [{"wallet": f"w{i}"} for i in range(start, stop)],
+            )
+
+    rnd = random.Random(seed)
+    doomed = rnd.sample(range(1, rows + 1), int(rows * gap_ratio))
+    with engine.begin() as conn:
+        for start in range(0, len(doomed), batch):
+            conn.execute(
+                delete(models.Participant).where(
+                    models.Participant.id.in_(doomed[start:start + batch])
+                )
+            )
+        return conn.execute(func.count(models.Participant.id).select()).scalar()
+
+
+def _time_per_call(fn, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - started) / calls
+
+
+def bench_rows(engine, rows: int, gap_ratio: float, calls: int, baseline_calls: int):
+    live = _populate(engine, rows, gap_ratio)
+
+    with Session(engine) as db:
+        def sample():
+            db.expunge_all()
+            raffle_logic.get_random_participant(db)
+
+        def order_by_random():
+            db.execute(
+                text("SELECT id, wallet FROM participants ORDER BY random() LIMIT 1")
+            ).first()
+
+        sampler_s = _time_per_call(sample, calls)
+        baseline_s = _time_per_call(order_by_random, baseline_calls)
+
+    print(
+        f"rows={rows:>10,} live={live:>10,} "
+        f"sampler={sampler_s * 1e6:9.1f} us/call  "
+        f"order_by_random={baseline_s * 1e3:9.1f} ms/call  "
+        f"speedup={baseline_s / sampler_s:,.0f}x"
+    )
+
+
+def _chi_square_p_value(stat: float, df: int) -> float:
+    # Wilson-Hilferty normal approximation, good enough for df in the hundreds.
+    z = ((stat / df) ** (1 / 3) - (1 - 2 / (9 * df))) / math.sqrt(2 / (9 * df))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def check_uniformity(engine, rows: int, gap_ratio: float, draws: int) -> float:
+    live = _populate(engine, rows, gap_ratio)
+    counts: dict[int, int] = {}
+
+    with Session(engine) as db:
+        for _ in range(draws):
+            participant = raffle_logic.get_random_participant(db)
+            counts[participant.id] = counts.get(participant.id, 0) + 1
+
+    expected = draws / live
+    stat = sum((counts.get(pid, 0) - expected) ** 2 / expected for pid in _live_ids(engine))
+    p_value = _chi_square_p_value(stat, live - 1)
+    print(
+        f"uniformity: live_rows={live} draws={draws} "
+        f"chi2={stat:.1f} df={live - 1} p={p_value:.3f}"
+    )
+    return p_value
+
+
+def _live_ids(engine) -> list[int]:
+    with engine.connect() as conn:
+        return [row[0] for row in conn.execute(text("SELECT id FROM participants"))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="database URL (default: temporary SQLite file)")
+    parser.add_argument("--rows", type=int, nargs="*", default=[1_000_000, 10_000_000])
+    parser.add_argument("--gap-ratio", type=float, default=0.2)
+    parser.add_argument("--calls", type=int, default=2_000)
+    parser.add_argument("--baseline-calls", type=int, default=5)
+    parser.add_argument("--uniformity-rows", type=int, default=500)
+    parser.add_argument("--uniformity-draws", type=int, default=100_000)
+    args = parser.parse_args()
+
+    engine, path = _make_engine(args.url)
+    try:
+        p_value = check_uniformity(
+            engine, args.uniformity_rows, args.gap_ratio, args.uniformity_draws
+        )
+        for rows in args.rows:
+            bench_rows(engine, rows, args.gap_ratio, args.calls, args.baseline_calls)
+    finally:
+        engine.dispose()
+        if path:
+            os.remove(path)
+
+    if p_value < 0.001:
+        raise SystemExit("uniformity check failed (p < 0.001)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Local stand-in for a Solana JSON-RPC node, covering the subset the app
+uses, for benchmarking the worker without touching a cluster.
+
+    SOLANA_STUB_LATENCY_MS=80 SOLANA_STUB_FAILURE_RATE=0.02 \\
+        uvicorn bench.solana_rpc_stub:app --port 8899
+
+and point the app at it with SOLANA_RPC_URL=http://127.0.0.1:8899.
+
+Every transaction confirms SOLANA_STUB_CONFIRM_MS after it is first seen.
+System transfers sent here move lamports as written; any other sent
+transaction, and any signature the stub never saw (e.g. one PumpPortal
+Lightning "sent", credited to SOLANA_STUB_FEE_PAYER), reports
+SOLANA_STUB_FEE_LAMPORTS collected by its fee payer.
+"""
+import asyncio
+import base64
+import os
+import random
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from solders.hash import Hash
+from solders.message import MessageV0
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solders.system_program import ID as SYSTEM_PROGRAM_ID
+from solders.transaction import VersionedTransaction
+
+LATENCY_MS = float(os.getenv("SOLANA_STUB_LATENCY_MS", "20"))
+FAILURE_RATE = float(os.getenv("SOLANA_STUB_FAILURE_RATE", "0"))
+CONFIRM_MS = float(os.getenv("SOLANA_STUB_CONFIRM_MS", "400"))
+FEE_LAMPORTS = int(os.getenv("SOLANA_STUB_FEE_LAMPORTS", "50000000"))
+FEE_PAYER = os.getenv("SOLANA_STUB_FEE_PAYER", "")
+BALANCE_LAMPORTS = int(os.getenv("SOLANA_STUB_BALANCE_LAMPORTS", "1000000000"))
+
+SLOT_SECONDS = 0.4
+BLOCKHASH_VALID_BLOCKS = 150
+RENT_EXEMPT_MINIMUM = 890_880
+TX_FEE_LAMPORTS = 5000
+
+app = FastAPI(title="Solana RPC stub")
+
+_started = time.monotonic()
+# signature -> what the stub reports about it
+_seen: dict[str, "_Tx"] = {}
+
+
+class _Tx:
+    def __init__(self, signature: str, raw: bytes, keys: list[str], deltas: list[int]) -> None:
+        self.signature = signature
+        self.raw = raw
+        self.keys = keys
+        self.deltas = deltas
+        self.seen_at = time.monotonic()
+        self.slot = _slot()
+        self.block_time = int(time.time())
+
+    def confirmed(self) -> bool:
+        return (time.monotonic() - self.seen_at) * 1000 >= CONFIRM_MS
+
+
+def _slot() -> int:
+    return int((time.monotonic() - _started) / SLOT_SECONDS) + 1_000
+
+
+def _context() -> dict:
+    return {"slot": _slot()}
+
+
+def _balance_deltas(tx: VersionedTransaction) -> list[int]:
+    """System transfers move lamports; a transaction without any credits the payer FEE_LAMPORTS."""
+    keys = tx.message.account_keys
+    deltas = [0] * len(keys)
+    transfers = 0
+    for ix in tx.message.instructions:
+        data = bytes(ix.data)
+        if keys[ix.program_id_index] == SYSTEM_PROGRAM_ID and data[:4] == b"\x02\x00\x00\x00":
+            lamports = int.from_bytes(data[4:12], "little")
+            deltas[ix.accounts[0]] -= lamports
+            deltas[ix.accounts[1]] += lamports
+            transfers += 1
+    if not transfers:
+        deltas[0] += FEE_LAMPORTS
+    deltas[0] -= TX_FEE_LAMPORTS
+    return deltas
+
+
+def _note(signature: str) -> _Tx:
+    """Look up a signature; unknown ones (e.g. sent by Lightning) become a fee collection by FEE_PAYER."""
+    tx = _seen.get(signature)
+    if tx is None:
+        payer = Pubkey.from_string(FEE_PAYER) if FEE_PAYER else Pubkey.default()
+        message = MessageV0.try_compile(payer, [], [], Hash.default())
+        raw = bytes(VersionedTransaction.populate(message, [Signature.from_string(signature)]))
+        tx = _seen[signature] = _Tx(
+            signature, raw, [str(payer)], [FEE_LAMPORTS - TX_FEE_LAMPORTS]
+        )
+    return tx
+
+
+def _get_latest_blockhash(params: list) -> dict:
+    return {
+        "context": _context(),
+        "value": {
+            "blockhash": str(Hash.new_unique()),
+            "lastValidBlockHeight": _slot() + BLOCKHASH_VALID_BLOCKS,
+        },
+    }
+
+
+def _get_balance(params: list) -> dict:
+    return {"context": _context(), "value": BALANCE_LAMPORTS}
+
+
+def _get_account_info(params: list) -> dict:
+    return {"context": _context(), "value": None}
+
+
+def _get_multiple_accounts(params: list) -> dict:
+    # Every wallet looks unfunded, so payouts above the rent minimum pass.
+    return {"context": _context(), "value": [None] * len(params[0])}
+
+
+def _get_minimum_balance_for_rent_exemption(params: list) -> int:
+    return RENT_EXEMPT_MINIMUM
+
+
+def _get_block_height(params: list) -> int:
+    return _slot()
+
+
+def _get_recent_prioritization_fees(params: list) -> list[dict]:
+    slot = _slot()
+    return [
+        {"slot": slot - i, "prioritizationFee": random.choice((0, 0, 1_000, 10_000, 50_000))}
+        for i in range(150)
+    ]
+
+
+def _send_transaction(params: list) -> str:
+    raw = base64.b64decode(params[0])
+    tx = VersionedTransaction.from_bytes(raw)
+    signature = str(tx.signatures[0])
+    if signature not in _seen:
+        keys = [str(k) for k in tx.message.account_keys]
+        _seen[signature] = _Tx(signature, raw, keys, _balance_deltas(tx))
+    return signature
+
+
+def _get_signature_statuses(params: list) -> dict:
+    statuses = []
+    for signature in params[0]:
+        tx = _note(signature)
+        if not tx.confirmed():
+            statuses.append(None)
+            continue
+        statuses.append({
+            "slot": tx.slot,
+            "confirmations": None,
+            "err": None,
+            "status": {"Ok": None},
+            "confirmationStatus": "confirmed",
+        })
+    return {"context": _context(), "value": statuses}
+
+
+def _get_signatures_for_address(params: list) -> list[dict]:
+    address = params[0]
+    config = params[1] if len(params) > 1 else {}
+    limit = config.get("limit") or 1000
+
+    history = [tx for tx in _seen.values() if address in tx.keys and tx.confirmed()]
+    history.reverse()
+    signatures = [tx.signature for tx in history]
+    if config.get("before") in signatures:
+        history = history[signatures.index(config["before"]) + 1:]
+        signatures = [tx.signature for tx in history]
+    if config.get("until") in signatures:
+        history = history[:signatures.index(config["until"])]
+
+    return [
+        {
+            "signature": tx.signature,
+            "slot": tx.slot,
+            "err": None,
+            "memo": None,
+            "blockTime": tx.block_time,
+            "confirmationStatus": "finalized",
+        }
+        for tx in history[:limit]
+    ]
+
+
+def _get_transaction(params: list) -> dict | None:
+    tx = _note(params[0])
+    if not tx.confirmed():
+        return None
+
+    pre = [BALANCE_LAMPORTS] * len(tx.keys)
+    return {
+        "slot": tx.slot,
+        "blockTime": tx.block_time,
+        "version": 0,
+        "transaction": [base64.b64encode(tx.raw).decode(), "base64"],
+        "meta": {
+            "err": None,
+            "status": {"Ok": None},
+            "fee": TX_FEE_LAMPORTS,
+            "preBalances": pre,
+            "postBalances": [b + d for b, d in zip(pre, tx.deltas)],
+            "innerInstructions": [],
+            "logMessages": [],
+            "preTokenBalances": [],
+            "postTokenBalances": [],
+            "rewards": [],
+            "loadedAddresses": {"writable": [], "readonly": []},
+            "computeUnitsConsumed": 0,
+        },
+    }
+
+
+METHODS = {
+    "getLatestBlockhash": _get_latest_blockhash,
+    "getBalance": _get_balance,
+    "getAccountInfo": _get_account_info,
+    "getMultipleAccounts": _get_multiple_accounts,
+    "getMinimumBalanceForRentExemption": _get_minimum_balance_for_rent_exemption,
+    "getBlockHeight": _get_block_height,
+    "getRecentPrioritizationFees": _get_recent_prioritization_fees,
+    "sendTransaction": _send_transaction,
+    "getSignatureStatuses": _get_signature_statuses,
+    "getSignaturesForAddress": _get_signatures_for_address,
+    "getTransaction": _get_transaction,
+}
+
+
+def _handle(call: dict) -> dict:
+    method = METHODS.get(call.get("method"))
+    if method is None:
+        error = {"code": -32601, "message": f"Method not found: {call.get('method')}"}
+        return {"jsonrpc": "2.0", "id": call.get("id"), "error": error}
+    return {"jsonrpc": "2.0", "id": call.get("id"), "result": method(call.get("params") or [])}
+
+
+@app.post("/")
+async def rpc(request: Request):
+    body = await request.json()
+
+    await asyncio.sleep(LATENCY_MS / 1000)
+
+    if random.random() < FAILURE_RATE:
+        return JSONResponse({"error": "injected failure"}, status_code=503)
+
+    if isinstance(body, list):
+        return [_handle(call) for call in body]
+    return _handle(body)
@@ -0,0 +1,57 @@
+"""
+Memory, build time, lookup cost and false-positive rate of the wallet
+Bloom filter.
+
+    python -m bench.wallet_filter --wallets 1000000
+"""
+import argparse
+import os
+import time
+
+from solders.pubkey import Pubkey
+
+from app.services.wallet_filter import BloomFilter
+
+
+def _wallets(n: int) -> list[str]:
+    return [str(Pubkey(os.urandom(32))) for _ in range(n)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--wallets", type=int, default=1_000_000)
+    parser.add_argument("--probes", type=int, default=200_000)
+    parser.add_argument("--error-rates", type=float, nargs="*", default=[0.01, 0.001, 0.0001])
+    args = parser.parse_args()
+
+    members = _wallets(args.wallets)
+    outsiders = _wallets(args.probes)
+    as_set = set(members)
+
+    for p in args.error_rates:
+        bloom = BloomFilter(args.wallets, p)
+
+        started = time.perf_counter()
+        for wallet in members:
+            bloom.add(wallet)
+        build_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        false_positives = sum(1 for wallet in outsiders if wallet in bloom)
+        lookup_us = (time.perf_counter() - started) / len(outsiders) * 1e6
+
+        print(
+            f"p={p:<7} k={bloom.num_hashes:<2} "
+            f"size={bloom.size_bytes / 1e6:6.2f} MB "
+            f"({bloom.num_bits / args.wallets:4.1f} bits/wallet)  "
+            f"build={build_s:5.1f}s  lookup={lookup_us:4.1f} us  "
+            f"measured_fp={false_positives / len(outsiders):.5f}"
+        )
+
+    # For comparison: a plain set of the same wallets.
+    set_bytes = as_set.__sizeof__() + sum(w.__sizeof__() for w in as_set)
+    print(f"python set of {args.wallets:,} wallets: {set_bytes / 1e6:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Benchmark and distribution check for holdings-weighted winner selection.
+
+    python -m bench.weighted_sampler                    # 1M participants on SQLite
+    python -m bench.weighted_sampler --participants 100000 --holder-ratio 0.5
+
+Times the Fenwick sampler (build, draw, weight update, append) and the
+holder index refresh: the first snapshot, which reads every participant,
+and an incremental one where --churn of the holders changed balance and
+--churn of the participants are new. The RPC scan itself is not included.
+The distribution check draws from a small weighted set and runs a
+chi-square test against the weights.
+"""
+import argparse
+import math
+import os
+import random
+import tempfile
+import time
+
+from solders.keypair import Keypair
+
+
+def _configure() -> str:
+    """Temporary database and throwaway keys; must run before app modules are imported."""
+    fd, path = tempfile.mkstemp(suffix=".db", prefix="bench_weighted_")
+    os.close(fd)
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{path}",
+        "CREATOR_PRIVATE_KEY_BASE58": str(Keypair()),
+        "OWNER_WALLET": str(Keypair().pubkey()),
+    })
+    return path
+
+
+def _chi_square_p_value(stat: float, df: int) -> float:
+    # Wilson-Hilferty normal approximation, good enough for df in the hundreds.
+    z = ((stat / df) ** (1 / 3) - (1 - 2 / (9 * df))) / math.sqrt(2 / (9 * df))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def check_distribution(keys: int, draws: int) -> float:
+    from app.services.weighted_sampler import WeightedSampler
+
+    rnd = random.Random(1)
+    weights = {f"w{i}": rnd.randint(1, 1_000) for i in range(keys)}
+    sampler = WeightedSampler()
+    for key, weight in weights.items():
+        sampler.set_weight(key, weight)
+    # Exercise updates and dead slots too.
+    for key in rnd.sample(sorted(weights), keys // 10):
+        weights[key] = 0
+        sampler.set_weight(key, 0)
+
+    counts: dict[str, int] = {}
+    for _ in range(draws):
+        key = sampler.sample()
+        counts[key] = counts.get(key, 0) + 1
+
+    total = sum(weights.values())
+    live = [key for key, weight in weights.items() if weight]
+    if any(counts.get(key) for key, weight in weights.items() if not weight):
+        raise SystemExit("a weight-0 key was drawn")
+    stat = 0.0
+    for key in live:
+        expected = draws * weights[key] / total
+        stat += (counts.get(key, 0) - expected) ** 2 / expected
+    p_value = _chi_square_p_value(stat, len(live) - 1)
+    print(f"distribution: keys={len(live)} draws={draws} chi2={stat:.1f} p={p_value:.3f}")
+    return p_value
+
+
+def _per_call(fn, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - started) / calls
+
+
+def bench_sampler(n: int, calls: int) -> None:
+    from app.services.weighted_sampler import WeightedSampler
+
+    rnd = random.Random(2)
+    items = [(f"w{i}", rnd.randint(1, 10**9)) for i in range(n)]
+    started = time.perf_counter()
+    sampler = WeightedSampler(items)
+    build_s = time.perf_counter() - started
+
+    keys = [key for key, _ in items]
+    draw_s = _per_call(sampler.sample, calls)
+    update_s = _per_call(
+        lambda: sampler.set_weight(keys[rnd.randrange(n)], rnd.randint(0, 10**9)), calls
+    )
+    counter = iter(range(n, n + calls))
+    append_s = _per_call(lambda: sampler.set_weight(f"w{next(counter)}", 1), calls)
+    print(
+        f"sampler n={n:>10,}  build={build_s * 1e3:8.1f} ms  "
+        f"draw={draw_s * 1e6:6.2f} us  update={update_s * 1e6:6.2f} us  "
+        f"append={append_s * 1e6:6.2f} us"
+    )
+
+
+def _insert_participants(engine, wallets: list[str]) -> None:
+    from sqlalchemy import insert
+
+    from app import models
+
+    with engine.begin() as conn:
+        for start in range(0, len(wallets), 50_000):
+            conn.execute(
+                insert(models.Participant),
+                [{"wallet": w} for w in wallets[start:start + 50_000]],
+            )
+
+
+def bench_refresh(participants: int, holder_ratio: float, churn: float, calls: int) -> None:
+    from solders.pubkey import Pubkey
+
+    from app.database import Base, engine
+    from app.services.holders import HolderIndex
+
+    Base.metadata.create_all(bind=engine)
+    rnd = random.Random(3)
+    wallets = [f"p{i}" for i in range(participants)]
+    _insert_participants(engine, wallets)
+
+    # Holders: a share of the participants plus as many outsiders.
+    holdings = {w: rnd.randint(1, 10**12) for w in rnd.sample(wallets, int(participants * holder_ratio))}
+    holdings.update({f"o{i}": rnd.randint(1, 10**12) for i in range(len(holdings))})
+
+    index = HolderIndex(Pubkey.default())
+    started = time.perf_counter()
+    first = index.apply_snapshot(holdings)
+    first_s = time.perf_counter() - started
+
+    # Next snapshot: some balances move, some holders sell out, some
+    # participants join (half of them already holding).
+    changed = int(len(holdings) * churn)
+    new = dict(holdings)
+    for wallet in rnd.sample(sorted(holdings), changed):
+        if rnd.random() < 0.2:
+            del new[wallet]
+        else:
+            new[wallet] = rnd.randint(1, 10**12)
+    joined = [f"j{i}" for i in range(int(participants * churn))]
+    _insert_participants(engine, joined)
+    new.update({w: rnd.randint(1, 10**12) for w in joined[: len(joined) // 2]})
+
+    started = time.perf_counter()
+    second = index.apply_snapshot(new)
+    second_s = time.perf_counter() - started
+
+    pick_s = _per_call(index.pick, calls)
+    print(
+        f"holders participants={participants:,} holders={len(holdings):,}\n"
+        f"  first snapshot:       {first_s * 1e3:9.1f} ms  {first}\n"
+        f"  incremental snapshot: {second_s * 1e3:9.1f} ms  {second}\n"
+        f"  pick (incl. DB check): {pick_s * 1e6:8.1f} us"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--participants", type=int, default=1_000_000)
+    parser.add_argument("--holder-ratio", type=float, default=0.3,
+                        help="share of participants holding the token")
+    parser.add_argument("--churn", type=float, default=0.01)
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument("--distribution-keys", type=int, default=500)
+    parser.add_argument("--distribution-draws", type=int, default=200_000)
+    args = parser.parse_args()
+
+    path = _configure()
+    try:
+        p_value = check_distribution(args.distribution_keys, args.distribution_draws)
+        bench_sampler(args.participants, args.calls)
+        bench_refresh(args.participants, args.holder_ratio, args.churn, min(args.calls, 2_000))
+    finally:
+        from app.database import engine
+
+        engine.dispose()
+        os.remove(path)
+
+    if p_value < 0.001:
+        raise SystemExit("distribution check failed (p < 0.001)")
+
+
+if __name__ == "__main__":
+    main()
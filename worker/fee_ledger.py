@@ -0,0 +1,54 @@
+"""
+Creator-fee ledger: backfill on-chain history, then reconcile it against
+recorded payouts.
+
+    python -m worker.fee_ledger backfill [--concurrency 8] [--page-size 1000]
+    python -m worker.fee_ledger report
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from app.config import settings
+from app.database import SessionLocal
+from app.schema import migrate
+from app.services import fee_ledger, solana_client
+
+
+async def _backfill(concurrency: int, page_size: int) -> None:
+    await solana_client.startup()
+    db = SessionLocal()
+    try:
+        stats = await fee_ledger.backfill(db, concurrency, page_size)
+    finally:
+        db.close()
+        await solana_client.shutdown()
+    print(f"[fee_ledger] backfill: {stats.as_dict()}", file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Creator-fee ledger")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_backfill = sub.add_parser("backfill", help="ingest creator wallet history")
+    p_backfill.add_argument("--concurrency", type=int, default=settings.FEE_LEDGER_CONCURRENCY)
+    p_backfill.add_argument("--page-size", type=int, default=settings.FEE_LEDGER_PAGE_SIZE)
+
+    sub.add_parser("report", help="compare the ledger with recorded payouts")
+
+    args = parser.parse_args()
+    migrate()
+
+    if args.command == "backfill":
+        asyncio.run(_backfill(args.concurrency, args.page_size))
+    else:
+        db = SessionLocal()
+        try:
+            print(json.dumps(fee_ledger.report(db), indent=2))
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Bulk import / export of participant wallets.
+
+    python -m worker.participants_bulk import wallets.txt   # one wallet per line, "-" for stdin
+    python -m worker.participants_bulk export out.txt       # "-" for stdout
+"""
+import argparse
+import sys
+
+from app.schema import migrate
+from app.services import participants_bulk
+
+
+def _open(path: str, mode: str):
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    return open(path, mode, encoding="utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import/export participants")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_import = sub.add_parser("import", help="import wallets from a file")
+    p_import.add_argument("path")
+    p_import.add_argument("--batch-size", type=int, default=participants_bulk.BATCH_SIZE)
+
+    p_export = sub.add_parser("export", help="export wallets to a file")
+    p_export.add_argument("path")
+
+    args = parser.parse_args()
+    migrate()
+
+    if args.command == "import":
+        with _open(args.path, "r") as f:
+            stats = participants_bulk.import_wallets(f, args.batch_size)
+    else:
+        stats = participants_bulk.BulkStats("export")
+        with _open(args.path, "w") as f:
+            for chunk in participants_bulk.iter_wallets(stats):
+                f.write(chunk)
+
+    print(f"[participants_bulk] {args.command}: {stats.as_dict()}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,161 +1,554 @@
 import asyncio
+from datetime import datetime, timezone
+
 from sqlalchemy.orm import Session
 
+from app import models, schema
 from app.config import settings
 from app.database import SessionLocal
-from app.services import pumpportal, solana_client, raffle_logic
+from app.services import (
+    eligibility, holders, metrics, payout_journal, pumpportal, solana_client, raffle_logic,
+)
+from app.services.raffle_config import RaffleConfig, load_raffles
+from worker.scheduler import FeeScheduler
 
 
 RESERVE_SOL = 0.002
 
-GIFT_NUMERATOR = 7
-GIFT_DENOMINATOR = 10
+MAX_PAYOUT_ATTEMPTS = 3
+# How long to wait on a payout signature before re-checking whether it expired.
+PAYOUT_CONFIRM_SLICE_SECONDS = 30
 
-RAFFLE_INTERVAL_SECONDS = 5 * 60
+# Seconds before retrying a raffle whose startup (resume, scheduler) failed.
+STARTUP_RETRY_SECONDS = 30
 
+# Backoff between attempts to settle a round after an error (RPC, DB...).
+FINISH_RETRY_INITIAL_SECONDS = 5
+FINISH_RETRY_MAX_SECONDS = 300
 
-async def run_raffle_once() -> None:
-    db: Session = SessionLocal()
-    try:
-        raffle = raffle_logic.get_active_raffle(
-            db=db, raffle_id=settings.ACTIVE_RAFFLE_ID
-        )
-        if not raffle:
-            print(f"[worker] No active raffle with id {settings.ACTIVE_RAFFLE_ID}")
-            return
+# A collect the cluster still does not know this long after its round
+# started is past any blockhash's ~150-block lifetime and can no longer land.
+COLLECT_EXPIRY_SECONDS = 600
 
-        is_devnet = "devnet" in settings.SOLANA_RPC_URL.lower()
+# raffle id -> round id -> task settling that round's payouts in the background
+_finishing: dict[int, dict[int, asyncio.Task]] = {}
 
-        sig: str | None = None
 
-        if is_devnet:
-            print(
-                "[worker] Devnet mode detected – skipping PumpPortal collectCreatorFee "
-                "(using balance-based distribution for tests)"
-            )
-        else:
-            try:
-                print(
-                    "[worker] Collecting creator fees via PumpPortal (lightning or local)..."
-                )
-                sig = await pumpportal.collect_creator_fee()
+def _is_devnet() -> bool:
+    return "devnet" in settings.SOLANA_RPC_URL.lower()
 
-                if sig:
-                    print(f"[worker] collectCreatorFee tx signature: {sig}")
-                else:
-                    print(
-                        "[worker] collectCreatorFee completed (no tx signature returned, "
-                        "maybe no fees yet)"
-                    )
 
-                await asyncio.sleep(10)
-            except Exception as e:
-                print("[worker] Error calling PumpPortal collectCreatorFee:", e)
-                return
+def _log(cfg: RaffleConfig, *args) -> None:
+    print(f"[worker] [raffle {cfg.raffle_id}]", *args)
+
+
+async def _make_scheduler(cfg: RaffleConfig) -> FeeScheduler:
+    if _is_devnet():
+        # Devnet distributes the creator balance above the reserve.
+        watch_address = cfg.creator_pubkey
+    else:
+        watch_address = cfg.fee_vault
+
+    scheduler = FeeScheduler(
+        watch_address,
+        threshold_lamports=cfg.threshold_lamports,
+        min_spacing=cfg.min_spacing,
+        max_interval=cfg.max_interval,
+        poll_seconds=settings.RAFFLE_FEE_POLL_SECONDS,
+        jitter_seconds=settings.RAFFLE_SCHEDULE_JITTER_SECONDS,
+    )
+    if _is_devnet():
+        await scheduler.prime(int(RESERVE_SOL * solana_client.LAMPORTS_PER_SOL))
+    else:
+        await scheduler.prime()
+    _log(cfg, f"Watching {watch_address} for fee accrual")
+    return scheduler
+
+
+class RoundDeferred(Exception):
+    """The round cannot advance right now; it stays collected and is retried."""
 
 
-        if is_devnet:
-            balance = await solana_client.get_creator_balance_lamports()
-            print(f"[worker] [devnet] Creator balance: {balance} lamports")
+def _round_age_seconds(rnd: models.RaffleRound) -> float:
+    created_at = rnd.created_at
+    if created_at.tzinfo is None:
+        # SQLite hands back naive datetimes.
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - created_at).total_seconds()
 
-            reserve_lamports = int(
-                RESERVE_SOL * solana_client.LAMPORTS_PER_SOL
+
+async def _distributable(
+    db: Session, cfg: RaffleConfig, rnd: models.RaffleRound, resumed: bool
+) -> int:
+    """
+    Lamports the round's collect brought in; 0 (and the round is abandoned)
+    only when the collect failed or expired on chain. Raises RoundDeferred
+    when that cannot be told yet, e.g. a confirm timeout or an RPC error.
+    """
+    raffle = str(cfg.raffle_id)
+    if _is_devnet():
+        balance = await solana_client.get_creator_balance_lamports(cfg.creator_pubkey)
+        _log(cfg, f"[devnet] Creator balance: {balance} lamports")
+
+        reserve_lamports = int(
+            RESERVE_SOL * solana_client.LAMPORTS_PER_SOL
+        )
+        distributable = balance - reserve_lamports
+        if distributable <= 0:
+            _log(cfg, "[devnet] Nothing to distribute (balance too low after reserve)")
+        return distributable
+
+    try:
+        with metrics.RAFFLE_PHASE.time(raffle=raffle, phase="confirm_collect"):
+            await solana_client.wait_for_confirmation(
+                rnd.collect_sig, search_transaction_history=resumed
             )
-            distributable = balance - reserve_lamports
-            if distributable <= 0:
-                print(
-                    "[worker] [devnet] Nothing to distribute "
-                    "(balance too low after reserve)"
-                )
-                return
+    except solana_client.TransactionFailed as e:
+        _log(cfg, "collectCreatorFee tx failed on chain:", e)
+        return 0
+    except Exception as e:
+        if _round_age_seconds(rnd) < COLLECT_EXPIRY_SECONDS:
+            raise RoundDeferred(f"collectCreatorFee tx not confirmed yet: {e}") from e
+        try:
+            landed = await solana_client.fetch_transaction(rnd.collect_sig)
+        except Exception as lookup_error:
+            raise RoundDeferred(
+                f"could not look up collectCreatorFee tx: {lookup_error!r}"
+            ) from lookup_error
+        if landed is None:
+            _log(cfg, "collectCreatorFee tx expired without landing:", e)
+            return 0
+    payout_journal.mark_collect_landed(db, rnd)
+
+    try:
+        with metrics.RAFFLE_PHASE.time(raffle=raffle, phase="fee_delta"):
+            fee_delta = await solana_client.get_creator_fee_delta_from_tx(
+                rnd.collect_sig, cfg.creator_pubkey
+            )
+    except Exception as e:
+        # The collect landed; its fees are only counted once this works.
+        raise RoundDeferred(f"could not compute fee delta from tx: {e!r}") from e
+
+    if fee_delta <= 0:
+        _log(
+            cfg,
+            "[mainnet] Fee delta <= 0 – nothing to distribute "
+            "(maybe only tx fee, no creator fees).",
+        )
+
+    return fee_delta
+
+
+async def _draw(db: Session, cfg: RaffleConfig) -> str | None:
+    if cfg.selection == "holdings":
+        index = holders.get_index(cfg.token_mint)
+        try:
+            if index.refreshed_at is None:
+                _log(cfg, f"Holder snapshot: {await index.refresh()}")
+            wallet = await asyncio.to_thread(index.pick)
+        except Exception as e:
+            if not settings.RAFFLE_HOLDINGS_UNIFORM_FALLBACK:
+                raise RoundDeferred(f"weighted draw failed: {e!r}") from e
+            _log(cfg, "Weighted draw failed, drawing uniformly instead:", repr(e))
         else:
-            if not sig:
-                print(
-                    "[worker] [mainnet] No tx signature from PumpPortal – "
-                    "cannot safely compute creator fees. Skipping round."
-                )
-                return
+            # None: no participant holds the token.
+            return wallet
+
+    # Participants are not scoped by raffle: every raffle draws from the one
+    # shared pool.
+    participant = raffle_logic.get_random_participant(db=db)
+    return participant.wallet if participant else None
+
+
+async def _select_winner(db: Session, cfg: RaffleConfig, lamports: int) -> str | None:
+    """
+    Draw until a wallet that can actually receive `lamports` comes up,
+    rejecting wallets the sweep marked and ones a fresh account lookup
+    rules out, so no transaction is built for a payout that cannot land.
+    """
+    for _ in range(settings.ELIGIBILITY_MAX_DRAWS):
+        wallet = await _draw(db, cfg)
+        if wallet is None:
+            return None
+
+        if eligibility.is_marked(db, wallet):
+            verdict = "marked ineligible"
+        else:
+            ok, verdict = await eligibility.checker.can_receive(wallet, lamports)
+            if ok:
+                return wallet
+            if verdict in eligibility.PERMANENT:
+                eligibility.record(db, {wallet: verdict})
 
-            try:
-                fee_delta = await solana_client.get_creator_fee_delta_from_tx(sig)
-            except Exception as e:
-                print(
-                    "[worker] [mainnet] Failed to compute fee delta from tx:", e
-                )
-                return
+        _log(cfg, f"Redrawing, {wallet} cannot receive {lamports} lamports: {verdict}")
+        if cfg.selection == "holdings" and verdict != eligibility.UNFUNDED:
+            holders.get_index(cfg.token_mint).exclude(wallet)
 
-            if fee_delta <= 0:
-                print(
-                    "[worker] [mainnet] Fee delta <= 0 – nothing to distribute "
-                    "(maybe only tx fee, no creator fees)."
-                )
-                return
+    _log(cfg, f"No eligible winner after {settings.ELIGIBILITY_MAX_DRAWS} draws")
+    return None
 
-            distributable = fee_delta
 
+async def _split(db: Session, cfg: RaffleConfig, rnd: models.RaffleRound, resumed: bool) -> bool:
+    try:
+        distributable = await _distributable(db, cfg, rnd, resumed)
+        if distributable <= 0:
+            payout_journal.abandon_round(db, rnd, "nothing to distribute")
+            return False
 
-        raffle_part = distributable * GIFT_NUMERATOR // GIFT_DENOMINATOR
-        owner_part = distributable - raffle_part
+        owner_part, raffle_part = cfg.split(distributable)
 
-        print(
-            "[worker] Distributable:", distributable,
+        _log(
+            cfg,
+            "Distributable:", distributable,
             "owner_part:", owner_part,
             "raffle_part:", raffle_part,
         )
 
-        participant = raffle_logic.get_random_participant(db=db)
-        if not participant:
-            print("[worker] No participants in global list")
-            return
+        with metrics.RAFFLE_PHASE.time(raffle=str(cfg.raffle_id), phase="select_winner"):
+            wallet = await _select_winner(db, cfg, raffle_part)
+    except RoundDeferred as e:
+        _log(cfg, f"Round {rnd.id} stays collected until the next cycle: {e}")
+        return False
+    if not wallet:
+        _log(cfg, "No eligible participant")
+        payout_journal.abandon_round(db, rnd, "no eligible participant")
+        return False
+
+    _log(cfg, f"Selected winner wallet: {wallet}")
+
+    payout_journal.mark_split(
+        db, rnd, distributable, owner_part, raffle_part, wallet
+    )
+    return True
+
+
+def _payout_target(cfg: RaffleConfig, rnd: models.RaffleRound, payout: str) -> tuple[str, int]:
+    if payout == "owner":
+        return cfg.owner_wallet, rnd.owner_lamports
+    return rnd.winner_wallet, rnd.winner_lamports
+
+
+def _record_attempt(
+    db: Session,
+    rnd: models.RaffleRound,
+    payout: str,
+    tx,
+    last_valid_block_height: int,
+    compute_unit_price: int,
+) -> None:
+    payout_journal.record_payout_attempt(
+        db, rnd, payout, str(tx.signatures[0]), last_valid_block_height,
+        compute_unit_limit=settings.TRANSFER_COMPUTE_UNITS,
+        compute_unit_price=compute_unit_price,
+        fee_lamports=solana_client.transaction_fee_lamports(
+            settings.TRANSFER_COMPUTE_UNITS, compute_unit_price
+        ),
+    )
+
+
+async def _submit_payouts(db: Session, cfg: RaffleConfig, rnd: models.RaffleRound) -> None:
+    """Sign both payouts up front, journal their signatures, then send them concurrently."""
+    names = ("owner", "winner")
+    targets = [_payout_target(cfg, rnd, name) for name in names]
+
+    txs, last_valid_block_height, prices = await solana_client.sign_payouts(
+        targets, cfg.creator
+    )
+    for name, tx, price in zip(names, txs, prices):
+        _record_attempt(db, rnd, name, tx, last_valid_block_height, price)
+
+    results = await asyncio.gather(
+        *(
+            solana_client.submit_transfer(tx, to_address, lamports)
+            for tx, (to_address, lamports) in zip(txs, targets)
+        ),
+        return_exceptions=True,
+    )
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            _log(cfg, f"Error sending SOL to {name}:", result)
+        else:
+            _log(cfg, f"{name.capitalize()} tx:", result)
 
-        print(f"[worker] Selected winner wallet: {participant.wallet}")
 
+async def _settle_payout(
+    db: Session, cfg: RaffleConfig, rnd: models.RaffleRound, payout: str
+) -> None:
+    """
+    Drive one payout to a confirmed transfer without ever having two live
+    transactions for it: a new transfer is only signed once the previous
+    signature failed on chain or its blockhash expired.
+    """
+    to_address, lamports = _payout_target(cfg, rnd, payout)
 
-        try:
-            owner_sig = await solana_client.send_sol_from_creator(
-                settings.OWNER_WALLET,
-                owner_part,
+    while True:
+        sig = getattr(rnd, f"{payout}_sig")
+        if sig is not None:
+            outcome = await solana_client.get_transaction_outcome(
+                sig, getattr(rnd, f"{payout}_last_valid_block_height")
             )
-            print("[worker] Owner tx:", owner_sig)
+            if outcome == "pending":
+                try:
+                    await solana_client.wait_for_confirmation(
+                        sig, timeout=PAYOUT_CONFIRM_SLICE_SECONDS
+                    )
+                except Exception as e:
+                    _log(cfg, f"Round {rnd.id}: {payout} payout not confirmed yet:", e)
+                    continue
+                outcome = "confirmed"
+
+            if outcome == "confirmed":
+                payout_journal.mark_paid(db, rnd, payout, sig)
+                _log(cfg, f"Round {rnd.id}: {payout} payout confirmed: {sig}")
+                return
+
+            _log(cfg, f"Round {rnd.id}: {payout} payout {sig} {outcome}")
+
+        attempts = getattr(rnd, f"{payout}_attempts")
+        if attempts >= MAX_PAYOUT_ATTEMPTS:
+            payout_journal.mark_paid(
+                db, rnd, payout, None,
+                note=f"{payout} payout failed after {attempts} attempts",
+            )
+            _log(cfg, f"Round {rnd.id}: giving up on {payout} payout")
+            return
+
+        txs, last_valid_block_height, prices = await solana_client.sign_payouts(
+            [(to_address, lamports)], cfg.creator
+        )
+        _record_attempt(db, rnd, payout, txs[0], last_valid_block_height, prices[0])
+        try:
+            await solana_client.submit_transfer(txs[0], to_address, lamports)
         except Exception as e:
-            print("[worker] Error sending SOL to owner:", e)
+            _log(cfg, f"Error sending SOL to {payout}:", e)
+
+
+async def _finish_round(cfg: RaffleConfig, round_id: int) -> None:
+    """
+    Settle a round's payouts and log its winner. Errors are retried with
+    backoff from the journaled state, so a transient RPC or DB failure
+    does not leave the round half-paid until the worker restarts.
+    """
+    raffle = str(cfg.raffle_id)
+    delay = FINISH_RETRY_INITIAL_SECONDS
+    db: Session = SessionLocal()
+    try:
+        while True:
+            try:
+                rnd = db.get(models.RaffleRound, round_id)
+                while rnd.state in payout_journal.PAYOUT_FOR_STATE:
+                    payout = payout_journal.PAYOUT_FOR_STATE[rnd.state]
+                    with metrics.RAFFLE_PHASE.time(raffle=raffle, phase=f"settle_{payout}"):
+                        await _settle_payout(db, cfg, rnd, payout)
+
+                if rnd.state == payout_journal.WINNER_PAID:
+                    with metrics.RAFFLE_PHASE.time(raffle=raffle, phase="log_winner"):
+                        payout_journal.mark_logged(db, rnd)
+                    _log(cfg, "Raffle winner logged in DB")
+                return
+            except Exception as e:
+                _log(
+                    cfg,
+                    f"Round {round_id}: error while settling payouts, retrying in {delay}s:",
+                    repr(e),
+                )
+                # Drop the failed transaction; the round is re-read from the journal.
+                db.rollback()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, FINISH_RETRY_MAX_SECONDS)
+    finally:
+        db.close()
+        _finishing.get(cfg.raffle_id, {}).pop(round_id, None)
+
+
+def _spawn_finisher(cfg: RaffleConfig, round_id: int) -> None:
+    tasks = _finishing.setdefault(cfg.raffle_id, {})
+    if round_id not in tasks:
+        tasks[round_id] = asyncio.create_task(_finish_round(cfg, round_id))
+
+
+async def wait_for_finishers(raffle_id: int | None = None) -> None:
+    """Wait for the payouts still settling for one raffle, or for all of them."""
+    tasks = [
+        task
+        for rid, by_round in _finishing.items()
+        if raffle_id is None or rid == raffle_id
+        for task in by_round.values()
+    ]
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _advance_round(
+    db: Session, cfg: RaffleConfig, rnd: models.RaffleRound, resumed: bool = False
+) -> None:
+    """
+    Take a round from wherever its journal says it stopped up to submitted
+    payouts; confirmation and logging continue in a background task so the
+    next round can start collecting fees meanwhile.
+    """
+    if rnd.state == payout_journal.COLLECTED:
+        if not await _split(db, cfg, rnd, resumed):
             return
 
+    if rnd.state == payout_journal.SPLIT and rnd.owner_attempts == 0 and rnd.winner_attempts == 0:
+        with metrics.RAFFLE_PHASE.time(raffle=str(cfg.raffle_id), phase="submit_payouts"):
+            await _submit_payouts(db, cfg, rnd)
 
-        try:
-            winner_sig = await solana_client.send_sol_from_creator(
-                participant.wallet,
-                raffle_part,
+    _spawn_finisher(cfg, rnd.id)
+
+
+async def resume_unfinished_rounds(cfg: RaffleConfig) -> None:
+    """Advance the raffle's unfinished rounds that no finisher task is settling."""
+    settling = _finishing.get(cfg.raffle_id, {})
+    db: Session = SessionLocal()
+    try:
+        for rnd in payout_journal.unfinished_rounds(db, cfg.raffle_id):
+            if rnd.id in settling:
+                continue
+            _log(cfg, f"Resuming round {rnd.id} from state {rnd.state}")
+            try:
+                await _advance_round(db, cfg, rnd, resumed=True)
+            except Exception as e:
+                _log(cfg, f"Could not resume round {rnd.id}:", repr(e))
+    finally:
+        db.close()
+
+
+async def run_raffle_once(cfg: RaffleConfig) -> bool:
+    """Collect the raffle's fees and start a round; True once the collect went through."""
+    db: Session = SessionLocal()
+    try:
+        raffle = raffle_logic.get_active_raffle(db=db, raffle_id=cfg.raffle_id)
+        if not raffle:
+            _log(cfg, "No active raffle with this id")
+            return False
+
+        sig: str | None = None
+        collect_sent_at = None
+        collect_fee_lamports = None
+
+        if _is_devnet():
+            _log(
+                cfg,
+                "Devnet mode detected – skipping PumpPortal collectCreatorFee "
+                "(using balance-based distribution for tests)",
             )
-            print("[worker] Winner tx:", winner_sig)
-        except Exception as e:
-            print("[worker] Error sending SOL to winner:", e)
-            winner_sig = None
+            # The creator balance still includes payouts that have not landed.
+            await wait_for_finishers(cfg.raffle_id)
+        else:
+            try:
+                _log(cfg, "Collecting creator fees via PumpPortal (lightning or local)...")
+                with metrics.RAFFLE_PHASE.time(raffle=str(cfg.raffle_id), phase="collect"):
+                    priority_fee_sol = await pumpportal.estimate_priority_fee_sol(
+                        cfg.creator_pubkey, cfg.fee_vault
+                    )
+                    _log(cfg, f"collectCreatorFee priority fee: {priority_fee_sol:.9f} SOL")
+                    collect_sent_at = datetime.now(timezone.utc)
+                    sig = await pumpportal.collect_creator_fee(
+                        priority_fee_sol,
+                        creator=cfg.creator,
+                        mint=cfg.token_mint,
+                        pool=cfg.pump_pool,
+                        api_key=cfg.pumpportal_api_key,
+                    )
+                collect_fee_lamports = (
+                    round(priority_fee_sol * solana_client.LAMPORTS_PER_SOL)
+                    + solana_client.BASE_FEE_LAMPORTS_PER_SIGNATURE
+                )
 
+                if sig:
+                    _log(cfg, f"collectCreatorFee tx signature: {sig}")
+                else:
+                    _log(
+                        cfg,
+                        "collectCreatorFee completed (no tx signature returned, "
+                        "maybe no fees yet)",
+                    )
+            except Exception as e:
+                _log(cfg, "Error calling PumpPortal collectCreatorFee:", e)
+                return False
 
-        raffle_logic.log_winner(
-            db=db,
-            raffle_id=raffle.id,
-            wallet=participant.wallet,
-            amount_lamports=raffle_part,
-            tx_signature=winner_sig,
+            if not sig:
+                _log(
+                    cfg,
+                    "[mainnet] No tx signature from PumpPortal – "
+                    "cannot safely compute creator fees. Skipping round.",
+                )
+                return False
+
+        rnd = payout_journal.start_round(
+            db, raffle.id, sig,
+            collect_sent_at=collect_sent_at,
+            collect_fee_lamports=collect_fee_lamports,
         )
-        print("[worker] Raffle winner logged in DB")
+        await _advance_round(db, cfg, rnd)
+        return True
 
     finally:
         db.close()
 
 
-async def main_loop() -> None:
-    print("[worker] Starting raffle loop...")
+async def _start_raffle(cfg: RaffleConfig) -> FeeScheduler:
+    """Resume the raffle's unfinished rounds and prime its scheduler, retrying until both work."""
     while True:
         try:
-            await run_raffle_once()
+            await resume_unfinished_rounds(cfg)
+            return await _make_scheduler(cfg)
         except Exception as e:
-            print("[worker] Unexpected error in run_raffle_once:", repr(e))
+            _log(cfg, f"Startup failed, retrying in {STARTUP_RETRY_SECONDS}s:", repr(e))
+            await asyncio.sleep(STARTUP_RETRY_SECONDS)
+
+
+async def _raffle_loop(cfg: RaffleConfig, cycle_slots: asyncio.Semaphore) -> None:
+    """
+    Run one raffle's cycles forever. Each raffle has its own loop task,
+    scheduler and DB sessions, so its errors and slow calls only hold up
+    its own cycles (and one of the shared cycle slots while it runs).
+    """
+    scheduler = await _start_raffle(cfg)
+    if cfg.selection == "holdings":
+        holders.get_index(cfg.token_mint).start(settings.HOLDER_SNAPSHOT_REFRESH_SECONDS)
+    while True:
+        reason = await scheduler.wait_for_trigger()
+        async with cycle_slots:
+            _log(cfg, f"Running raffle cycle: {reason}")
+            collected = False
+            try:
+                # Rounds left collected by a deferred draw go first.
+                await resume_unfinished_rounds(cfg)
+                with metrics.RAFFLE_PHASE.time(raffle=str(cfg.raffle_id), phase="cycle"):
+                    collected = await run_raffle_once(cfg)
+            except Exception as e:
+                _log(cfg, "Unexpected error in run_raffle_once:", repr(e))
+        await scheduler.mark_ran(collected)
+
 
-        print(f"[worker] Sleeping for {RAFFLE_INTERVAL_SECONDS} seconds...")
-        await asyncio.sleep(RAFFLE_INTERVAL_SECONDS)
+async def main_loop() -> None:
+    if settings.DB_MIGRATE_ON_STARTUP:
+        await asyncio.to_thread(schema.migrate)
+    raffles = load_raffles()
+    print(f"[worker] Starting raffle loops for {[cfg.raffle_id for cfg in raffles]}...")
+    if settings.WORKER_METRICS_PORT:
+        metrics.start_http_server(settings.WORKER_METRICS_PORT)
+        print(f"[worker] Serving metrics on :{settings.WORKER_METRICS_PORT}/metrics")
+    await solana_client.startup()
+    await pumpportal.startup()
+    cycle_slots = asyncio.Semaphore(settings.WORKER_MAX_CONCURRENT_CYCLES)
+    if settings.ELIGIBILITY_SWEEP_INTERVAL_SECONDS > 0:
+        eligibility.sweeper.start(settings.ELIGIBILITY_SWEEP_INTERVAL_SECONDS)
+    try:
+        await asyncio.gather(*(_raffle_loop(cfg, cycle_slots) for cfg in raffles))
+    finally:
+        for by_round in _finishing.values():
+            for task in list(by_round.values()):
+                task.cancel()
+        for cfg in raffles:
+            if cfg.selection == "holdings":
+                await holders.get_index(cfg.token_mint).stop()
+        await eligibility.sweeper.stop()
+        await pumpportal.shutdown()
+        await solana_client.shutdown()
 
 
 if __name__ == "__main__":
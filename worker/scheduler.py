@@ -0,0 +1,83 @@
+import asyncio
+import random
+import time
+
+from solders.pubkey import Pubkey
+
+from app.services import solana_client
+
+
+class FeeScheduler:
+    """
+    Decides when the next raffle cycle runs by watching the balance of the
+    account where fees accrue.
+
+    A cycle is due once the balance has grown by `threshold_lamports` since
+    the last cycle, or once `max_interval` seconds have passed, but never
+    sooner than `min_spacing` seconds after the previous cycle. Each poll is
+    a single getBalance call.
+    """
+
+    def __init__(
+        self,
+        watch_address: Pubkey,
+        threshold_lamports: int,
+        min_spacing: float,
+        max_interval: float,
+        poll_seconds: float,
+        jitter_seconds: float,
+    ) -> None:
+        self.watch_address = watch_address
+        self.threshold_lamports = threshold_lamports
+        self.min_spacing = min_spacing
+        self.max_interval = max_interval
+        self.poll_seconds = poll_seconds
+        self.jitter_seconds = jitter_seconds
+        self.baseline_lamports = 0
+        self.last_run = time.monotonic()
+
+    async def prime(self, baseline_lamports: int | None = None) -> None:
+        """Set the starting baseline; defaults to the account's rent-exempt minimum."""
+        if baseline_lamports is None:
+            baseline_lamports = await solana_client.get_rent_exempt_minimum(
+                self.watch_address
+            )
+        self.baseline_lamports = baseline_lamports
+        # Let the first cycle run as soon as fees are above the threshold.
+        self.last_run = time.monotonic() - self.min_spacing
+
+    async def wait_for_trigger(self) -> str:
+        """Sleep until a cycle is due; return why it is."""
+        while True:
+            since_last = time.monotonic() - self.last_run
+
+            if since_last >= self.min_spacing:
+                if since_last >= self.max_interval:
+                    return "max interval reached"
+                try:
+                    balance = await solana_client.get_balance_lamports(self.watch_address)
+                except Exception as e:
+                    print("[scheduler] Balance poll failed:", repr(e))
+                else:
+                    accrued = balance - self.baseline_lamports
+                    if accrued >= self.threshold_lamports:
+                        return f"{accrued} lamports accrued"
+
+            wait = max(self.poll_seconds, self.min_spacing - since_last)
+            await asyncio.sleep(wait + random.uniform(0, self.jitter_seconds))
+
+    async def mark_ran(self, collected: bool) -> None:
+        """
+        Record a finished cycle. Only a cycle that collected re-baselines on
+        what it left behind; after a failed one the fees still waiting in
+        the account keep counting toward the next trigger.
+        """
+        self.last_run = time.monotonic()
+        if not collected:
+            return
+        try:
+            self.baseline_lamports = await solana_client.get_balance_lamports(
+                self.watch_address
+            )
+        except Exception as e:
+            print("[scheduler] Could not re-read baseline balance:", repr(e))